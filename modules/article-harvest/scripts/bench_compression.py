@@ -0,0 +1,140 @@
+"""Measure what zstd compression with per-source dictionaries saves and costs.
+
+Usage: python scripts/bench_compression.py [--items 3000] [--days 365] [--runs 3]
+
+Seeds a blog source whose posts share a template (header, links, footer) and an
+aggregation source with a year of front pages, copies the data root and runs
+``compress_stored("zstd")`` on the copy. Reports the bytes stored on disk for each source
+and the time a fresh Storage takes to read everything back (all blog content, all
+snapshots), uncompressed and compressed.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from article_harvest.models import AggregationComment, AggregationItem, BlogItem, Source
+from article_harvest.storage import Storage
+
+BLOG = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+AGG = Source(id="agg", name="Agg", kind="aggregation", method="api", fetch=lambda ctx: [])
+HEADER = "[Home](https://blog.example.com/) | [Archive](https://blog.example.com/archive)\n\n"
+FOOTER = (
+    "\n\n---\n\nThanks for reading! Subscribe for free to receive new posts and support my "
+    "work. [Share](https://blog.example.com/share) [Leave a comment]"
+    "(https://blog.example.com/comments)\n"
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_root = Path(tmp) / "none"
+        zstd_root = Path(tmp) / "zstd"
+        _seed(Storage(plain_root), args.items, args.days)
+        shutil.copytree(plain_root, zstd_root)
+        started = time.perf_counter()
+        report = Storage(zstd_root).compress_stored("zstd")
+        elapsed = time.perf_counter() - started
+        print(
+            f"compress_stored: {report['files']} files in {elapsed:.1f}s, "
+            f"read per file {report['read_us_before']} -> {report['read_us_after']} us"
+        )
+
+        print(f"{'storage':<8} {'blog_bytes':>11} {'agg_bytes':>10} {'blog_ms':>9} {'agg_ms':>8}")
+        for name, root in (("none", plain_root), ("zstd", zstd_root)):
+            blog_bytes = _size(root / "sources" / BLOG.id)
+            agg_bytes = _size(root / "sources" / AGG.id)
+            blog = _best(args.runs, lambda: _read_blog(Storage(root)))
+            agg = _best(args.runs, lambda: Storage(root).records_for_source(AGG))
+            print(
+                f"{name:<8} {blog_bytes:>11} {agg_bytes:>10} {blog * 1000:>9.1f} "
+                f"{agg * 1000:>8.1f}"
+            )
+    return 0
+
+
+def _seed(storage: Storage, items: int, days: int) -> None:
+    rng = random.Random(7)
+    posts = []
+    for serial in range(items):
+        paragraphs = [
+            " ".join(f"word{rng.randrange(3000)}" for _ in range(60)) for _ in range(4)
+        ]
+        body = "\n\n".join(paragraphs)
+        content = f"{HEADER}# Post {serial}\n\n{body}{FOOTER}"
+        posts.append(
+            BlogItem(
+                title=f"Post {serial}",
+                url=f"https://blog.example.com/p/post-{serial}",
+                content_markdown=content,
+            )
+        )
+    storage.save_blog_items(BLOG, posts)
+
+    start = date(2025, 1, 1)
+    current: list[AggregationItem] = []
+    serial = 0
+    for offset in range(days):
+        kept = [item for item in current if rng.random() < 0.7]
+        while len(kept) < 30:
+            serial += 1
+            kept.append(_story(rng, serial))
+        current = kept
+        day = (start + timedelta(days=offset)).isoformat()
+        with patch("article_harvest.storage.iso_date_today", return_value=day):
+            storage.save_snapshot(AGG, current)
+
+
+def _story(rng: random.Random, serial: int) -> AggregationItem:
+    comments = [
+        AggregationComment(
+            author=f"user{rng.randrange(500)}",
+            published_at="2025-01-01T00:00:00Z",
+            text=" ".join(f"word{rng.randrange(2000)}" for _ in range(40)),
+        )
+        for _ in range(5)
+    ]
+    return AggregationItem(
+        title=f"Story number {serial} about things",
+        url=f"https://example{serial % 97}.com/articles/{serial}",
+        author=f"user{rng.randrange(500)}",
+        score=rng.randrange(1000),
+        comments_count=rng.randrange(300),
+        rank=serial % 30 + 1,
+        discussion_url=f"https://news.example.com/item?id={serial}",
+        comments=comments,
+    )
+
+
+def _read_blog(storage: Storage) -> None:
+    for record in storage.records_for_source(BLOG):
+        storage.read_content(record.content_path)
+
+
+def _size(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def _best(runs: int, call) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+"""Compare file count, disk size and read time of the blog content stores.
+
+Usage: python scripts/bench_content_store.py [--items 5000] [--runs 3]
+
+Seeds one blog source with N items stored as plain files, copies it and converts each
+copy to another content store, then reports the files on disk, their bytes (rounded up to
+4 KiB blocks, as a filesystem allocates them) and the time a fresh Storage needs to read
+every item's content.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from article_harvest.models import BlogItem, Source
+from article_harvest.storage import Storage
+from article_harvest.storage_config import CONTENT_STORES
+
+SOURCE = Source(id="bench", name="Bench", kind="blog", method="rss", fetch=lambda ctx: [])
+BLOCK = 4096
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = {store: Path(tmp) / store for store in CONTENT_STORES}
+        _seed(Storage(roots["files"]), args.items)
+        for store, root in roots.items():
+            if store != "files":
+                shutil.copytree(roots["files"], root)
+                Storage(root).convert_content(store)
+
+        print(f"{'store':<6} {'files':>7} {'bytes':>11} {'block_bytes':>12} {'read_ms':>9}")
+        for store, root in roots.items():
+            paths = [path for path in root.rglob("*") if path.is_file()]
+            size = sum(path.stat().st_size for path in paths)
+            blocks = sum(-(-path.stat().st_size // BLOCK) * BLOCK for path in paths)
+            read = _best(args.runs, lambda: _read_all(Storage(root)))
+            print(f"{store:<6} {len(paths):>7} {size:>11} {blocks:>12} {read * 1000:>9.1f}")
+    return 0
+
+
+def _seed(storage: Storage, items: int) -> None:
+    rng = random.Random(7)
+    batch = [
+        BlogItem(
+            title=f"Post {serial}",
+            url=f"https://example.com/posts/{serial}",
+            content_markdown=" ".join(f"word{rng.randrange(2000)}" for _ in range(150)),
+        )
+        for serial in range(items)
+    ]
+    storage.save_blog_items(SOURCE, batch)
+
+
+def _read_all(storage: Storage) -> None:
+    for record in storage.records_for_source(SOURCE):
+        storage.read_content(record.content_path)
+
+
+def _best(runs: int, call) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
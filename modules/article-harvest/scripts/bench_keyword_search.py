@@ -0,0 +1,115 @@
+"""Benchmark substring keyword search: trigram FTS index vs the `lower(title) LIKE` scan.
+
+Usage: python scripts/bench_keyword_search.py [--records 1000 10000 50000] [--runs 20]
+
+Each case seeds a SQLite index with mixed Chinese/English titles and bodies, then times
+three ways of finding a needle that occurs in ~1% of records:
+
+- like_title: the existing `lower(title) LIKE` keyword query (titles only);
+- like_body: a `LIKE` scan over titles and bodies, i.e. substring search without an index;
+- trigram: the trigram-backed `query keyword --substring` (titles, authors and bodies).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from article_harvest.models import Record
+from article_harvest.sqlite_index import SQLiteIndex
+
+_NEEDLES = ["语言模型", "编译器", "inference", "rare-needle"]
+# Share of records that contain each needle somewhere in the body (1 in N).
+_NEEDLE_EVERY = 100
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--body-words", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    columns = ("like_title", "like_body", "trigram")
+    header = " ".join(f"{name + '_ms':>13} {'hits':>5}" for name in columns)
+    print(f"{'records':>8} {'needle':>12} {header}")
+    for count in args.records:
+        for needle, timings in _bench(count, args.body_words, args.runs):
+            cells = " ".join(f"{elapsed * 1000:>13.2f} {hits:>5}" for elapsed, hits in timings)
+            print(f"{count:>8} {needle:>12} {cells}")
+    return 0
+
+
+def _bench(count: int, body_words: int, runs: int) -> list[tuple]:
+    rng = random.Random(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        vocabulary = [_random_word(rng) for _ in range(5000)]
+        records = []
+        for i in range(count):
+            title = " ".join(rng.choices(vocabulary, k=6))
+            words = rng.choices(vocabulary, k=body_words)
+            if i % _NEEDLE_EVERY == 0:
+                words[rng.randrange(body_words)] = _NEEDLES[(i // _NEEDLE_EVERY) % len(_NEEDLES)]
+            body = " ".join(words)
+            content_path = Path("sources/bench/items") / f"item-{i}" / "content.md"
+            (root / content_path).parent.mkdir(parents=True, exist_ok=True)
+            (root / content_path).write_text(body, encoding="utf-8")
+            records.append(
+                Record(
+                    source_id="bench",
+                    source_name="Bench",
+                    kind="blog",
+                    title=title,
+                    url=f"https://example.com/{i}",
+                    archived_at=f"2026-01-{i % 28 + 1:02d}T00:00:00Z",
+                    item_id=f"item-{i}",
+                    content_path=str(content_path),
+                )
+            )
+        index = SQLiteIndex(root)
+        index.upsert_records(records)
+
+        results = []
+        with index.connect() as conn:
+            for needle in _NEEDLES:
+                timings = [
+                    _time(runs, lambda: index.query_by_keyword(needle)),
+                    _time(runs, lambda: _like_body(conn, needle)),
+                    _time(runs, lambda: index.query_by_substring(needle)),
+                ]
+                results.append((needle, timings))
+        return results
+
+
+def _like_body(conn, needle: str) -> list:
+    pattern = f"%{needle.lower()}%"
+    return conn.execute(
+        "SELECT records.* FROM records"
+        " JOIN record_text ON record_text.record_rowid = records.rowid"
+        " WHERE lower(record_text.title) LIKE ? OR lower(record_text.body) LIKE ?"
+        " ORDER BY records.archived_at DESC",
+        (pattern, pattern),
+    ).fetchall()
+
+
+def _random_word(rng: random.Random) -> str:
+    if rng.random() < 0.6:
+        return "".join(chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(rng.randint(2, 4)))
+    return "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9)))
+
+
+def _time(runs: int, query) -> tuple[float, int]:
+    timings = []
+    hits = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        hits = len(query())
+        timings.append(time.perf_counter() - started)
+    return min(timings), hits
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""Compare month-range reads of a legacy single manifest with monthly partitions.
+
+Usage: python scripts/bench_manifest_partitions.py [--items 50000] [--months 36] [--runs 3]
+
+Writes one blog source's manifest with N rows spread over M months as a legacy single
+file, copies it and splits the copy with ``partition_manifests``, then times a full
+``load_manifest`` and ``iter_records`` over the last month in both layouts.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from article_harvest.models import Source
+from article_harvest.storage import Storage
+
+SOURCE = Source(id="bench", name="Bench", kind="blog", method="rss", fetch=lambda ctx: [])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_root = Path(tmp) / "legacy"
+        last_month = _seed(Storage(legacy_root), args.items, args.months)
+        partitioned_root = Path(tmp) / "partitioned"
+        shutil.copytree(legacy_root, partitioned_root)
+        Storage(partitioned_root).partition_manifests()
+        month_end = date(last_month.year, last_month.month, 28)
+
+        print(f"{'layout':<12} {'files':>6} {'load_ms':>9} {'month_ms':>9} {'rows':>6}")
+        for layout, root in (("legacy", legacy_root), ("partitioned", partitioned_root)):
+            storage = Storage(root)
+            files = len(storage.manifest_paths(SOURCE.id))
+            load = _best(args.runs, lambda: storage.load_manifest(SOURCE.id))
+            rows = len(storage.records_for_source(SOURCE, last_month, month_end))
+            month = _best(
+                args.runs, lambda: list(storage.iter_records(SOURCE, last_month, month_end))
+            )
+            print(
+                f"{layout:<12} {files:>6} {load * 1000:>9.1f} {month * 1000:>9.1f} {rows:>6}"
+            )
+    return 0
+
+
+def _seed(storage: Storage, items: int, months: int) -> date:
+    path = storage.manifest_path(SOURCE.id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for serial in range(items):
+            offset = serial * months // items
+            month = date(2024 + offset // 12, offset % 12 + 1, 1)
+            row = {
+                "id": f"post-{serial}",
+                "source_id": SOURCE.id,
+                "title": f"Post {serial}",
+                "url": f"https://example.com/posts/{serial}",
+                "published_at": None,
+                "archived_at": f"{month.isoformat()}T{serial % 24:02d}:00:00Z",
+                "author": None,
+                "summary": None,
+                "content_path": f"sources/{SOURCE.id}/items/post-{serial}/content.md",
+            }
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return month
+
+
+def _best(runs: int, call) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""Compare disk size and load time of JSON and columnar aggregation snapshots.
+
+Usage: python scripts/bench_snapshot_format.py [--days 365] [--items 30] [--carry 0.7]
+
+Seeds N days of snapshots in which a ``carry`` share of each day's items (with their
+comment threads) repeats from the day before, like a front page. The history is written
+as JSON, converted to columnar, then both are timed on a full-history read and on a
+single-day read, by a fresh Storage (which has to load the string dictionary first) and
+by one that is reused, as in a long-running process.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from article_harvest.models import AggregationComment, AggregationItem, Source
+from article_harvest.storage import Storage
+
+SOURCE = Source(id="bench", name="Bench", kind="aggregation", method="api", fetch=lambda ctx: [])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--carry", type=float, default=0.7)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_root = Path(tmp) / "json"
+        columnar_root = Path(tmp) / "columnar"
+        last_day = _seed(Storage(json_root), args.days, args.items, args.carry)
+        shutil.copytree(json_root, columnar_root)
+        Storage(columnar_root).convert_snapshots("columnar")
+
+        print(f"{'format':<9} {'bytes':>11} {'full_ms':>9} {'day_ms':>8} {'warm_day_ms':>12}")
+        for name, root in (("json", json_root), ("columnar", columnar_root)):
+            size = sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+            full = _best(args.runs, lambda: Storage(root).records_for_source(SOURCE))
+            day = _best(
+                args.runs,
+                lambda: list(Storage(root).iter_records(SOURCE, start=last_day, end=last_day)),
+            )
+            storage = Storage(root)
+            warm = _best(
+                args.runs, lambda: list(storage.iter_records(SOURCE, start=last_day, end=last_day))
+            )
+            print(
+                f"{name:<9} {size:>11} {full * 1000:>9.1f} {day * 1000:>8.2f} "
+                f"{warm * 1000:>12.2f}"
+            )
+    return 0
+
+
+def _seed(storage: Storage, days: int, items: int, carry: float) -> date:
+    rng = random.Random(7)
+    start = date(2025, 1, 1)
+    serial = 0
+    current: list[AggregationItem] = []
+    for offset in range(days):
+        kept = [item for item in current if rng.random() < carry]
+        while len(kept) < items:
+            serial += 1
+            kept.append(_item(rng, serial))
+        current = kept
+        day = (start + timedelta(days=offset)).isoformat()
+        with patch("article_harvest.storage.iso_date_today", return_value=day):
+            storage.save_snapshot(SOURCE, current)
+    return start + timedelta(days=days - 1)
+
+
+def _item(rng: random.Random, serial: int) -> AggregationItem:
+    comments = [
+        AggregationComment(
+            author=f"user{rng.randrange(500)}",
+            published_at="2025-01-01T00:00:00Z",
+            text=" ".join(f"word{rng.randrange(2000)}" for _ in range(40)),
+        )
+        for _ in range(5)
+    ]
+    return AggregationItem(
+        title=f"Story number {serial} about things",
+        url=f"https://example{serial % 97}.com/articles/{serial}",
+        author=f"user{rng.randrange(500)}",
+        score=rng.randrange(1000),
+        comments_count=rng.randrange(300),
+        rank=serial % 30 + 1,
+        discussion_url=f"https://news.example.com/item?id={serial}",
+        comments=comments,
+        extra={"domain": f"example{serial % 97}.com"},
+    )
+
+
+def _best(runs: int, call) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Benchmark ingest time for an aggregation source as its snapshot history grows.
+
+Usage: python scripts/bench_snapshot_upsert.py [--days 30 180 365 730] [--items 30]
+
+Each case seeds N days of snapshots, builds the SQLite index, then times one ingest
+of the source (snapshot write + index upsert) against a temporary data root.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from article_harvest.ingest import ingest_all
+from article_harvest.models import AggregationItem, Source
+from article_harvest.sqlite_index import SQLiteIndex, rebuild_sqlite_index
+from article_harvest.storage import Storage
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 180, 365, 730])
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'days':>6} {'rows':>8} {'ingest_ms':>10} {'upserted':>9}")
+    for days in args.days:
+        elapsed, rows, upserted = _bench(days, args.items, args.runs)
+        print(f"{days:>6} {rows:>8} {elapsed * 1000:>10.1f} {upserted:>9}")
+    return 0
+
+
+def _bench(days: int, items: int, runs: int) -> tuple[float, int, int]:
+    today_items = [
+        AggregationItem(title=f"Today {i}", url=f"https://example.com/today/{i}", rank=i)
+        for i in range(items)
+    ]
+    source = Source(
+        id="bench",
+        name="Bench",
+        kind="aggregation",
+        method="api",
+        fetch=lambda ctx: today_items,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = Storage(Path(tmp))
+        _seed_history(storage, source, days, items)
+        rebuild_sqlite_index(storage, [source])
+
+        upserted: list[int] = []
+        original = SQLiteIndex.upsert_records
+
+        def _counting_upsert(self, records):
+            count = original(self, records)
+            upserted.append(count)
+            return count
+
+        timings = []
+        with patch("article_harvest.ingest.list_sources", return_value=[source]), patch.object(
+            SQLiteIndex, "upsert_records", _counting_upsert
+        ):
+            for _ in range(runs):
+                started = time.perf_counter()
+                ingest_all(storage=storage)
+                timings.append(time.perf_counter() - started)
+        rows = days * items + items
+        return min(timings), rows, max(upserted)
+
+
+def _seed_history(storage: Storage, source: Source, days: int, items: int) -> None:
+    snapshots_dir = storage.snapshots_dir(source.id)
+    snapshots_dir.mkdir(parents=True, exist_ok=True)
+    start = date.today() - timedelta(days=days)
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        payload = {
+            "source_id": source.id,
+            "source_name": source.name,
+            "archived_at": day,
+            "generated_at": f"{day}T00:00:00Z",
+            "items": [
+                {"title": f"{day} item {i}", "url": f"https://example.com/{day}/{i}", "rank": i}
+                for i in range(items)
+            ],
+        }
+        (snapshots_dir / f"{day}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Benchmark per-call latency of SQLiteIndex queries and small upserts.
+
+Usage: python scripts/bench_sqlite_queries.py [--records 20000] [--calls 2000]
+
+Seeds an index with N blog records, then times repeated small queries (source page,
+keyword, archive day) and single-record upserts through one SQLiteIndex instance.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from article_harvest.models import Record
+from article_harvest.sqlite_index import SQLiteIndex
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SQLiteIndex(Path(tmp))
+        index.upsert_records(_record(i) for i in range(args.records))
+        cases = {
+            # No matching rows: measures per-call overhead rather than query work.
+            "query_by_source(no rows)": lambda i: index.query_by_source("missing"),
+            "query_by_source(limit=20)": lambda i: index.query_by_source("bench", limit=20),
+            "query_by_keyword(limit=20)": lambda i: index.query_by_keyword(
+                "title 12", limit=20
+            ),
+            "query_by_archive_date(day)": lambda i: index.query_by_archive_date(
+                "2026-01-05", "2026-01-05", limit=20
+            ),
+            "upsert_records(1 record)": lambda i: index.upsert_records(
+                [_record(args.records + i)]
+            ),
+        }
+        print(f"{'call':<28} {'mean_us':>9} {'p50_us':>9} {'p99_us':>9}")
+        for name, call in cases.items():
+            timings = []
+            for i in range(args.calls):
+                started = time.perf_counter()
+                call(i)
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            mean = sum(timings) / len(timings)
+            p50 = timings[len(timings) // 2]
+            p99 = timings[int(len(timings) * 0.99)]
+            print(f"{name:<28} {mean * 1e6:>9.0f} {p50 * 1e6:>9.0f} {p99 * 1e6:>9.0f}")
+        close = getattr(index, "close", None)
+        if close:
+            close()
+    return 0
+
+
+def _record(i: int) -> Record:
+    return Record(
+        source_id="bench",
+        source_name="Bench",
+        kind="blog",
+        title=f"Bench title {i}",
+        url=f"https://example.com/{i}",
+        archived_at=f"2026-01-{i % 28 + 1:02d}T00:00:{i % 60:02d}Z",
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
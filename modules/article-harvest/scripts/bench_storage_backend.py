@@ -0,0 +1,109 @@
+"""Compare the files and sqlite storage backends on writes, reads, queries and disk use.
+
+Usage: python scripts/bench_storage_backend.py [--items 5000] [--days 90] [--runs 3]
+
+Stores N blog items (in batches of 50, as successive ingest runs would) and one
+aggregation snapshot of 30 items per day into each backend. The files backend keeps the
+optional SQLite index in step the way ingest does, so both end up equally queryable.
+Then reports the files on disk and their bytes, the write time, the time to read every
+item's content and the time of a full-text query and a one-day archive query.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+from article_harvest.models import AggregationItem, BlogItem, Source
+from article_harvest.queries import query_by_archive_date, query_by_keyword
+from article_harvest.sqlite_index import SQLiteIndex
+from article_harvest.sqlite_store import SQLiteStorage
+from article_harvest.storage import Storage
+
+BLOG = Source(id="bench-blog", name="Bench", kind="blog", method="rss", fetch=lambda ctx: [])
+AGG = Source(id="bench-agg", name="Agg", kind="aggregation", method="api", fetch=lambda c: [])
+BATCH = 50
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    day = (date(2026, 1, 1) + timedelta(days=args.days // 2)).isoformat()
+
+    print(
+        f"{'backend':<8} {'files':>7} {'bytes':>11} {'write_s':>8} {'read_ms':>8} "
+        f"{'fts_ms':>7} {'day_ms':>7}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("files", "sqlite"):
+            root = Path(tmp) / backend
+            storage = SQLiteStorage(root) if backend == "sqlite" else Storage(root)
+            started = time.perf_counter()
+            _seed(storage, args.items, args.days)
+            written = time.perf_counter() - started
+            paths = [path for path in root.rglob("*") if path.is_file()]
+            size = sum(path.stat().st_size for path in paths)
+            read = _best(args.runs, lambda: _read_all(storage))
+            sources = [BLOG, AGG]
+            fts = _best(args.runs, lambda: query_by_keyword(storage, sources, "word7", fts=True))
+            one_day = _best(args.runs, lambda: query_by_archive_date(storage, sources, on=day))
+            print(
+                f"{backend:<8} {len(paths):>7} {size:>11} {written:>8.2f} {read * 1000:>8.1f} "
+                f"{fts * 1000:>7.1f} {one_day * 1000:>7.1f}"
+            )
+    return 0
+
+
+def _seed(storage: Storage, items: int, days: int) -> None:
+    rng = random.Random(7)
+    index = None if isinstance(storage, SQLiteStorage) else SQLiteIndex(storage.data_root)
+    for start in range(0, items, BATCH):
+        batch = [
+            BlogItem(
+                title=f"Post {serial}",
+                url=f"https://example.com/posts/{serial}",
+                content_markdown=" ".join(f"word{rng.randrange(2000)}" for _ in range(150)),
+            )
+            for serial in range(start, min(start + BATCH, items))
+        ]
+        stored = storage.save_blog_items(BLOG, batch)
+        if index is not None:
+            index.upsert_records(stored)
+    for offset in range(days):
+        day = (date(2026, 1, 1) + timedelta(days=offset)).isoformat()
+        snapshot = [
+            AggregationItem(title=f"Story {rng.randrange(500)}", url=f"https://n.example/{n}")
+            for n in range(30)
+        ]
+        with (
+            mock.patch("article_harvest.storage.iso_date_today", lambda day=day: day),
+            mock.patch("article_harvest.sqlite_store.iso_date_today", lambda day=day: day),
+        ):
+            path = storage.save_snapshot(AGG, snapshot)
+        if index is not None:
+            index.upsert_records(storage.snapshot_records(AGG, path))
+
+
+def _read_all(storage: Storage) -> None:
+    for record in storage.records_for_source(BLOG):
+        storage.read_content(record.content_path)
+
+
+def _best(runs: int, call) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
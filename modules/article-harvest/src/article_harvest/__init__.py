@@ -1,6 +1,6 @@
 from .ingest import ingest_all, ingest_source
 from .queries import query_by_archive_date, query_by_keyword, query_by_source
-from .sqlite_index import rebuild_sqlite_index
+from .sqlite_index import rebuild_sqlite_index, sync_sqlite_index
 
 __all__ = [
     "ingest_all",
@@ -9,4 +9,5 @@ __all__ = [
     "query_by_keyword",
     "query_by_archive_date",
     "rebuild_sqlite_index",
+    "sync_sqlite_index",
 ]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+BLOBS_DIR = "blobs"
+REFS_NAME = "refs.sqlite"
+CONTENT_POINTER = "content.blob"
+
+
+class BlobStore:
+    """Content-addressed store: each distinct body is kept once as ``blobs/ab/<sha256>``.
+
+    Every reference (an item's content) is recorded in ``blobs/refs.sqlite`` with the blob
+    it points to. When a reference moves to another blob or is dropped and nothing else
+    points to the old one, that blob is deleted.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, ref: str, data: bytes) -> str:
+        """Store ``data`` (once) and point ``ref`` at it. Returns the blob digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        # Under the lock, so a release of the last other reference cannot delete the blob
+        # between writing it and recording this reference.
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".{digest}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            conn = self._connection()
+            with conn:
+                previous = _ref_digest(conn, ref)
+                conn.execute(
+                    "INSERT OR REPLACE INTO refs (ref, digest) VALUES (?, ?)", (ref, digest)
+                )
+                if previous and previous != digest:
+                    self._drop_if_unused(conn, previous)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        return self.path(digest).read_bytes()
+
+    def release(self, ref: str) -> None:
+        """Forget ``ref``, deleting its blob if nothing else points to it."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                previous = _ref_digest(conn, ref)
+                conn.execute("DELETE FROM refs WHERE ref = ?", (ref,))
+                if previous:
+                    self._drop_if_unused(conn, previous)
+
+    def stats(self) -> dict[str, int]:
+        """Number of references and blobs, and the bytes the blobs take."""
+        with self._lock:
+            conn = self._connection()
+            refs, blobs = conn.execute(
+                "SELECT count(*), count(DISTINCT digest) FROM refs"
+            ).fetchone()
+            digests = [row[0] for row in conn.execute("SELECT DISTINCT digest FROM refs")]
+        size = sum(self.path(digest).stat().st_size for digest in digests)
+        return {"refs": refs, "blobs": blobs, "blob_bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    def _drop_if_unused(self, conn: sqlite3.Connection, digest: str) -> None:
+        used = conn.execute("SELECT 1 FROM refs WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        if not used:
+            self.path(digest).unlink(missing_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.root / REFS_NAME, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS refs (
+                    ref TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_refs_digest ON refs(digest);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+
+def resolve_content(data_root: Path, content_path: str | Path) -> Path:
+    """Where the bytes of a stored ``content_path`` live.
+
+    Items stored in the blob layer keep a ``content.blob`` pointer (the blob digest) next
+    to where ``content.md`` would be; other items are the plain file itself.
+    """
+    path = data_root / content_path
+    if path.exists():
+        return path
+    pointer = path.with_name(CONTENT_POINTER)
+    if not pointer.exists():
+        return path
+    digest = pointer.read_text(encoding="utf-8").strip()
+    return data_root / BLOBS_DIR / digest[:2] / digest
+
+
+def _ref_digest(conn: sqlite3.Connection, ref: str) -> str | None:
+    row = conn.execute("SELECT digest FROM refs WHERE ref = ?", (ref,)).fetchone()
+    return row[0] if row else None
@@ -4,12 +4,26 @@ import argparse
 import json
 import pydoc
 import sys
+import time
+from contextlib import nullcontext
+from dataclasses import asdict
+from pathlib import Path
 
+from .compression import NO_COMPRESSION, ZSTD
 from .ingest import ingest_all, ingest_source
-from .queries import query_by_archive_date, query_by_keyword, query_by_source
+from .pagination import next_cursor
+from .queries import (
+    explain_queries,
+    query_by_archive_date,
+    query_by_keyword,
+    query_by_source,
+)
+from .snapshot_format import SNAPSHOT_FORMATS
 from .sources.registry import get_source, list_sources
-from .sqlite_index import rebuild_sqlite_index
+from .sqlite_index import SQLiteIndex, rebuild_sqlite_index, sync_sqlite_index
+from .sqlite_store import SQLiteStorage, convert_backend, export_files, open_storage
 from .storage import Storage
+from .storage_config import BACKENDS, CONTENT_STORES
 from .verify_data import verify_data_root
 
 
@@ -19,6 +33,12 @@ def main() -> int:
 
     ingest_parser = subparsers.add_parser("ingest", help="Run ingest")
     ingest_parser.add_argument("--source", help="Source id to ingest")
+    ingest_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of sources to fetch in parallel",
+    )
 
     sources_parser = subparsers.add_parser("sources", help="List sources")
     sources_parser.add_argument("--json", action="store_true", help="JSON output")
@@ -28,6 +48,16 @@ def main() -> int:
     read_parser.add_argument("item_id")
     read_parser.add_argument("--pager", action="store_true", help="Display with pager")
 
+    comments_parser = subparsers.add_parser(
+        "comments", help="Read stored comments of an aggregation item"
+    )
+    comments_parser.add_argument("source_id")
+    comments_parser.add_argument("url")
+    comments_parser.add_argument(
+        "--on", help="Snapshot date (default: the newest snapshot with comments for the url)"
+    )
+    comments_parser.add_argument("--json", action="store_true", help="JSON output")
+
     sqlite_parser = subparsers.add_parser("sqlite", help="Manage SQLite index")
     sqlite_subparsers = sqlite_parser.add_subparsers(dest="sqlite_command", required=True)
     sqlite_rebuild = sqlite_subparsers.add_parser(
@@ -35,6 +65,59 @@ def main() -> int:
         help="Rebuild SQLite index from stored files",
     )
     sqlite_rebuild.add_argument("--json", action="store_true", help="JSON output")
+    sqlite_sync = sqlite_subparsers.add_parser(
+        "sync",
+        help="Load manifest lines and snapshots changed since the last sync",
+    )
+    sqlite_sync.add_argument("--json", action="store_true", help="JSON output")
+    sqlite_subparsers.add_parser("analyze", help="Refresh SQLite query planner statistics")
+
+    storage_parser = subparsers.add_parser("storage", help="Manage the on-disk data layout")
+    storage_subparsers = storage_parser.add_subparsers(dest="storage_command", required=True)
+    storage_convert = storage_subparsers.add_parser(
+        "convert",
+        help="Rewrite stored snapshots or content in another layout and make it the default",
+    )
+    storage_convert.add_argument(
+        "--snapshot-format",
+        choices=SNAPSHOT_FORMATS,
+        help="json (pretty-printed) or columnar (compact, dictionary-encoded); "
+        "default: keep the current format and only migrate older layouts (inline comments "
+        "to sidecars, single manifests to monthly partitions)",
+    )
+    storage_convert.add_argument(
+        "--content-store",
+        choices=CONTENT_STORES,
+        help="files (one content.md per item), blobs (deduplicated by content hash) "
+        "or pack (one append-only pack per source)",
+    )
+    storage_convert.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        help="files (the directory layout) or sqlite (everything in one store.sqlite); "
+        "cannot be combined with the other options",
+    )
+    storage_convert.add_argument("--source", action="append", help="Source id (repeatable)")
+    storage_convert.add_argument("--json", action="store_true", help="JSON output")
+    storage_export = storage_subparsers.add_parser(
+        "export", help="Write the sqlite backend's data to a data root in the file layout"
+    )
+    storage_export.add_argument("dest", help="Destination data root")
+    storage_export.add_argument("--json", action="store_true", help="JSON output")
+    storage_compact = storage_subparsers.add_parser(
+        "compact", help="Rewrite item packs without the bytes of replaced or moved items"
+    )
+    storage_compact.add_argument("--source", action="append", help="Source id (repeatable)")
+    storage_compact.add_argument("--json", action="store_true", help="JSON output")
+    storage_compress = storage_subparsers.add_parser(
+        "compress",
+        help="Compress stored item files and snapshots with per-source zstd dictionaries",
+    )
+    storage_compress.add_argument(
+        "--decompress", action="store_true", help="Write everything back uncompressed"
+    )
+    storage_compress.add_argument("--source", action="append", help="Source id (repeatable)")
+    storage_compress.add_argument("--json", action="store_true", help="JSON output")
 
     query_parser = subparsers.add_parser("query", help="Query stored records")
     query_subparsers = query_parser.add_subparsers(dest="query_command", required=True)
@@ -43,12 +126,56 @@ def main() -> int:
     query_source.add_argument("source_id")
     query_source.add_argument("--limit", type=int)
     query_source.add_argument("--json", action="store_true", help="JSON output")
+    query_source.add_argument(
+        "--after",
+        metavar="CURSOR",
+        help="Continue after the next_cursor of a previous page",
+    )
+    query_source.add_argument(
+        "--with-cursor",
+        action="store_true",
+        help="Wrap JSON output as a page with its next_cursor (implied by --after)",
+    )
+    query_source.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print the SQLite query plan and timing to stderr",
+    )
 
     query_keyword = query_subparsers.add_parser("keyword", help="Query by keyword")
     query_keyword.add_argument("keyword")
     query_keyword.add_argument("--source")
+    query_keyword.add_argument("--from", dest="start")
+    query_keyword.add_argument("--to", dest="end")
+    keyword_mode = query_keyword.add_mutually_exclusive_group()
+    keyword_mode.add_argument(
+        "--fts",
+        action="store_true",
+        help="Full-text search over title, author and content (needs the SQLite index)",
+    )
+    keyword_mode.add_argument(
+        "--substring",
+        action="store_true",
+        help="Substring search over title, author and content, any script "
+        "(needs the SQLite index)",
+    )
     query_keyword.add_argument("--limit", type=int)
     query_keyword.add_argument("--json", action="store_true", help="JSON output")
+    query_keyword.add_argument(
+        "--after",
+        metavar="CURSOR",
+        help="Continue after the next_cursor of a previous page",
+    )
+    query_keyword.add_argument(
+        "--with-cursor",
+        action="store_true",
+        help="Wrap JSON output as a page with its next_cursor (implied by --after)",
+    )
+    query_keyword.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print the SQLite query plan and timing to stderr",
+    )
 
     query_archive = query_subparsers.add_parser("archive", help="Query by archive date")
     query_archive.add_argument("--on")
@@ -57,6 +184,21 @@ def main() -> int:
     query_archive.add_argument("--source")
     query_archive.add_argument("--limit", type=int)
     query_archive.add_argument("--json", action="store_true", help="JSON output")
+    query_archive.add_argument(
+        "--after",
+        metavar="CURSOR",
+        help="Continue after the next_cursor of a previous page",
+    )
+    query_archive.add_argument(
+        "--with-cursor",
+        action="store_true",
+        help="Wrap JSON output as a page with its next_cursor (implied by --after)",
+    )
+    query_archive.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print the SQLite query plan and timing to stderr",
+    )
 
     verify_parser = subparsers.add_parser("verify", help="Verify stored data under data/")
     verify_parser.add_argument("--source", action="append", help="Source id to verify (repeatable)")
@@ -82,147 +224,382 @@ def main() -> int:
     args = parser.parse_args()
 
     if args.command == "ingest":
-        report = ingest_source(args.source) if args.source else ingest_all()
-        print(json.dumps(report, ensure_ascii=False, indent=2))
-        return 0
+        return _run_ingest(args)
+
+    storage = open_storage()
+    handlers = {
+        "verify": _run_verify,
+        "sources": _run_sources,
+        "read": _run_read,
+        "comments": _run_comments,
+        "sqlite": _run_sqlite,
+        "storage": _run_storage,
+        "query": _run_query,
+    }
+    handler = handlers.get(args.command)
+    if handler is None:
+        return 1
+    return handler(storage, args)
+
+
+def _run_ingest(args: argparse.Namespace) -> int:
+    if args.source:
+        report = ingest_source(args.source)
+    else:
+        report = ingest_all(concurrency=args.workers)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
 
-    storage = Storage()
 
-    if args.command == "verify":
-        source_ids = set(args.source) if args.source else None
-        report = verify_data_root(
-            storage.data_root,
-            source_ids=source_ids,
-            min_content_chars=args.min_chars,
-            max_issues=args.max_issues,
-            include_snippets=args.snippets,
+def _run_verify(storage: Storage, args: argparse.Namespace) -> int:
+    if isinstance(storage, SQLiteStorage):
+        # Migrated sources only keep state.json, which verify would flag as unrecognized.
+        print(
+            "verify checks the file layout and this data root uses the sqlite backend; "
+            "export it with `article-harvest storage export DEST` and verify DEST "
+            "(verify_data_root)",
+            file=sys.stderr,
         )
-        if args.json:
-            print(json.dumps(report, ensure_ascii=False, indent=2))
-            return 0
-
-        totals = report.get("totals") or {}
-        items_checked = totals.get("items_checked")
-        issues_total = totals.get("issues_total")
-        issues_truncated = totals.get("issues_truncated")
+        return 2
+    source_ids = set(args.source) if args.source else None
+    report = verify_data_root(
+        storage.data_root,
+        source_ids=source_ids,
+        min_content_chars=args.min_chars,
+        max_issues=args.max_issues,
+        include_snippets=args.snippets,
+    )
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    totals = report.get("totals") or {}
+    items_checked = totals.get("items_checked")
+    issues_total = totals.get("issues_total")
+    issues_truncated = totals.get("issues_truncated")
+    print(
+        f"items_checked={items_checked} issues_total={issues_total} "
+        f"issues_truncated={issues_truncated}"
+    )
+    for entry in report.get("sources") or []:
+        issues = entry.get("issues") or {}
+        issues_str = ", ".join([f"{k}={v}" for k, v in sorted(issues.items())])
         print(
-            f"items_checked={items_checked} issues_total={issues_total} "
-            f"issues_truncated={issues_truncated}"
+            f"- {entry.get('source_id')} ({entry.get('kind')}): "
+            f"items_checked={entry.get('items_checked')} issues={issues_str or 'none'}"
         )
-        for entry in report.get("sources") or []:
-            issues = entry.get("issues") or {}
-            issues_str = ", ".join([f"{k}={v}" for k, v in sorted(issues.items())])
+    if report.get("issues"):
+        print("\nexamples:")
+        for issue in report["issues"][: min(20, len(report["issues"]))]:
+            detail = issue.get("detail")
+            extra = f" ({detail})" if detail else ""
+            path = issue.get("path") or ""
             print(
-                f"- {entry.get('source_id')} ({entry.get('kind')}): "
-                f"items_checked={entry.get('items_checked')} issues={issues_str or 'none'}"
+                f"- {issue.get('source_id')}:{issue.get('item_id') or '-'} "
+                f"{issue.get('issue_type')}{extra} {path}"
             )
-        if report.get("issues"):
-            print("\nexamples:")
-            for issue in report["issues"][: min(20, len(report["issues"]))]:
-                detail = issue.get("detail")
-                extra = f" ({detail})" if detail else ""
-                path = issue.get("path") or ""
-                print(
-                    f"- {issue.get('source_id')}:{issue.get('item_id') or '-'} "
-                    f"{issue.get('issue_type')}{extra} {path}"
-                )
-        return 0
+    return 0
 
-    if args.command == "sources":
-        sources = list_sources()
-        if args.json:
-            payload = [
-                {
-                    "id": source.id,
-                    "name": source.name,
-                    "kind": source.kind,
-                    "method": source.method,
-                    "enabled": source.enabled,
-                }
-                for source in sources
-            ]
-            print(json.dumps(payload, ensure_ascii=False, indent=2))
-        else:
-            for source in sources:
-                suffix = "" if source.enabled else " [disabled]"
-                print(f"- {source.id} ({source.kind}, {source.method}){suffix}")
-        return 0
 
-    if args.command == "read":
-        source = get_source(args.source_id)
-        if source.kind != "blog":
-            print("read is only supported for blog sources", file=sys.stderr)
-            return 2
-        content_path = storage.content_path(args.source_id, args.item_id)
-        if not content_path.exists():
-            print(f"content not found: {content_path}", file=sys.stderr)
-            return 2
-        content = content_path.read_text(encoding="utf-8")
-        if args.pager:
-            pydoc.pager(content)
-        else:
-            sys.stdout.write(content)
+def _run_sources(storage: Storage, args: argparse.Namespace) -> int:
+    sources = list_sources()
+    if args.json:
+        payload = [
+            {
+                "id": source.id,
+                "name": source.name,
+                "kind": source.kind,
+                "method": source.method,
+                "enabled": source.enabled,
+            }
+            for source in sources
+        ]
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    else:
+        for source in sources:
+            suffix = "" if source.enabled else " [disabled]"
+            print(f"- {source.id} ({source.kind}, {source.method}){suffix}")
+    return 0
+
+
+def _run_read(storage: Storage, args: argparse.Namespace) -> int:
+    source = get_source(args.source_id)
+    if source.kind != "blog":
+        print("read is only supported for blog sources", file=sys.stderr)
+        return 2
+    content_path = storage.content_path(args.source_id, args.item_id)
+    content = storage.read_content(str(content_path))
+    if content is None:
+        print(f"content not found: {content_path}", file=sys.stderr)
+        return 2
+    if args.pager:
+        pydoc.pager(content)
+    else:
+        sys.stdout.write(content)
+    return 0
+
+
+def _run_comments(storage: Storage, args: argparse.Namespace) -> int:
+    source = get_source(args.source_id)
+    if source.kind != "aggregation":
+        print("comments are only stored for aggregation sources", file=sys.stderr)
+        return 2
+    comments = storage.load_comments(args.source_id, args.url, args.on)
+    if args.json:
+        print(json.dumps([asdict(comment) for comment in comments], ensure_ascii=False, indent=2))
         return 0
+    if not comments:
+        print(f"no comments stored for {args.url}", file=sys.stderr)
+        return 2
+    for comment in comments:
+        print(f"{comment.author or '-'} | {comment.published_at or '-'}")
+        print(comment.text)
+        print()
+    return 0
 
-    if args.command == "sqlite":
-        report = rebuild_sqlite_index(storage, list_sources(include_disabled=False))
-        if args.json:
-            print(json.dumps(report, ensure_ascii=False, indent=2))
+
+def _run_sqlite(storage: Storage, args: argparse.Namespace) -> int:
+    if isinstance(storage, SQLiteStorage) and args.sqlite_command != "analyze":
+        print(f"The sqlite backend keeps {storage.index.path()} up to date; nothing to do")
+        return 0
+    if args.sqlite_command == "analyze":
+        if isinstance(storage, SQLiteStorage):
+            index = storage.index
         else:
-            print(f"SQLite index rebuilt at {report['path']} with {report['records']} records")
+            index = SQLiteIndex(storage.data_root)
+        if not index.exists():
+            print("SQLite index not found (article-harvest sqlite rebuild)", file=sys.stderr)
+            return 2
+        index.analyze()
+        index.close()
+        print(f"SQLite statistics refreshed at {index.path()}")
         return 0
+    sources = list_sources(include_disabled=False)
+    if args.sqlite_command == "sync":
+        report = sync_sqlite_index(storage, sources)
+        message = (
+            f"SQLite index synced at {report['path']}: {report['files_changed']} changed files, "
+            f"{report['upserted']} upserted, {report['deleted']} deleted"
+        )
+    else:
+        report = rebuild_sqlite_index(storage, sources)
+        message = f"SQLite index rebuilt at {report['path']} with {report['records']} records"
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(message)
+    return 0
 
-    if args.command == "query":
-        if args.query_command == "source":
-            source = get_source(args.source_id)
-            records = query_by_source(storage, source, limit=args.limit)
-            _print_records(storage, records, args.json)
-            return 0
-        if args.query_command == "keyword":
-            records = query_by_keyword(
-                storage,
-                list_sources(),
-                args.keyword,
-                source_id=args.source,
-                limit=args.limit,
-            )
-            _print_records(storage, records, args.json)
-            return 0
-        if args.query_command == "archive":
-            records = query_by_archive_date(
-                storage,
-                list_sources(),
-                on=args.on,
-                start=args.start,
-                end=args.end,
-                source_id=args.source,
-                limit=args.limit,
+
+def _run_storage(storage: Storage, args: argparse.Namespace) -> int:
+    if args.storage_command == "compress":
+        return _run_storage_compress(storage, args)
+    try:
+        if args.storage_command == "compact":
+            return _run_storage_compact(storage, args)
+        if args.storage_command == "export":
+            return _run_storage_export(storage, args)
+        if args.backend:
+            return _run_storage_backend(storage, args)
+        return _run_storage_convert(storage, args)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+
+
+def _run_storage_convert(storage: Storage, args: argparse.Namespace) -> int:
+    reports = {}
+    messages = []
+    if not args.snapshot_format and not args.content_store:
+        report = reports["manifests"] = storage.partition_manifests(args.source)
+        messages.append(
+            f"Split {report['manifests_split']} manifests ({report['rows']} rows) into "
+            f"{report['partitions']} monthly partitions"
+        )
+    if args.snapshot_format or not args.content_store:
+        report = reports["snapshots"] = storage.convert_snapshots(
+            args.snapshot_format, args.source
+        )
+        messages.append(
+            f"Converted {report['files_converted']} snapshots to {report['snapshot_format']}: "
+            f"{report['bytes_before']} -> {report['bytes_after']} bytes"
+        )
+    if args.content_store:
+        report = reports["content"] = storage.convert_content(args.content_store, args.source)
+        messages.append(
+            f"Moved {report['items_converted']} items to {report['content_store']}: "
+            f"{report['bytes_before']} -> {report['bytes_after']} content bytes"
+        )
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        print("\n".join(messages))
+    return 0
+
+
+def _run_storage_backend(storage: Storage, args: argparse.Namespace) -> int:
+    if args.snapshot_format or args.content_store:
+        raise ValueError("--backend cannot be combined with --snapshot-format or --content-store")
+    if args.source:
+        raise ValueError("--backend converts every stored source; drop --source")
+    report = convert_backend(storage.data_root, args.backend, list_sources())
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"Moved {report['items']} items and {report['snapshots']} snapshots of "
+            f"{report['sources']} sources to the {report['backend']} backend"
+        )
+        for source_id in report.get("skipped", []):
+            print(f"- skipped {source_id}: not a registered source", file=sys.stderr)
+        if report.get("malformed"):
+            print(
+                f"- left out {report['malformed']} manifest rows without an id or url",
+                file=sys.stderr,
             )
-            _print_records(storage, records, args.json)
-            return 0
+    return 0
 
-    return 1
 
+def _run_storage_export(storage: Storage, args: argparse.Namespace) -> int:
+    if not isinstance(storage, SQLiteStorage):
+        raise ValueError("storage export reads the sqlite backend; this data root uses files")
+    report = export_files(storage, Storage(Path(args.dest)))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"Exported {report['items']} items and {report['snapshots']} snapshots of "
+            f"{report['sources']} sources to {report['path']}"
+        )
+    return 0
 
-def _print_records(storage: Storage, records, as_json: bool) -> None:
+
+def _run_storage_compact(storage: Storage, args: argparse.Namespace) -> int:
+    report = storage.compact_packs(args.source)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"Compacted {report['packs']} packs: "
+            f"{report['bytes_before']} -> {report['bytes_after']} bytes"
+        )
+    return 0
+
+
+def _run_storage_compress(storage: Storage, args: argparse.Namespace) -> int:
+    compression = NO_COMPRESSION if args.decompress else ZSTD
+    try:
+        report = storage.compress_stored(compression, args.source)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    ratio = report["bytes_before"] / max(report["bytes_after"], 1)
+    print(
+        f"Rewrote {report['files_rewritten']} of {report['files']} files as {compression}: "
+        f"{report['bytes_before']} -> {report['bytes_after']} bytes ({ratio:.1f}x)"
+    )
+    print(
+        f"Reading a file: {report['read_us_before']} -> {report['read_us_after']} us on average"
+    )
+    return 0
+
+
+def _run_query(storage: Storage, args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    with explain_queries(storage) if args.explain else nullcontext([]) as traces:
+        try:
+            records = _query_records(storage, args)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return 2
+    elapsed = time.perf_counter() - started
+    if records is None:
+        return 1
+    paged = bool(args.after or args.with_cursor)
+    cursor = next_cursor(records, args.limit) if paged or args.limit else None
+    _print_records(storage, records, args.json, paged=paged, cursor=cursor)
+    if args.explain:
+        _print_explain(traces, elapsed)
+    return 0
+
+
+def _query_records(storage: Storage, args: argparse.Namespace) -> list | None:
+    if args.query_command == "source":
+        return query_by_source(
+            storage, get_source(args.source_id), limit=args.limit, after=args.after
+        )
+    if args.query_command == "keyword":
+        return query_by_keyword(
+            storage,
+            list_sources(),
+            args.keyword,
+            source_id=args.source,
+            limit=args.limit,
+            start=args.start,
+            end=args.end,
+            fts=args.fts,
+            substring=args.substring,
+            after=args.after,
+        )
+    if args.query_command == "archive":
+        return query_by_archive_date(
+            storage,
+            list_sources(),
+            on=args.on,
+            start=args.start,
+            end=args.end,
+            source_id=args.source,
+            limit=args.limit,
+            after=args.after,
+        )
+    return None
+
+
+def _print_explain(traces: list[dict], elapsed: float) -> None:
+    # stderr keeps --json output on stdout parseable.
+    if not traces:
+        print("explain: no SQLite index, answered by scanning stored files", file=sys.stderr)
+    for trace in traces:
+        print(
+            f"explain: {trace['rows']} rows in {trace['elapsed_ms']:.3f} ms\n"
+            f"  sql: {trace['sql']}",
+            file=sys.stderr,
+        )
+        for step in trace["plan"]:
+            print(f"  plan: {step}", file=sys.stderr)
+    print(f"explain: total {elapsed * 1000:.3f} ms", file=sys.stderr)
+
+
+def _print_records(
+    storage: Storage,
+    records,
+    as_json: bool,
+    paged: bool = False,
+    cursor: str | None = None,
+) -> None:
     if as_json:
         payload = []
         for record in records:
             data = record.to_dict()
             data["has_content"] = _has_content(storage, record)
             payload.append(data)
-        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        # Plain lists stay the default output; pages wrap them with their cursor.
+        output = {"records": payload, "next_cursor": cursor} if paged else payload
+        print(json.dumps(output, ensure_ascii=False, indent=2))
         return
     for record in records:
         marker = "* " if _has_content(storage, record) else "  "
         print(f"{marker}{record.archived_at} | {record.source_id} | {record.title}")
         print(f"  {record.url}")
+    if cursor:
+        print(f"next_cursor: {cursor}")
 
 
 def _has_content(storage: Storage, record) -> bool:
-    if not record.content_path:
-        return False
-    return (storage.data_root / record.content_path).exists()
+    return storage.has_content(record.content_path)
 
 
 if __name__ == "__main__":
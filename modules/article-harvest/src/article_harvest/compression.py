@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+NO_COMPRESSION = "none"
+ZSTD = "zstd"
+COMPRESSIONS = (NO_COMPRESSION, ZSTD)
+DICTIONARY_NAME = "zstd.dict"
+DICTIONARY_SIZE = 64 * 1024
+LEVEL = 9
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def is_compressed(data: bytes) -> bool:
+    # Neither UTF-8 text nor JSON can start with the zstd frame magic.
+    return data[:4] == ZSTD_MAGIC
+
+
+class SourceCodec:
+    """zstd frames for one source's stored files, using a dictionary trained on them.
+
+    The dictionary (``zstd.dict`` in the source directory) is trained once and kept, since
+    every frame written with it needs it to decompress. Frames written without it still
+    decompress, and data that is not a zstd frame is returned as is.
+    """
+
+    def __init__(self, source_root: Path) -> None:
+        self.path = source_root / DICTIONARY_NAME
+        self._lock = threading.Lock()
+        self._compressor = None
+        self._decompressor = None
+
+    def has_dictionary(self) -> bool:
+        return self.path.exists()
+
+    def train(self, samples: list[bytes]) -> bool:
+        """Train and save the dictionary; ``False`` when the samples are too few for one."""
+        zstd = _zstd()
+        try:
+            dictionary = zstd.train_dictionary(DICTIONARY_SIZE, samples)
+        except zstd.ZstdError:
+            return False
+        tmp_path = self.path.with_name(f".{DICTIONARY_NAME}.tmp")
+        tmp_path.write_bytes(dictionary.as_bytes())
+        os.replace(tmp_path, self.path)
+        self.reset()
+        return True
+
+    def compress(self, data: bytes) -> bytes:
+        zstd = _zstd()
+        with self._lock:
+            if self._compressor is None:
+                dictionary = self._dictionary(zstd)
+                self._compressor = zstd.ZstdCompressor(level=LEVEL, dict_data=dictionary)
+            return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        if not is_compressed(data):
+            return data
+        zstd = _zstd()
+        with self._lock:
+            if self._decompressor is None:
+                self._decompressor = zstd.ZstdDecompressor(dict_data=self._dictionary(zstd))
+            try:
+                return self._decompressor.decompress(data)
+            except zstd.ZstdError as exc:
+                raise ValueError(f"Unreadable zstd frame: {exc}") from None
+
+    def reset(self) -> None:
+        """Forget the loaded dictionary, after it was trained or removed."""
+        with self._lock:
+            self._compressor = None
+            self._decompressor = None
+
+    def _dictionary(self, zstd):
+        if not self.path.exists():
+            return None
+        return zstd.ZstdCompressionDict(self.path.read_bytes())
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(
+            "zstd compression needs the zstandard package: pip install 'article-harvest[zstd]'"
+        ) from None
+    return zstandard
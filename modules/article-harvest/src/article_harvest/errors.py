@@ -4,3 +4,7 @@ class HarvestError(RuntimeError):
 
 class FetchError(HarvestError):
     pass
+
+
+class SourceUnchanged(HarvestError):
+    """Raised when a source's payload is identical to the one stored on its last run."""
@@ -1,18 +1,71 @@
 from __future__ import annotations
 
+import threading
+from collections.abc import Callable
 from typing import Any
 
 import requests
 
+from .http_cache import CachingAdapter, HTTPCache
+
 USER_AGENT = "article-harvest/0.1 (+local)"
 
 
-def create_session() -> requests.Session:
+def create_session(cache: HTTPCache | None = None) -> requests.Session:
     session = requests.Session()
     session.headers.update({"User-Agent": USER_AGENT})
+    if cache is not None:
+        adapter = CachingAdapter(cache)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
     return session
 
 
+def cache_stats(session: requests.Session) -> dict[str, int] | None:
+    adapter = getattr(session, "adapters", {}).get("https://")
+    if not isinstance(adapter, CachingAdapter):
+        return None
+    return {name: adapter.stats[name] for name in ("hits", "revalidated", "misses")}
+
+
+class WorkerSessions:
+    """One session per worker thread for a fetch that fans out over a thread pool.
+
+    ``requests.Session`` is not thread-safe, so each thread gets its own from
+    ``factory``; without a factory every thread shares ``fallback``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], requests.Session] | None,
+        fallback: requests.Session,
+    ) -> None:
+        self._factory = factory
+        self._fallback = fallback
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: list[requests.Session] = []
+
+    def get(self) -> requests.Session:
+        if self._factory is None:
+            return self._fallback
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._factory()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> list[dict[str, int]]:
+        """Close the sessions handed out and return the cache stats of each."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        stats = [cache_stats(session) for session in sessions]
+        for session in sessions:
+            session.close()
+        return [entry for entry in stats if entry is not None]
+
+
 def get_text(session: requests.Session, url: str, timeout: int = 20) -> str:
     response = session.get(url, timeout=timeout)
     response.raise_for_status()
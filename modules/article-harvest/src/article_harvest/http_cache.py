@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 0
+
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    key: str
+    url: str
+    headers: dict[str, str]
+    stored_at: float
+    expires_at: float
+    size: int
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("Last-Modified")
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expires_at > now
+
+
+class HTTPCache:
+    """Disk cache of GET responses with validators, per-entry TTLs and LRU eviction.
+
+    Each entry is a ``{key}.json`` metadata file plus a ``{key}.body`` payload. The
+    metadata mtime is the last access time used for eviction.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        default_ttl: int = DEFAULT_TTL,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        key = _cache_key(url)
+        meta_path = self._meta_path(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if meta.get("url") != url or not self._body_path(key).exists():
+            return None
+        return CacheEntry(
+            key=key,
+            url=url,
+            headers=dict(meta.get("headers") or {}),
+            stored_at=float(meta.get("stored_at") or 0),
+            expires_at=float(meta.get("expires_at") or 0),
+            size=int(meta.get("size") or 0),
+        )
+
+    def read_body(self, entry: CacheEntry) -> bytes | None:
+        try:
+            body = self._body_path(entry.key).read_bytes()
+        except OSError:
+            return None
+        _touch(self._meta_path(entry.key))
+        return body
+
+    def store(self, url: str, headers: Any, body: bytes) -> CacheEntry | None:
+        ttl = self._ttl(headers)
+        if ttl is None:
+            return None
+        kept = {name: headers[name] for name in _KEPT_HEADERS if headers.get(name)}
+        if ttl <= 0 and "ETag" not in kept and "Last-Modified" not in kept:
+            # Nothing to revalidate with and no freshness window: caching is useless.
+            return None
+        now = time.time()
+        entry = CacheEntry(
+            key=_cache_key(url),
+            url=url,
+            headers=kept,
+            stored_at=now,
+            expires_at=now + ttl,
+            size=len(body),
+        )
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            previous = self._entry_size(entry.key)
+            _atomic_write(self._body_path(entry.key), body)
+            self._write_meta(entry)
+            self._adjust_total(entry.size - previous)
+            self._evict(keep=entry.key)
+        return entry
+
+    def refresh(self, entry: CacheEntry, headers: Any) -> CacheEntry:
+        """Extend an entry after a 304, picking up any new validators or TTL."""
+        ttl = self._ttl(headers) or 0
+        merged = dict(entry.headers)
+        merged.update({name: headers[name] for name in _KEPT_HEADERS if headers.get(name)})
+        now = time.time()
+        refreshed = CacheEntry(
+            key=entry.key,
+            url=entry.url,
+            headers=merged,
+            stored_at=now,
+            expires_at=now + ttl,
+            size=entry.size,
+        )
+        with self._lock:
+            self._write_meta(refreshed)
+        return refreshed
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._current_total()
+
+    def _ttl(self, headers: Any) -> int | None:
+        cache_control = str(headers.get("Cache-Control") or "")
+        lowered = cache_control.lower()
+        if "no-store" in lowered:
+            return None
+        if "no-cache" in lowered:
+            return 0
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return int(match.group(1))
+        expires = headers.get("Expires")
+        if expires:
+            try:
+                return max(0, int(parsedate_to_datetime(str(expires)).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                return 0
+        return self.default_ttl
+
+    def _evict(self, keep: str) -> None:
+        total = self._current_total()
+        if total <= self.max_bytes:
+            return
+        metas = sorted(self.root.glob("*.json"), key=_mtime)
+        for meta_path in metas:
+            if total <= self.max_bytes:
+                break
+            key = meta_path.stem
+            if key == keep:
+                continue
+            total -= self._entry_size(key)
+            meta_path.unlink(missing_ok=True)
+            self._body_path(key).unlink(missing_ok=True)
+        self._total_bytes = total
+
+    def _current_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(
+                path.stat().st_size for path in self.root.glob("*.body") if path.is_file()
+            )
+        return self._total_bytes
+
+    def _adjust_total(self, delta: int) -> None:
+        if self._total_bytes is not None:
+            self._total_bytes += delta
+
+    def _entry_size(self, key: str) -> int:
+        try:
+            return self._body_path(key).stat().st_size
+        except OSError:
+            return 0
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        payload = {
+            "url": entry.url,
+            "headers": entry.headers,
+            "stored_at": entry.stored_at,
+            "expires_at": entry.expires_at,
+            "size": entry.size,
+        }
+        _atomic_write(
+            self._meta_path(entry.key),
+            json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        )
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / f"{key}.body"
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTP adapter that answers GETs from an ``HTTPCache`` and revalidates stale entries.
+
+    ``stats`` counts ``hits`` (served without a request), ``revalidated`` (304) and
+    ``misses`` (full response) for this adapter only, so one adapter per session gives
+    per-source numbers.
+    """
+
+    def __init__(self, cache: HTTPCache, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.stats: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if request.method != "GET" or not request.url:
+            return super().send(request, **kwargs)
+
+        entry = self.cache.lookup(request.url)
+        if entry and entry.is_fresh(time.time()):
+            cached = self._cached_response(request, entry)
+            if cached is not None:
+                self._count("hits")
+                return cached
+            entry = None
+        if entry:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = super().send(request, **kwargs)
+        if entry and response.status_code == 304:
+            refreshed = self.cache.refresh(entry, response.headers)
+            cached = self._cached_response(request, refreshed)
+            if cached is not None:
+                self._count("revalidated")
+                response.close()
+                return cached
+            # The body was evicted after the lookup; ask again without validators.
+            response.close()
+            request.headers.pop("If-None-Match", None)
+            request.headers.pop("If-Modified-Since", None)
+            response = super().send(request, **kwargs)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self.cache.store(request.url, response.headers, response.content)
+        return response
+
+    def _cached_response(self, request: PreparedRequest, entry: CacheEntry) -> Response | None:
+        body = self.cache.read_body(entry)
+        if body is None:
+            return None
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
@@ -1,75 +1,180 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from .errors import FetchError
-from .http import create_session
-from .models import BlogItem, FetchContext, Source
+from .errors import FetchError, SourceUnchanged
+from .http import cache_stats, create_session
+from .http_cache import HTTPCache
+from .models import BlogItem, FetchContext, FetchState, Record, Source
 from .sources.registry import get_source, list_sources
 from .sqlite_index import SQLiteIndex
+from .sqlite_store import SQLiteStorage, open_storage
 from .storage import Storage
 from .time_utils import iso_now
 
 
-def ingest_all(storage: Storage | None = None) -> dict:
-    storage = storage or Storage()
+def ingest_all(storage: Storage | None = None, concurrency: int = 1) -> dict:
+    storage = storage or open_storage()
     sources = list_sources(include_disabled=False)
-    return _run_ingest(storage, sources)
+    return _run_ingest(storage, sources, concurrency=concurrency)
 
 
 def ingest_source(source_id: str, storage: Storage | None = None) -> dict:
-    storage = storage or Storage()
+    storage = storage or open_storage()
     source = get_source(source_id)
     return _run_ingest(storage, [source])
 
 
-def _run_ingest(storage: Storage, sources: list[Source]) -> dict:
+def _run_ingest(storage: Storage, sources: list[Source], concurrency: int = 1) -> dict:
     run_id = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
     started_at = iso_now()
-    session = create_session()
-    ctx = FetchContext(session=session, run_id=run_id, now=datetime.utcnow())
-    sqlite_index = SQLiteIndex(storage.data_root)
-    sqlite_enabled = sqlite_index.exists()
-
-    successes: list[dict] = []
-    failures: list[dict] = []
-
-    for source in sources:
-        try:
-            items = source.fetch(ctx)
-            if not items:
-                raise FetchError("no items returned")
-            if source.kind == "aggregation":
-                storage.save_snapshot(source, items)
-                if sqlite_enabled:
-                    sqlite_index.upsert_records(storage.iter_snapshot_records(source))
-                successes.append({"source_id": source.id, "stored": len(items)})
-            else:
-                stored = storage.save_blog_items(source, _as_blog_items(items))
-                if sqlite_enabled and stored:
-                    sqlite_index.upsert_records(stored)
-                successes.append(
-                    {
-                        "source_id": source.id,
-                        "stored": len(stored),
-                        "fetched": len(items),
-                    }
-                )
-        except Exception as exc:  # pragma: no cover - error formatting
-            failures.append({"source_id": source.id, "error": str(exc)})
+    now = datetime.utcnow()
+    sqlite_index = SQLiteIndex(storage.data_root, storage=storage)
+    # The sqlite backend indexes records as it stores them.
+    side_index = sqlite_index.exists() and not isinstance(storage, SQLiteStorage)
+    index_lock = threading.Lock() if side_index else None
+    http_cache = HTTPCache(storage.http_cache_dir())
+
+    def _ingest(source: Source) -> tuple[str, dict]:
+        return _ingest_one(storage, source, run_id, now, sqlite_index, index_lock, http_cache)
+
+    workers = max(1, min(concurrency, len(sources)))
+    try:
+        if workers == 1:
+            outcomes = [_ingest(source) for source in sources]
+        else:
+            # Sources only share the filesystem (one directory each) and the SQLite
+            # index, which is guarded by index_lock. map() keeps the report in
+            # source order regardless of completion order.
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_ingest, sources))
+    finally:
+        sqlite_index.close()
 
     report = {
         "run_id": run_id,
         "started_at": started_at,
         "sources": [source.id for source in sources],
-        "successes": successes,
-        "failures": failures,
+        "concurrency": workers,
+        "successes": [entry for status, entry in outcomes if status == "success"],
+        "unchanged": [entry for status, entry in outcomes if status == "unchanged"],
+        "failures": [entry for status, entry in outcomes if status == "failure"],
+        "http_cache": _total_cache_stats([entry for _, entry in outcomes]),
         "finished_at": iso_now(),
     }
     storage.record_run(run_id, report)
     return report
 
 
+def _ingest_one(
+    storage: Storage,
+    source: Source,
+    run_id: str,
+    now: datetime,
+    sqlite_index: SQLiteIndex,
+    index_lock: threading.Lock | None,
+    http_cache: HTTPCache,
+) -> tuple[str, dict]:
+    started = time.perf_counter()
+    # Each source gets its own session so workers never share connection pools
+    # or cookie jars across threads; the disk cache behind them is shared.
+    session = create_session(cache=http_cache)
+    state = FetchState(previous=storage.load_fingerprints(source.id))
+    ctx = FetchContext(
+        session=session,
+        run_id=run_id,
+        now=now,
+        cache_dir=storage.cache_dir(),
+        state=state,
+        known=storage.known_urls(source.id) if source.kind == "blog" else None,
+        session_factory=lambda: create_session(cache=http_cache),
+    )
+    try:
+        items = source.fetch(ctx)
+        if not items:
+            raise FetchError("no items returned")
+        if source.kind == "aggregation":
+            snapshot_path = storage.save_snapshot(source, items)
+            if index_lock:
+                # Older snapshots are already indexed; only this run's file changed.
+                with index_lock:
+                    sqlite_index.upsert_records(storage.snapshot_records(source, snapshot_path))
+            entry: dict = {"source_id": source.id, "stored": len(items)}
+            incomplete = 0
+        else:
+            # Looked up before saving: the save may fill in their content.
+            repairable = _incomplete_rows(storage, source, ctx.known, items) if index_lock else []
+            stored = storage.save_blog_items(source, _as_blog_items(items))
+            # A content repair rewrites a stored item's text but not its manifest row,
+            # so neither this upsert nor a sync would pick it up otherwise.
+            reindexed = stored + storage.manifest_records(source, repairable)
+            if index_lock and reindexed:
+                with index_lock:
+                    sqlite_index.upsert_records(reindexed)
+            entry = {
+                "source_id": source.id,
+                "stored": len(stored),
+                "fetched": len(items),
+            }
+            incomplete = _count_incomplete(storage, source, stored)
+            if incomplete:
+                entry["incomplete"] = incomplete
+        # Only remember payload fingerprints once their items are safely stored. Items
+        # first stored without content hold them back for one run, so an unchanged feed
+        # still gets parsed once more to repair those articles. Older incomplete items
+        # do not: a post that never gets content would disable the shortcut for good.
+        if state.current and not incomplete:
+            storage.save_fingerprints(source.id, state.current)
+        status = "success"
+    except SourceUnchanged:
+        entry = {"source_id": source.id}
+        status = "unchanged"
+    except Exception as exc:  # pragma: no cover - error formatting
+        entry = {"source_id": source.id, "error": str(exc)}
+        status = "failure"
+    finally:
+        session.close()
+    entry["duration_s"] = round(time.perf_counter() - started, 3)
+    stats = cache_stats(session)
+    if stats is not None:
+        entry["http_cache"] = _sum_cache_stats([stats, *ctx.worker_cache_stats])
+    return status, entry
+
+
+def _incomplete_rows(
+    storage: Storage, source: Source, known: Mapping[str, bool] | None, items: list
+) -> list[dict]:
+    if not known:
+        return []
+    urls = {item.url for item in items if item.url in known and not known[item.url]}
+    if not urls:
+        return []
+    return [row for url, row in storage.existing_by_url(source.id).items() if url in urls]
+
+
+def _count_incomplete(storage: Storage, source: Source, records: list[Record]) -> int:
+    if not records:
+        return 0
+    known = storage.known_urls(source.id)
+    return sum(1 for record in records if not known.get(record.url, False))
+
+
+def _total_cache_stats(entries: list[dict]) -> dict[str, int]:
+    return _sum_cache_stats([entry.get("http_cache") or {} for entry in entries])
+
+
+def _sum_cache_stats(stats: list[dict[str, int]]) -> dict[str, int]:
+    totals = {"hits": 0, "revalidated": 0, "misses": 0}
+    for counts in stats:
+        for name, count in counts.items():
+            totals[name] = totals.get(name, 0) + count
+    return totals
+
+
 def _as_blog_items(items: list[BlogItem] | list) -> list[BlogItem]:
     blog_items: list[BlogItem] = []
     for item in items:
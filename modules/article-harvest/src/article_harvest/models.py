@@ -1,20 +1,59 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import Callable, Literal
 
 import requests  # noqa: TC002
 
+from .http import WorkerSessions
+
 SourceKind = Literal["aggregation", "blog"]
 SourceMethod = Literal["api", "rss", "html", "agent"]
 
 
+@dataclass
+class FetchState:
+    """Payload fingerprints from a source's last stored run, and the ones seen now."""
+
+    previous: dict[str, str] = field(default_factory=dict)
+    current: dict[str, str] = field(default_factory=dict)
+
+    def is_unchanged(self, key: str, payload: bytes) -> bool:
+        digest = hashlib.sha256(payload).hexdigest()
+        self.current[key] = digest
+        return self.previous.get(key) == digest
+
+
 @dataclass(frozen=True)
 class FetchContext:
     session: requests.Session
     run_id: str
     now: datetime
+    cache_dir: Path | None = None
+    state: FetchState | None = None
+    # Already-stored URLs of a blog source -> whether their stored content is complete.
+    known: Mapping[str, bool] | None = None
+    # Builds the sessions of worker threads; without it they all share ``session``.
+    session_factory: Callable[[], requests.Session] | None = None
+    # Cache stats of the worker sessions closed so far, for the source's report.
+    worker_cache_stats: list[dict[str, int]] = field(default_factory=list)
+
+    def is_known_complete(self, url: str) -> bool:
+        return bool(self.known and self.known.get(url))
+
+    @contextmanager
+    def worker_sessions(self) -> Iterator[WorkerSessions]:
+        """Sessions for the threads of a fetch pool, closed when the block exits."""
+        sessions = WorkerSessions(self.session_factory, self.session)
+        try:
+            yield sessions
+        finally:
+            self.worker_cache_stats.extend(sessions.close())
 
 
 @dataclass(frozen=True)
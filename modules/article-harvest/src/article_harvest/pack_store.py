@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import mmap
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+PACK_INDEX_NAME = "items.pack.sqlite"
+
+
+class PackStore:
+    """Append-only pack of one source's item files, read through mmap.
+
+    ``items.<generation>.pack`` holds the bytes of every stored file back to back, and
+    ``items.pack.sqlite`` maps ``(item_id, name)`` to their ``(offset, length)``. Rewriting
+    a file appends it again and leaves the old bytes behind until ``compact`` writes the
+    live entries to a new generation and switches the index to it in one transaction.
+    """
+
+    def __init__(self, source_root: Path) -> None:
+        self.source_root = source_root
+        self.index_path = source_root / PACK_INDEX_NAME
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._map: mmap.mmap | None = None
+        self._map_generation: int | None = None
+
+    def exists(self) -> bool:
+        return self.index_path.exists()
+
+    def pack_path(self, generation: int) -> Path:
+        return self.source_root / f"items.{generation}.pack"
+
+    def put(self, item_id: str, name: str, data: bytes) -> None:
+        with self._lock:
+            conn = self._connection()
+            generation = _generation(conn)
+            with self.pack_path(generation).open("ab") as handle:
+                offset = handle.tell()
+                handle.write(data)
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (item_id, name, offset, length) "
+                    "VALUES (?, ?, ?, ?)",
+                    (item_id, name, offset, len(data)),
+                )
+
+    def get(self, item_id: str, name: str) -> bytes | None:
+        with self._lock:
+            if self._conn is None and not self.exists():
+                return None
+            row = self._connection().execute(
+                "SELECT offset, length, generation FROM entries, state "
+                "WHERE item_id = ? AND name = ?",
+                (item_id, name),
+            ).fetchone()
+            if row is None:
+                return None
+            offset, length, generation = row
+            view = self._mapped(generation, offset + length)
+            return bytes(view[offset : offset + length])
+
+    def delete(self, item_id: str, name: str) -> None:
+        with self._lock:
+            if not self.exists():
+                return
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE item_id = ? AND name = ?", (item_id, name)
+                )
+
+    def entries(self) -> list[tuple[str, str]]:
+        """``(item_id, name)`` of every stored file."""
+        with self._lock:
+            if not self.exists():
+                return []
+            rows = self._connection().execute("SELECT item_id, name FROM entries")
+            return sorted(rows)
+
+    def item_ids(self) -> list[str]:
+        with self._lock:
+            if not self.exists():
+                return []
+            rows = self._connection().execute("SELECT DISTINCT item_id FROM entries")
+            return sorted(row[0] for row in rows)
+
+    def stats(self) -> dict[str, int]:
+        """Live entries and bytes against the size of the pack file."""
+        with self._lock:
+            if not self.exists():
+                return {"entries": 0, "live_bytes": 0, "pack_bytes": 0}
+            conn = self._connection()
+            entries, live = conn.execute(
+                "SELECT count(*), coalesce(sum(length), 0) FROM entries"
+            ).fetchone()
+            path = self.pack_path(_generation(conn))
+            size = path.stat().st_size if path.exists() else 0
+        return {"entries": entries, "live_bytes": live, "pack_bytes": size}
+
+    def compact(self) -> dict[str, int]:
+        """Rewrite the live entries into a new pack, dropping bytes no entry points to."""
+        with self._lock:
+            before = self.stats()
+            if not self.exists():
+                return {"bytes_before": 0, "bytes_after": 0}
+            conn = self._connection()
+            generation = _generation(conn)
+            rows = conn.execute(
+                "SELECT item_id, name, offset, length FROM entries ORDER BY item_id, name"
+            ).fetchall()
+            new_path = self.pack_path(generation + 1)
+            moved = []
+            with new_path.open("wb") as handle:
+                view = self._mapped(generation, before["pack_bytes"]) if rows else b""
+                for item_id, name, offset, length in rows:
+                    moved.append((handle.tell(), item_id, name))
+                    handle.write(view[offset : offset + length])
+            with conn:
+                conn.executemany(
+                    "UPDATE entries SET offset = ? WHERE item_id = ? AND name = ?", moved
+                )
+                conn.execute("UPDATE state SET generation = ?", (generation + 1,))
+            self._unmap()
+            self.pack_path(generation).unlink(missing_ok=True)
+            after = self.stats()
+        return {"bytes_before": before["pack_bytes"], "bytes_after": after["pack_bytes"]}
+
+    def remove(self) -> None:
+        """Delete the pack and its index (once nothing is stored in it any more)."""
+        with self._lock:
+            self.close()
+            for path in self.source_root.glob("items.*.pack"):
+                path.unlink()
+            self.index_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._unmap()
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.item_ids())
+
+    def _mapped(self, generation: int, end: int) -> mmap.mmap:
+        # Remap when another generation is current or the pack grew past the mapping.
+        if self._map is None or self._map_generation != generation or len(self._map) < end:
+            self._unmap()
+            with self.pack_path(generation).open("rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_generation = generation
+        return self._map
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._map = None
+        self._map_generation = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.source_root.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    item_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (item_id, name)
+                );
+                CREATE TABLE IF NOT EXISTS state (generation INTEGER NOT NULL);
+                INSERT INTO state (generation)
+                SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM state);
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+
+def _generation(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT generation FROM state").fetchone()[0]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from typing import NamedTuple
+
+from .models import Record
+
+SCORE_KEY = "bm25"
+
+
+class Cursor(NamedTuple):
+    """Sort key of the last record on a page: newest first, ties broken by record id.
+
+    Ranked full-text pages also carry the bm25 score, which sorts before the rest.
+    """
+
+    archived_at: str
+    record_id: str
+    score: float | None = None
+
+
+def record_key(record: Record) -> str:
+    raw = f"{record.source_id}|{record.archived_at}|{record.url}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def encode_cursor(record: Record) -> str:
+    payload: list[str | float] = [record.archived_at, record_key(record)]
+    score = (record.extra or {}).get(SCORE_KEY)
+    if isinstance(score, (int, float)):
+        payload.append(float(score))
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        archived_at, record_id, *rest = payload
+        score = float(rest[0]) if rest else None
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}") from None
+    if not isinstance(archived_at, str) or not isinstance(record_id, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return Cursor(archived_at, record_id, score)
+
+
+def next_cursor(records: list[Record], limit: int | None) -> str | None:
+    """Cursor for the page after ``records``, or ``None`` when this page was the last."""
+    if not limit or len(records) < limit:
+        return None
+    return encode_cursor(records[-1])
@@ -1,23 +1,38 @@
 from __future__ import annotations
 
-from datetime import date
+import heapq
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
 
 from .models import Record, Source
-from .sqlite_index import SQLiteIndex
+from .pagination import Cursor, decode_cursor, record_key
+from .sqlite_index import SQLiteIndex, trace_queries
+from .sqlite_store import SQLiteStorage
 from .storage import Storage
 from .time_utils import parse_date, parse_datetime
 
+_INDEXES: dict[Path, SQLiteIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
 
 def records_for_source(storage: Storage, source: Source) -> list[Record]:
     return _sort_records(storage.records_for_source(source))
 
 
-def query_by_source(storage: Storage, source: Source, limit: int | None = None) -> list[Record]:
+def query_by_source(
+    storage: Storage,
+    source: Source,
+    limit: int | None = None,
+    after: str | None = None,
+) -> list[Record]:
+    cursor = decode_cursor(after) if after else None
     index = _sqlite_index(storage)
     if index:
-        return index.query_by_source(source.id, limit=limit)
-    records = records_for_source(storage, source)
-    return records[:limit] if limit else records
+        return index.query_by_source(source.id, limit=limit, after=cursor)
+    return _file_page(storage, [source], None, limit, cursor)
 
 
 def query_by_keyword(
@@ -26,23 +41,61 @@ def query_by_keyword(
     keyword: str,
     source_id: str | None = None,
     limit: int | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    fts: bool = False,
+    substring: bool = False,
+    after: str | None = None,
 ) -> list[Record]:
+    """Match ``keyword`` in titles, or with ``fts``/``substring`` in titles, authors and content.
+
+    ``fts`` matches whole words and returns bm25-ranked results; ``substring`` matches
+    any fragment (including CJK text) through the trigram index. Both need the SQLite
+    index. Other results are newest first. ``start``/``end`` bound the archive date.
+    """
+    cursor = decode_cursor(after) if after else None
+    start_date = parse_date(start) if start else None
+    end_date = parse_date(end) if end else None
     index = _sqlite_index(storage)
+    if fts and substring:
+        raise ValueError("Choose either full-text or substring search, not both")
+    if fts and not index:
+        raise ValueError(
+            "Full-text search requires the SQLite index (article-harvest sqlite rebuild)"
+        )
+    if substring and not index:
+        raise ValueError(
+            "Substring search requires the SQLite index (article-harvest sqlite rebuild)"
+        )
     if index:
         selected_sources = [
             source.id for source in sources if not source_id or source.id == source_id
         ]
-        return index.query_by_keyword(keyword, source_ids=selected_sources, limit=limit)
+        if fts:
+            search = index.query_by_fulltext
+        elif substring:
+            search = index.query_by_substring
+        else:
+            search = index.query_by_keyword
+        return search(
+            keyword,
+            source_ids=selected_sources,
+            start_date=start_date.isoformat() if start_date else None,
+            end_date=end_date.isoformat() if end_date else None,
+            limit=limit,
+            after=cursor,
+        )
     keyword_lower = keyword.lower()
-    records: list[Record] = []
-    for source in sources:
-        if source_id and source.id != source_id:
-            continue
-        for record in records_for_source(storage, source):
-            if keyword_lower in record.title.lower():
-                records.append(record)
-    records = _sort_records(records)
-    return records[:limit] if limit else records
+    return _file_page(
+        storage,
+        sources,
+        source_id,
+        limit,
+        cursor,
+        start=start_date,
+        end=end_date,
+        match=lambda record: keyword_lower in record.title.lower(),
+    )
 
 
 def query_by_archive_date(
@@ -53,8 +106,10 @@ def query_by_archive_date(
     end: str | None = None,
     source_id: str | None = None,
     limit: int | None = None,
+    after: str | None = None,
 ) -> list[Record]:
     start_date, end_date = _resolve_range(on, start, end)
+    cursor = decode_cursor(after) if after else None
     index = _sqlite_index(storage)
     if index:
         selected_sources = [
@@ -65,17 +120,11 @@ def query_by_archive_date(
             end_date.isoformat(),
             source_ids=selected_sources,
             limit=limit,
+            after=cursor,
         )
-    records: list[Record] = []
-    for source in sources:
-        if source_id and source.id != source_id:
-            continue
-        for record in records_for_source(storage, source):
-            archived_date = parse_date(record.archived_at)
-            if start_date <= archived_date <= end_date:
-                records.append(record)
-    records = _sort_records(records)
-    return records[:limit] if limit else records
+    return _file_page(
+        storage, sources, source_id, limit, cursor, start=start_date, end=end_date
+    )
 
 
 def _resolve_range(on: str | None, start: str | None, end: str | None) -> tuple[date, date]:
@@ -87,10 +136,97 @@ def _resolve_range(on: str | None, start: str | None, end: str | None) -> tuple[
     return parse_date(start), parse_date(end)
 
 
-def _sort_records(records: list[Record]) -> list[Record]:
-    return sorted(records, key=lambda item: parse_datetime(item.archived_at), reverse=True)
+def _sort_records(records: Iterable[Record]) -> list[Record]:
+    return sorted(records, key=_sort_key, reverse=True)
+
+
+def _sort_key(record: Record) -> tuple[datetime, str]:
+    return parse_datetime(record.archived_at), record_key(record)
+
+
+def _file_page(
+    storage: Storage,
+    sources: list[Source],
+    source_id: str | None,
+    limit: int | None,
+    cursor: Cursor | None,
+    start: date | None = None,
+    end: date | None = None,
+    match: Callable[[Record], bool] | None = None,
+) -> list[Record]:
+    """Page of stored records, reading only the snapshots the bounds and page can reach.
+
+    Nothing after the cursor's day can be on the page, so it caps ``end``. Snapshot
+    streams are newest day first and stop at the end of the day that fills the page.
+    """
+    if cursor:
+        cursor_day = parse_date(cursor.archived_at)
+        end = min(end, cursor_day) if end else cursor_day
+    candidates: list[Record] = []
+    for source in sources:
+        if source_id and source.id != source_id:
+            continue
+        records: Iterable[Record] = storage.iter_records(source, start=start, end=end)
+        if match:
+            records = filter(match, records)
+        newest_day_first = source.kind == "aggregation"
+        candidates.extend(_page(records, limit, cursor, newest_day_first))
+    return _page(candidates, limit, None)
+
+
+def _page(
+    records: Iterable[Record],
+    limit: int | None,
+    cursor: Cursor | None,
+    newest_day_first: bool = False,
+) -> list[Record]:
+    """Newest-first page of ``records`` after ``cursor``, the same order as the index.
+
+    Records are filtered while streaming and only the ``limit`` newest are kept, so a
+    deep page costs the same as the first one.
+    """
+    if cursor:
+        bound = (parse_datetime(cursor.archived_at), cursor.record_id)
+        records = (record for record in records if _sort_key(record) < bound)
+    if limit and newest_day_first:
+        records = _through_full_day(records, limit)
+    if limit:
+        return heapq.nlargest(limit, records, key=_sort_key)
+    return _sort_records(records)
+
+
+def _through_full_day(records: Iterable[Record], limit: int) -> Iterator[Record]:
+    # Every record of an older day sorts below a full page of newer ones.
+    count = 0
+    last_day = None
+    for record in records:
+        if count >= limit and record.archived_at != last_day:
+            return
+        count += 1
+        last_day = record.archived_at
+        yield record
+
+
+@contextmanager
+def explain_queries(storage: Storage) -> Iterator[list[dict]]:
+    """Collect plan, row count and timing of the SQLite queries run inside the block.
+
+    Only this thread's queries are collected, though the index is shared. The list
+    stays empty when there is no index and queries scan the stored files.
+    """
+    if _sqlite_index(storage) is None:
+        yield []
+        return
+    with trace_queries() as traces:
+        yield traces
 
 
 def _sqlite_index(storage: Storage) -> SQLiteIndex | None:
-    index = SQLiteIndex(storage.data_root)
+    if isinstance(storage, SQLiteStorage):
+        return storage.index
+    # One index (and so one open connection) per data root for the whole process.
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(storage.data_root)
+        if index is None:
+            index = _INDEXES[storage.data_root] = SQLiteIndex(storage.data_root)
     return index if index.exists() else None
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .url_index import is_appended
+
+JSON_FORMAT = "json"
+COLUMNAR_FORMAT = "columnar"
+SNAPSHOT_FORMATS = (JSON_FORMAT, COLUMNAR_FORMAT)
+STRINGS_NAME = "strings.jsonl"
+
+# Text columns are stored as ids into the source's string dictionary. Nested values
+# (comment threads, extra) are stored as the id of their canonical JSON text, so a thread
+# that did not change since yesterday costs one integer. Other columns are kept as is.
+_STRING_COLUMNS = frozenset({"title", "url", "published_at", "author", "discussion_url"})
+_RAW_COLUMNS = frozenset({"score", "comments_count", "rank"})
+_EMPTY_VALUES: dict[str, object] = {"comments": [], "extra": {}}
+
+
+class StringDictionary:
+    """Append-only string table shared by the columnar snapshots of one source.
+
+    Line ``n`` of ``strings.jsonl`` holds the JSON string with id ``n``. Strings are only
+    ever appended, so ids in older snapshots stay valid. The table is read incrementally
+    and a string is only decoded once a snapshot refers to it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._lines: list[bytes] = []
+        self._decoded: dict[int, str] = {}
+        self._ids: dict[str, int] | None = None
+        self._offset = 0
+        self._generation: tuple[int, int] | None = None
+        self._pending: list[bytes] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._lines)
+
+    def lookup(self, string_id: int) -> str:
+        value = self._decoded.get(string_id)
+        if value is None:
+            if string_id < 0:
+                raise IndexError(string_id)
+            value = self._decoded[string_id] = json.loads(self._lines[string_id])
+        return value
+
+    def ensure(self, size: int) -> None:
+        """Catch up with the file and check it holds at least ``size`` strings."""
+        with self._lock:
+            self._load()
+            if len(self._lines) < size:
+                raise ValueError(
+                    f"{self.path} has {len(self._lines)} strings, snapshot needs {size}"
+                )
+
+    @contextmanager
+    def appending(self) -> Iterator[StringDictionary]:
+        """Hold the table up to date for ``encode`` calls and append new strings on exit."""
+        with self._lock:
+            self._load()
+            if self._ids is None:
+                self._ids = {}
+                for string_id in range(len(self._lines)):
+                    self._ids.setdefault(self.lookup(string_id), string_id)
+            try:
+                yield self
+            finally:
+                self._flush()
+
+    def encode(self, value: str) -> int:
+        if self._ids is None:
+            raise RuntimeError("StringDictionary.encode() needs an appending() block")
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._lines)
+            line = json.dumps(value, ensure_ascii=False).encode("utf-8")
+            self._lines.append(line)
+            self._decoded[string_id] = value
+            self._pending.append(line)
+        return string_id
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = b"".join(line + b"\n" for line in self._pending)
+        with self.path.open("ab") as handle:
+            handle.write(data)
+        if self._generation is None:
+            self._generation = _generation(self.path.stat())
+        self._offset += len(data)
+        self._pending.clear()
+
+    def _load(self) -> None:
+        stat = self.path.stat() if self.path.exists() else None
+        size = stat.st_size if stat else 0
+        generation = _generation(stat) if stat else None
+        if (
+            generation != self._generation
+            or size < self._offset
+            or (size > self._offset and not is_appended(self.path, self._offset))
+        ):
+            # Removed or rewritten rather than appended to (a reconversion): start over.
+            self._lines.clear()
+            self._decoded.clear()
+            self._ids = None
+            self._offset = 0
+            self._generation = generation
+        if size == self._offset:
+            return
+        with self.path.open("rb") as handle:
+            handle.seek(self._offset)
+            payload = handle.read()
+        complete = payload[: payload.rfind(b"\n") + 1]
+        if complete:
+            start = len(self._lines)
+            self._lines.extend(complete[:-1].split(b"\n"))
+            if self._ids is not None:
+                for string_id in range(start, len(self._lines)):
+                    self._ids.setdefault(self.lookup(string_id), string_id)
+        self._offset += len(complete)
+
+
+def _generation(stat: os.stat_result) -> tuple[int, int]:
+    # A reconversion writes a new file, so a changed inode means a different table even
+    # when it has grown past the offset already read.
+    return stat.st_dev, stat.st_ino
+
+
+def encode_snapshot(payload: dict, snapshot_format: str, dictionary: StringDictionary) -> str:
+    """Serialize a snapshot payload (``items`` as a list of dicts) in ``snapshot_format``."""
+    if snapshot_format == JSON_FORMAT:
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+    if snapshot_format != COLUMNAR_FORMAT:
+        raise ValueError(f"Unknown snapshot format: {snapshot_format}")
+    items = payload.get("items", [])
+    names = list(dict.fromkeys(name for item in items for name in item))
+    with dictionary.appending():
+        columns = {
+            name: [_encode_value(name, item.get(name), dictionary) for item in items]
+            for name in names
+        }
+        size = len(dictionary)
+    header = {key: value for key, value in payload.items() if key != "items"}
+    encoded = {
+        "format": COLUMNAR_FORMAT,
+        **header,
+        "count": len(items),
+        "strings": size,
+        "columns": columns,
+    }
+    return json.dumps(encoded, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_snapshot(payload: dict, dictionary: StringDictionary) -> dict:
+    """Return ``payload`` in the plain JSON shape, decoding it if it is columnar."""
+    if payload.get("format") != COLUMNAR_FORMAT:
+        return payload
+    try:
+        columns = payload["columns"]
+        count = int(payload["count"])
+        dictionary.ensure(int(payload["strings"]))
+        decoded = {
+            name: _decode_column(name, values, dictionary) for name, values in columns.items()
+        }
+    except (KeyError, IndexError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Malformed columnar snapshot: {exc!r}") from None
+    if any(len(values) != count for values in decoded.values()):
+        raise ValueError("Malformed columnar snapshot: column lengths differ")
+    header = {
+        key: value
+        for key, value in payload.items()
+        if key not in {"format", "count", "strings", "columns"}
+    }
+    items = [{name: values[i] for name, values in decoded.items()} for i in range(count)]
+    return {**header, "items": items}
+
+
+def encode_comments(payload: dict, snapshot_format: str, dictionary: StringDictionary) -> str:
+    """Serialize a comment sidecar (``comments`` maps url -> list of comment dicts).
+
+    Columnar sidecars store each thread as the id of its JSON text in ``dictionary``, so a
+    thread that is unchanged from the day before is not written again.
+    """
+    if snapshot_format != COLUMNAR_FORMAT:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    with dictionary.appending():
+        threads = {
+            url: dictionary.encode(
+                json.dumps(thread, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+            )
+            for url, thread in payload.get("comments", {}).items()
+        }
+        size = len(dictionary)
+    header = {key: value for key, value in payload.items() if key != "comments"}
+    encoded = {"format": COLUMNAR_FORMAT, **header, "strings": size, "comments": threads}
+    return json.dumps(encoded, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_comments(payload: dict, dictionary: StringDictionary) -> dict:
+    """Return a comment sidecar in the plain JSON shape, decoding it if it is columnar."""
+    if payload.get("format") != COLUMNAR_FORMAT:
+        return payload
+    try:
+        dictionary.ensure(int(payload["strings"]))
+        comments = {
+            url: json.loads(dictionary.lookup(string_id))
+            for url, string_id in payload["comments"].items()
+        }
+    except (KeyError, IndexError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Malformed columnar comments: {exc!r}") from None
+    header = {
+        key: value for key, value in payload.items() if key not in {"format", "strings"}
+    }
+    return {**header, "comments": comments}
+
+
+def write_snapshot(path: Path, data: str | bytes) -> None:
+    # Written aside and renamed so readers never see a half-written snapshot.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+    os.replace(tmp_path, path)
+
+
+def _encode_value(name: str, value: object, dictionary: StringDictionary) -> object:
+    if name in _RAW_COLUMNS:
+        return value
+    if value is not None and name in _STRING_COLUMNS:
+        return dictionary.encode(str(value))
+    if value is None or (name in _EMPTY_VALUES and value == _EMPTY_VALUES[name]):
+        return None
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return dictionary.encode(text)
+
+
+def _decode_column(name: str, values: list, dictionary: StringDictionary) -> list:
+    if name in _RAW_COLUMNS:
+        return values
+    lookup = dictionary.lookup
+    if name in _STRING_COLUMNS:
+        return [None if value is None else lookup(value) for value in values]
+    empty = _EMPTY_VALUES.get(name)
+    # Parse the column's JSON texts in one call rather than one per item.
+    texts = [lookup(value) for value in values if value is not None]
+    parsed = iter(json.loads("[" + ",".join(texts) + "]"))
+    return [
+        (type(empty)() if empty is not None else None) if value is None else next(parsed)
+        for value in values
+    ]
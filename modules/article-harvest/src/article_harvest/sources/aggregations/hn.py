@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import json
+import sqlite3
+import threading
 from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
 
+import requests
 from bs4 import BeautifulSoup
 
 from ...errors import FetchError
-from ...http import get_json
+from ...http import WorkerSessions, get_json
 from ...models import AggregationComment, AggregationItem, FetchContext, Source
 
 HN_API_BASE = "https://hacker-news.firebaseio.com/v0"
@@ -14,6 +21,14 @@ HN_DISCUSSION = "https://news.ycombinator.com/item?id={item_id}"
 HN_LIMIT = 10
 HN_SEED_LIMIT = 20
 HN_COMMENT_LIMIT = 20
+HN_MAX_IN_FLIGHT = 8
+HN_CACHE_DB_NAME = "hn_items.sqlite"
+# Comments that were already this old when fetched rarely change again, so they are
+# served from the cache for HN_CACHE_STABLE_TTL; younger ones are refetched once
+# HN_CACHE_FRESH_TTL has passed.
+HN_CACHE_STABLE_AGE = 3 * 60 * 60
+HN_CACHE_STABLE_TTL = 7 * 24 * 60 * 60
+HN_CACHE_FRESH_TTL = 15 * 60
 
 
 def source() -> Source:
@@ -26,17 +41,38 @@ def source() -> Source:
     )
 
 
-def fetch_hn(ctx: FetchContext) -> list[AggregationItem]:
+def fetch_hn(ctx: FetchContext, max_in_flight: int = HN_MAX_IN_FLIGHT) -> list[AggregationItem]:
     top_ids = get_json(ctx.session, f"{HN_API_BASE}/topstories.json")
     if not isinstance(top_ids, list):
         raise FetchError("HN topstories payload invalid")
 
-    candidates: list[tuple[AggregationItem, list[int]]] = []
-    for story_id in top_ids[:HN_SEED_LIMIT]:
-        candidate = _fetch_story(ctx, story_id)
-        if not candidate:
-            continue
-        candidates.append(candidate)
+    now = ctx.now.replace(tzinfo=timezone.utc).timestamp()
+    cache = HNItemCache(ctx.cache_dir / HN_CACHE_DB_NAME) if ctx.cache_dir else None
+    if cache:
+        cache.prune(now)
+    try:
+        with (
+            ctx.worker_sessions() as sessions,
+            ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool,
+        ):
+            return _fetch_ranked(ctx, top_ids, pool, sessions, cache, now)
+    finally:
+        if cache:
+            cache.close()
+
+
+def _fetch_ranked(
+    ctx: FetchContext,
+    top_ids: list[int],
+    pool: Executor,
+    sessions: WorkerSessions,
+    cache: HNItemCache | None,
+    now: float,
+) -> list[AggregationItem]:
+    stories = pool.map(
+        lambda story_id: _fetch_story(sessions.get(), story_id), top_ids[:HN_SEED_LIMIT]
+    )
+    candidates = [candidate for candidate in stories if candidate]
 
     if not candidates:
         raise FetchError("HN list empty")
@@ -48,7 +84,7 @@ def fetch_hn(ctx: FetchContext) -> list[AggregationItem]:
     )
     ranked: list[AggregationItem] = []
     for rank, (item, kids) in enumerate(sorted_items[:HN_LIMIT], start=1):
-        comments = _fetch_comments(ctx, kids)
+        comments = _fetch_comments(ctx, kids, pool, sessions, cache=cache, now=now)
         ranked.append(
             AggregationItem(
                 title=item.title,
@@ -66,8 +102,14 @@ def fetch_hn(ctx: FetchContext) -> list[AggregationItem]:
     return ranked
 
 
-def _fetch_story(ctx: FetchContext, story_id: int) -> tuple[AggregationItem, list[int]] | None:
-    payload = get_json(ctx.session, f"{HN_API_BASE}/item/{story_id}.json")
+def _fetch_item(session: requests.Session, item_id: int) -> Any:
+    return get_json(session, f"{HN_API_BASE}/item/{item_id}.json")
+
+
+def _fetch_story(
+    session: requests.Session, story_id: int
+) -> tuple[AggregationItem, list[int]] | None:
+    payload = _fetch_item(session, story_id)
     if not isinstance(payload, dict):
         return None
     if payload.get("type") != "story":
@@ -94,30 +136,188 @@ def _fetch_story(ctx: FetchContext, story_id: int) -> tuple[AggregationItem, lis
     )
 
 
-def _fetch_comments(ctx: FetchContext, root_ids: list[int]) -> list[AggregationComment]:
+def _fetch_comments(
+    ctx: FetchContext,
+    root_ids: list[int],
+    pool: Executor | None = None,
+    sessions: WorkerSessions | None = None,
+    *,
+    cache: HNItemCache | None = None,
+    now: float | None = None,
+) -> list[AggregationComment]:
+    """Breadth-first walk of a comment tree, fetching each frontier concurrently.
+
+    The walk replays the sequential queue algorithm over prefetched payloads, so the
+    result matches a one-at-a-time BFS: at most ``HN_COMMENT_LIMIT`` items are ever
+    queued, and each batch only takes as many ids as there are comment slots left.
+    Items still fresh in ``cache`` are served locally, unless the walk would queue their
+    replies: a cached ``kids`` list misses replies posted since. ``sessions`` go with
+    ``pool``.
+    """
+    if pool is None or sessions is None:
+        with (
+            ctx.worker_sessions() as own_sessions,
+            ThreadPoolExecutor(max_workers=HN_MAX_IN_FLIGHT) as own_pool,
+        ):
+            return _fetch_comments(ctx, root_ids, own_pool, own_sessions, cache=cache, now=now)
+
     comments: list[AggregationComment] = []
     queue: deque[int] = deque(root_ids)
     while queue and len(comments) < HN_COMMENT_LIMIT:
-        comment_id = queue.popleft()
-        payload = get_json(ctx.session, f"{HN_API_BASE}/item/{comment_id}.json")
-        if not isinstance(payload, dict):
-            continue
-        if payload.get("type") != "comment":
+        batch_size = min(len(queue), HN_COMMENT_LIMIT - len(comments))
+        batch = [queue.popleft() for _ in range(batch_size)]
+        payloads = _fetch_items(batch, pool, sessions, cache, now, len(comments), len(queue))
+        for index, payload in enumerate(payloads):
+            if not _is_comment(payload):
+                continue
+            text_html = payload.get("text")
+            text = _strip_html(text_html) if text_html else "[deleted]"
+            comments.append(
+                AggregationComment(
+                    author=payload.get("by"),
+                    published_at=_iso_from_unix(payload.get("time")),
+                    text=text,
+                )
+            )
+            # Ids of this batch not replayed yet still count as queued.
+            pending = len(queue) + len(batch) - index - 1
+            for kid_id in payload.get("kids") or []:
+                if len(comments) + pending >= HN_COMMENT_LIMIT:
+                    break
+                queue.append(kid_id)
+                pending += 1
+    return comments
+
+
+def _fetch_items(
+    item_ids: list[int],
+    pool: Executor,
+    sessions: WorkerSessions,
+    cache: HNItemCache | None,
+    now: float | None,
+    count: int = 0,
+    queued: int = 0,
+) -> list[Any]:
+    """Payloads of one BFS batch, ``count`` comments into the walk with ``queued`` ids
+    left behind the batch."""
+
+    def fetch(item_id: int) -> Any:
+        return _fetch_item(sessions.get(), item_id)
+
+    if cache is None or now is None:
+        return list(pool.map(fetch, item_ids))
+    cached = cache.get_many(item_ids, now)
+    payloads = [cached.get(item_id) for item_id in item_ids]
+    # Cached payloads whose replies the walk would still queue are refetched too. Replies
+    # only ever get added, so the cached kids give a superset of the ones needed.
+    stale = _kids_needed(payloads, count, queued)
+    missing = [
+        index
+        for index, item_id in enumerate(item_ids)
+        if item_id not in cached or index in stale
+    ]
+    fetched = dict(zip(missing, pool.map(fetch, [item_ids[index] for index in missing])))
+    cache.put_many({item_ids[index]: payload for index, payload in fetched.items()}, now)
+    return [fetched.get(index, payload) for index, payload in enumerate(payloads)]
+
+
+def _kids_needed(payloads: list[Any], count: int, queued: int) -> set[int]:
+    # Dry run of the replay in _fetch_comments. Payloads not fetched yet count as dead
+    # ids: fewer comments and fewer kids can only add indexes to the result.
+    needed = set()
+    pending = queued + len(payloads)
+    for index, payload in enumerate(payloads):
+        pending -= 1
+        if not _is_comment(payload):
             continue
-        text_html = payload.get("text")
-        text = _strip_html(text_html) if text_html else "[deleted]"
-        comments.append(
-            AggregationComment(
-                author=payload.get("by"),
-                published_at=_iso_from_unix(payload.get("time")),
-                text=text,
+        count += 1
+        if count + pending < HN_COMMENT_LIMIT:
+            needed.add(index)
+            pending += min(len(payload.get("kids") or []), HN_COMMENT_LIMIT - count - pending)
+    return needed
+
+
+def _is_comment(payload: Any) -> bool:
+    return isinstance(payload, dict) and payload.get("type") == "comment"
+
+
+class HNItemCache:
+    """SQLite-backed cache of HN comment payloads keyed by item id."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL,
+                item_time INTEGER,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
             )
+            """
         )
-        for kid_id in payload.get("kids") or []:
-            if len(comments) + len(queue) >= HN_COMMENT_LIMIT:
-                break
-            queue.append(kid_id)
-    return comments
+        self._conn.commit()
+
+    def get_many(self, item_ids: list[int], now: float) -> dict[int, Any]:
+        if not item_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in item_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, payload FROM items WHERE id IN ({placeholders}) AND expires_at > ?",
+                [*item_ids, now],
+            ).fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+
+    def put_many(self, payloads: dict[int, Any], now: float) -> None:
+        rows = []
+        for item_id, payload in payloads.items():
+            # Stories drive ranking through score/descendants, so only comments are kept.
+            if not isinstance(payload, dict) or payload.get("type") != "comment":
+                continue
+            item_time = payload.get("time")
+            rows.append(
+                (
+                    item_id,
+                    json.dumps(payload, ensure_ascii=False),
+                    item_time,
+                    now,
+                    now + _cache_ttl(item_time, now),
+                )
+            )
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO items (id, payload, item_time, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.commit()
+
+    def prune(self, now: float) -> int:
+        """Delete expired payloads so the cache only holds what it can still serve."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM items WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+        return deleted.rowcount
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _cache_ttl(item_time: Any, now: float) -> float:
+    try:
+        age = now - int(item_time)
+    except (TypeError, ValueError):
+        return HN_CACHE_FRESH_TTL
+    return HN_CACHE_STABLE_TTL if age >= HN_CACHE_STABLE_AGE else HN_CACHE_FRESH_TTL
 
 
 def _strip_html(value: str) -> str:
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Protocol, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+
+from ..http import get_text
+from ..models import BlogItem, FetchContext
+
+ARTICLE_MAX_WORKERS = 8
+ARTICLE_PER_HOST_LIMIT = 4
+
+
+class _HasUrl(Protocol):
+    @property
+    def url(self) -> str: ...
+
+
+class _ListingEntry(Protocol):
+    @property
+    def url(self) -> str: ...
+
+    @property
+    def title(self) -> str | None: ...
+
+
+EntryT = TypeVar("EntryT", bound=_HasUrl)
+ListingEntryT = TypeVar("ListingEntryT", bound=_ListingEntry)
+ResultT = TypeVar("ResultT")
+
+
+def fetch_articles(
+    ctx: FetchContext,
+    entries: Sequence[EntryT],
+    parse: Callable[[EntryT, Any], ResultT | None],
+    *,
+    fetch: Callable[[requests.Session, str], Any] = get_text,
+    skip_errors: bool = False,
+    max_workers: int = ARTICLE_MAX_WORKERS,
+    per_host: int = ARTICLE_PER_HOST_LIMIT,
+) -> list[ResultT | None]:
+    """Fetch and parse article pages concurrently, returning results in entry order.
+
+    At most ``per_host`` requests run against one host at a time. Parsing happens
+    after the host slot is released, so a slow parse never holds up the next download.
+    With ``skip_errors`` a failed download yields ``None`` instead of raising. Each
+    worker thread downloads through its own session from ``ctx.worker_sessions()``.
+    """
+    if not entries:
+        return []
+    slots = _HostSlots(per_host)
+
+    def _fetch_one(entry: EntryT) -> ResultT | None:
+        with slots.slot(entry.url):
+            try:
+                payload = fetch(sessions.get(), entry.url)
+            except Exception:
+                if skip_errors:
+                    return None
+                raise
+        return parse(entry, payload)
+
+    workers = max(1, min(max_workers, len(entries)))
+    with ctx.worker_sessions() as sessions, ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_fetch_one, entries))
+
+
+def fetch_listed_articles(
+    ctx: FetchContext,
+    entries: Sequence[ListingEntryT],
+    parse: Callable[[ListingEntryT, Any], BlogItem | None],
+    **kwargs: Any,
+) -> list[BlogItem]:
+    """Blog items for the entries of a listing page, in listing order.
+
+    Only articles not already stored with complete content are downloaded (through
+    ``fetch_articles``, which gets ``kwargs``). The others come back without content,
+    titled from the listing (or by URL when it has no title); storage skips them by
+    URL. Articles that fail to parse are left out.
+    """
+    to_fetch = [entry for entry in entries if not ctx.is_known_complete(entry.url)]
+    articles = iter(fetch_articles(ctx, to_fetch, parse, **kwargs))
+    items: list[BlogItem] = []
+    for entry in entries:
+        if ctx.is_known_complete(entry.url):
+            items.append(BlogItem(title=entry.title or entry.url, url=entry.url))
+            continue
+        item = next(articles)
+        if item:
+            items.append(item)
+    return items
+
+
+class _HostSlots:
+    def __init__(self, per_host: int) -> None:
+        self._per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+
+    def slot(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self._per_host)
+                self._semaphores[host] = semaphore
+        return semaphore
@@ -13,6 +13,7 @@ from markdownify import markdownify as md
 from ...errors import FetchError
 from ...http import get_text
 from ...models import BlogItem, FetchContext, Source
+from ..articles import fetch_listed_articles
 
 CLAUDE_BLOG_URL = "https://claude.com/blog"
 CLAUDE_BLOG_LIMIT = 20
@@ -40,12 +41,9 @@ def fetch_claude_blog(ctx: FetchContext) -> list[BlogItem]:
     if not entries:
         raise FetchError("Claude Blog list empty")
 
-    items: list[BlogItem] = []
-    for entry in entries[:CLAUDE_BLOG_LIMIT]:
-        item = _fetch_article(ctx, entry)
-        if item:
-            items.append(item)
-
+    items = fetch_listed_articles(
+        ctx, entries[:CLAUDE_BLOG_LIMIT], lambda entry, html: _parse_article(html, entry)
+    )
     if not items:
         raise FetchError("Claude Blog returned no items")
     return items
@@ -87,11 +85,6 @@ def _extract_card_title(article: Tag, anchor_url: str) -> str | None:
     return _normalize_text(article.get_text(" ", strip=True).replace(anchor_url, "")) or None
 
 
-def _fetch_article(ctx: FetchContext, entry: _Entry) -> BlogItem | None:
-    html = get_text(ctx.session, entry.url)
-    return _parse_article(html, entry)
-
-
 def _parse_article(html: str, entry: _Entry) -> BlogItem | None:
     soup = BeautifulSoup(html, "lxml")
     container = soup.find("main") or soup.find("article")
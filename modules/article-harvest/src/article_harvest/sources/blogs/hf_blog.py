@@ -9,7 +9,7 @@ from markdownify import markdownify as md
 
 from ...http import get_bytes
 from ...models import BlogItem, FetchContext, Source
-from ...storage import Storage
+from ..articles import fetch_articles
 from ..rss import fetch_rss
 
 HF_BLOG_RSS_URL = "https://huggingface.co/blog/feed.xml"
@@ -28,54 +28,27 @@ def source() -> Source:
 def fetch_hf_blog(ctx: FetchContext) -> list[BlogItem]:
     items = fetch_rss(ctx, HF_BLOG_RSS_URL)
 
-    storage = Storage()
-    existing = storage.existing_by_url("hf-blog")
+    to_fetch = [item for item in items if not ctx.is_known_complete(item.url)]
+    contents = fetch_articles(
+        ctx,
+        to_fetch,
+        lambda item, html: _extract_hf_blog_article_markdown(html),
+        fetch=get_bytes,
+        skip_errors=True,
+    )
+    content_by_url = {item.url: content for item, content in zip(to_fetch, contents)}
 
     updated: list[BlogItem] = []
     for item in items:
-        if not _should_try_html(existing.get(item.url), storage):
-            updated.append(item)
-            continue
-
-        content = _fetch_hf_blog_article_markdown(ctx, item.url)
+        content = content_by_url.get(item.url)
         if content and content.strip():
             updated.append(replace(item, content_markdown=content))
             continue
-
         updated.append(item)
 
     return updated
 
 
-def _should_try_html(existing: dict[str, str | int | None] | None, storage: Storage) -> bool:
-    if existing is None:
-        return True
-    content_path = existing.get("content_path")
-    if not content_path:
-        return True
-    path = storage.data_root / str(content_path)
-    if not path.exists():
-        return True
-    if path.stat().st_size == 0:
-        return True
-    preview = path.read_text(encoding="utf-8")[:800]
-    if "|  |" in preview:
-        return True
-    if preview.lstrip().startswith("[Signup]"):
-        return True
-    if any(line.strip() == "|" for line in preview.splitlines()):
-        return True
-    return False
-
-
-def _fetch_hf_blog_article_markdown(ctx: FetchContext, url: str) -> str | None:
-    try:
-        html = get_bytes(ctx.session, url)
-    except Exception:
-        return None
-    return _extract_hf_blog_article_markdown(html)
-
-
 def _extract_hf_blog_article_markdown(html: bytes) -> str | None:
     soup = BeautifulSoup(html, "lxml")
     content = soup.select_one("div.blog-content")
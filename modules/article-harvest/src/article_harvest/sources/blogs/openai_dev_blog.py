@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
@@ -11,6 +10,7 @@ from markdownify import markdownify as md
 from ...errors import FetchError
 from ...http import get_text
 from ...models import BlogItem, FetchContext, Source
+from ..articles import fetch_listed_articles
 
 OPENAI_DEV_BLOG_URL = "https://developers.openai.com/blog"
 OPENAI_DEV_BLOG_LIMIT = 20
@@ -19,6 +19,7 @@ OPENAI_DEV_BLOG_LIMIT = 20
 @dataclass(frozen=True)
 class _Entry:
     url: str
+    title: str | None = None
 
 
 def source() -> Source:
@@ -37,12 +38,9 @@ def fetch_openai_dev_blog(ctx: FetchContext) -> list[BlogItem]:
     if not entries:
         raise FetchError("OpenAI Developers Blog list empty")
 
-    items: list[BlogItem] = []
-    for entry in entries[:OPENAI_DEV_BLOG_LIMIT]:
-        item = _fetch_article(ctx, entry.url)
-        if item:
-            items.append(item)
-
+    items = fetch_listed_articles(
+        ctx, entries[:OPENAI_DEV_BLOG_LIMIT], lambda entry, html: _parse_article(html, entry)
+    )
     if not items:
         raise FetchError("OpenAI Developers Blog returned no items")
     return items
@@ -51,21 +49,18 @@ def fetch_openai_dev_blog(ctx: FetchContext) -> list[BlogItem]:
 def _extract_entries(html: str) -> list[_Entry]:
     soup = BeautifulSoup(html, "lxml")
     container = soup.find("main") or soup
-    links: list[str] = []
+    titles: dict[str, str | None] = {}
     for anchor in container.find_all("a", href=True):
         href = anchor["href"].strip()
         if not href.startswith("/blog/") or href.startswith("/blog/topic"):
             continue
-        links.append(urljoin(OPENAI_DEV_BLOG_URL, href))
-    return [_Entry(url=url) for url in _unique(links)]
-
-
-def _fetch_article(ctx: FetchContext, url: str) -> BlogItem | None:
-    html = get_text(ctx.session, url)
-    return _parse_article(html, url)
+        url = urljoin(OPENAI_DEV_BLOG_URL, href)
+        # A post may be linked more than once, e.g. from an image and from its title.
+        titles[url] = titles.get(url) or _normalize_text(anchor.get_text(" ", strip=True)) or None
+    return [_Entry(url=url, title=title) for url, title in titles.items()]
 
 
-def _parse_article(html: str, url: str) -> BlogItem | None:
+def _parse_article(html: str, entry: _Entry) -> BlogItem | None:
     soup = BeautifulSoup(html, "lxml")
     article = soup.find("article") or soup.find("main")
     if article is None:
@@ -83,8 +78,8 @@ def _parse_article(html: str, url: str) -> BlogItem | None:
         return None
 
     return BlogItem(
-        title=title or url,
-        url=url,
+        title=title or entry.title or entry.url,
+        url=entry.url,
         content_markdown=content_markdown,
     )
 
@@ -107,14 +102,3 @@ def _strip_unwanted(container: Tag) -> None:
 
 def _normalize_text(text: str) -> str:
     return " ".join(text.split()).strip()
-
-
-def _unique(values: Iterable[str]) -> list[str]:
-    seen: set[str] = set()
-    output: list[str] = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        output.append(value)
-    return output
@@ -7,6 +7,7 @@ from markdownify import markdownify as md
 
 from ...http import get_bytes
 from ...models import BlogItem, FetchContext, Source
+from ..articles import fetch_articles
 from ..rss import fetch_rss
 
 PG_RSS_URL = "http://www.aaronsw.com/2002/feeds/pgessays.rss"
@@ -27,33 +28,32 @@ def source() -> Source:
 def fetch_paul_graham(ctx: FetchContext) -> list[BlogItem]:
     items = fetch_rss(ctx, PG_RSS_URL, limit=PG_RSS_LIMIT)
 
-    updated: list[BlogItem] = []
-    for index, item in enumerate(items):
-        should_try_html = index < PG_HTML_FETCH_LIMIT and not (
-            item.content_markdown and item.content_markdown.strip()
-        )
-        if not should_try_html:
-            updated.append(item)
-            continue
+    to_fetch = [
+        item
+        for item in items[:PG_HTML_FETCH_LIMIT]
+        if not ctx.is_known_complete(item.url)
+        and not (item.content_markdown and item.content_markdown.strip())
+    ]
+    contents = fetch_articles(
+        ctx,
+        to_fetch,
+        lambda item, html: _extract_paul_graham_article_markdown(html),
+        fetch=get_bytes,
+        skip_errors=True,
+    )
+    content_by_url = {item.url: content for item, content in zip(to_fetch, contents)}
 
-        content = _fetch_paul_graham_article_markdown(ctx, item.url)
+    updated: list[BlogItem] = []
+    for item in items:
+        content = content_by_url.get(item.url)
         if content and content.strip():
             updated.append(replace(item, content_markdown=content))
             continue
-
         updated.append(item)
 
     return updated
 
 
-def _fetch_paul_graham_article_markdown(ctx: FetchContext, url: str) -> str | None:
-    try:
-        html = get_bytes(ctx.session, url)
-    except Exception:
-        return None
-    return _extract_paul_graham_article_markdown(html)
-
-
 def _extract_paul_graham_article_markdown(html: bytes) -> str | None:
     soup = BeautifulSoup(html, "lxml")
     for tag in soup(["script", "style"]):
@@ -6,7 +6,7 @@ from typing import Any
 import feedparser
 from markdownify import markdownify as md
 
-from ..errors import FetchError
+from ..errors import FetchError, SourceUnchanged
 from ..http import get_bytes
 from ..models import BlogItem, FetchContext, Source
 
@@ -34,7 +34,10 @@ def fetch_rss(
     *,
     html_to_markdown: Callable[[str], str] | None = None,
 ) -> list[BlogItem]:
-    data = feedparser.parse(get_bytes(ctx.session, feed_url))
+    payload = get_bytes(ctx.session, feed_url)
+    if ctx.state is not None and ctx.state.is_unchanged(feed_url, payload):
+        raise SourceUnchanged(f"RSS feed unchanged for {feed_url}")
+    data = feedparser.parse(payload)
     if data.bozo:
         raise FetchError(f"RSS parse error for {feed_url}")
     items: list[BlogItem] = []
@@ -46,13 +49,17 @@ def fetch_rss(
         published = entry.get("published") or entry.get("updated")
         author = entry.get("author")
         summary = entry.get("summary")
-        content_html = _extract_content_html(entry)
-        if content_html:
-            content_markdown = (
-                html_to_markdown(content_html) if html_to_markdown else md(content_html)
-            )
-        else:
-            content_markdown = summary or ""
+        content_markdown: str | None = None
+        # Entries already stored with good content are ignored by storage, so skip
+        # the HTML -> Markdown conversion for them.
+        if not ctx.is_known_complete(str(link)):
+            content_html = _extract_content_html(entry)
+            if content_html:
+                content_markdown = (
+                    html_to_markdown(content_html) if html_to_markdown else md(content_html)
+                )
+            else:
+                content_markdown = summary or ""
         items.append(
             BlogItem(
                 title=str(title),
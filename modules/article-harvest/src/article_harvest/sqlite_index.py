@@ -1,33 +1,165 @@
 from __future__ import annotations
 
-import hashlib
 import json
+import os
 import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
 from pathlib import Path
 from typing import Iterable
 
 from .models import Record, Source
+from .pagination import SCORE_KEY, Cursor, record_key
 from .sources.registry import list_sources
 from .storage import Storage, default_data_root
 from .time_utils import iso_now, parse_date
+from .url_index import is_appended
 
 DEFAULT_DB_NAME = "index.sqlite"
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHE_SIZE_KB = 64 * 1024
+CACHED_STATEMENTS = 256
+ANALYSIS_LIMIT = 1000
+
+# (path, inode) of databases whose schema this process has already checked.
+_SCHEMA_CHECKED: set[tuple[str, int]] = set()
+_SCHEMA_LOCK = threading.Lock()
+
+# Plans, row counts and timings of the queries run in the current context, when traced.
+# A context variable, not index state: indexes are shared across threads.
+_TRACE: ContextVar[list[dict] | None] = ContextVar("sqlite_index_trace", default=None)
 
 
 class SQLiteIndex:
-    def __init__(self, data_root: Path | None = None) -> None:
+    """SQLite index over stored records, queried through one long-lived connection.
+
+    The connection runs in WAL mode so readers and the ingest writer do not block each
+    other. It is reopened if the database file is replaced or removed underneath it.
+    """
+
+    def __init__(
+        self,
+        data_root: Path | None = None,
+        db_path: Path | None = None,
+        *,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+        storage: Storage | None = None,
+    ) -> None:
         self.data_root = data_root or default_data_root()
+        # Reads the content of records upserted without their text; built on first use
+        # (and then closed with the index) when not given.
+        self._storage = storage
+        self._owns_storage = False
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._inode: int | None = None
 
     def path(self) -> Path:
-        return self.data_root / DEFAULT_DB_NAME
+        return self.db_path or self.data_root / DEFAULT_DB_NAME
 
     def exists(self) -> bool:
         return self.path().exists()
 
     def connect(self) -> sqlite3.Connection:
+        """Open a new, separately owned connection with the index pragmas applied."""
         self.data_root.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(self.path())
+        conn = sqlite3.connect(
+            self.path(), check_same_thread=False, cached_statements=CACHED_STATEMENTS
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_size_kb)}")
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._inode = None
+            if self._owns_storage and self._storage is not None:
+                self._storage.close()
+                self._storage = None
+                self._owns_storage = False
+
+    def _content_storage(self) -> Storage:
+        with self._lock:
+            if self._storage is None:
+                # Only the files backend keeps a separate index; the sqlite backend
+                # always passes the text it indexes.
+                self._storage = Storage(self.data_root)
+                self._owns_storage = True
+            return self._storage
+
+    def analyze(self) -> None:
+        """Refresh the planner statistics used to choose between the record indexes.
+
+        ``analysis_limit`` samples each index, keeping this cheap enough to run after
+        every sync that changed something.
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+            conn.execute("ANALYZE")
+            conn.commit()
+
+    def _fetch(self, sql: str, params: list[object]) -> list[sqlite3.Row]:
+        trace = _TRACE.get()
+        with self._lock:
+            conn = self._connection()
+            if trace is None:
+                return conn.execute(sql, params).fetchall()
+            plan = [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            started = time.perf_counter()
+            rows = conn.execute(sql, params).fetchall()
+            elapsed = time.perf_counter() - started
+        trace.append(
+            {
+                "sql": sql,
+                "params": params,
+                "plan": plan,
+                "rows": len(rows),
+                "elapsed_ms": round(elapsed * 1000, 3),
+            }
+        )
+        return rows
+
+    def _has_table(self, name: str) -> bool:
+        with self._lock:
+            return _table_exists(self._connection(), name)
+
+    def _connection(self) -> sqlite3.Connection:
+        # Callers hold self._lock. A rebuild or manual delete can swap the file, so the
+        # cached connection is only reused while it still points at the same inode.
+        path = self.path()
+        try:
+            inode = path.stat().st_ino
+        except FileNotFoundError:
+            inode = None
+        if self._conn is not None and inode == self._inode:
+            return self._conn
+        self.close()
+        created = inode is None
+        conn = self.connect()
+        inode = path.stat().st_ino
+        key = (str(path.resolve()), inode)
+        with _SCHEMA_LOCK:
+            if created or key not in _SCHEMA_CHECKED:
+                with conn:
+                    self.ensure_schema(conn)
+                _SCHEMA_CHECKED.add(key)
+        self._conn = conn
+        self._inode = inode
         return conn
 
     def ensure_schema(self, conn: sqlite3.Connection) -> None:
@@ -55,47 +187,308 @@ class SQLiteIndex:
             """
         )
         _ensure_columns(conn, ["item_id", "content_path"])
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_records_source ON records(source_id)")
+        # Composite indexes return rows already ordered by (archived_at, id), so
+        # filtered queries with ORDER BY ... LIMIT and keyset cursors stop early
+        # instead of sorting every match.
+        for stale in (
+            "idx_records_source",
+            "idx_records_archived_date",
+            "idx_records_source_archived",
+            "idx_records_date_archived",
+            "idx_records_archived_at",
+        ):
+            conn.execute(f"DROP INDEX IF EXISTS {stale}")
         conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_records_archived_date ON records(archived_date)"
+            "CREATE INDEX IF NOT EXISTS idx_records_source_keyset"
+            " ON records(source_id, archived_at, id)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_records_date_keyset"
+            " ON records(archived_date, archived_at, id)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_records_keyset ON records(archived_at, id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_records_title ON records(title)")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                path TEXT PRIMARY KEY,
+                source_id TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                snapshot_date TEXT
+            )
+            """
+        )
+        self._ensure_text_schema(conn)
+
+    def _ensure_text_schema(self, conn: sqlite3.Connection) -> None:
+        # record_text mirrors searchable text per records.rowid and is the external
+        # content table of records_fts (words) and records_trigram (substrings);
+        # the triggers keep both FTS indexes in sync.
+        existed = _table_exists(conn, "record_text")
+        trigram_existed = _table_exists(conn, "records_trigram")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS record_text (
+                record_rowid INTEGER PRIMARY KEY,
+                title TEXT,
+                author TEXT,
+                body TEXT
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+                title,
+                author,
+                body,
+                content='record_text',
+                content_rowid='record_rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS record_text_ai AFTER INSERT ON record_text BEGIN
+                INSERT INTO records_fts(rowid, title, author, body)
+                VALUES (new.record_rowid, new.title, new.author, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS record_text_ad AFTER DELETE ON record_text BEGIN
+                INSERT INTO records_fts(records_fts, rowid, title, author, body)
+                VALUES ('delete', old.record_rowid, old.title, old.author, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS record_text_au AFTER UPDATE ON record_text BEGIN
+                INSERT INTO records_fts(records_fts, rowid, title, author, body)
+                VALUES ('delete', old.record_rowid, old.title, old.author, old.body);
+                INSERT INTO records_fts(rowid, title, author, body)
+                VALUES (new.record_rowid, new.title, new.author, new.body);
+            END;
+            """
+        )
+        if not existed:
+            self._backfill_text(conn)
+        # The trigram tokenizer needs SQLite 3.34+; without it substring search falls
+        # back to LIKE scans of record_text.
+        if not _trigram_supported(conn):
+            return
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS records_trigram USING fts5(
+                title,
+                author,
+                body,
+                content='record_text',
+                content_rowid='record_rowid',
+                tokenize='trigram'
+            )
+            """
+        )
+        conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS record_text_trigram_ai AFTER INSERT ON record_text BEGIN
+                INSERT INTO records_trigram(rowid, title, author, body)
+                VALUES (new.record_rowid, new.title, new.author, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS record_text_trigram_ad AFTER DELETE ON record_text BEGIN
+                INSERT INTO records_trigram(records_trigram, rowid, title, author, body)
+                VALUES ('delete', old.record_rowid, old.title, old.author, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS record_text_trigram_au AFTER UPDATE ON record_text BEGIN
+                INSERT INTO records_trigram(records_trigram, rowid, title, author, body)
+                VALUES ('delete', old.record_rowid, old.title, old.author, old.body);
+                INSERT INTO records_trigram(rowid, title, author, body)
+                VALUES (new.record_rowid, new.title, new.author, new.body);
+            END;
+            """
+        )
+        if not trigram_existed:
+            conn.execute("INSERT INTO records_trigram(records_trigram) VALUES ('rebuild')")
+
+    def _backfill_text(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute("SELECT id, content_path FROM records").fetchall()
+        storage = self._content_storage()
+        conn.executemany(
+            _TEXT_UPSERT_SQL,
+            [(storage.read_content(row["content_path"]), row["id"]) for row in rows],
+        )
 
     def rebuild(self, storage: Storage, sources: list[Source]) -> int:
+        """Build a fresh index next to the live one and swap it in atomically.
+
+        Readers keep using the old file until ``os.replace`` installs the new one, so
+        they never see a missing or half-built index.
+        """
         path = self.path()
-        if path.exists():
-            path.unlink()
-        total = 0
-        with self.connect() as conn:
-            self.ensure_schema(conn)
-            for source in sources:
-                records = storage.records_for_source(source)
-                total += self._insert_records(conn, records)
+        shadow_path = path.with_name(f".{path.name}.rebuild-{os.getpid()}")
+        _unlink_database(shadow_path)
+        shadow = SQLiteIndex(
+            self.data_root,
+            db_path=shadow_path,
+            mmap_size=self.mmap_size,
+            cache_size_kb=self.cache_size_kb,
+            storage=storage,
+        )
+        try:
+            total = shadow.sync(storage, sources)["upserted"]
+            shadow.analyze()
+            shadow.close()
+            with self._lock:
+                if path.exists():
+                    # A WAL database cannot be renamed over while other connections
+                    # hold its -wal/-shm files, so copy the pages in one transaction.
+                    with closing(sqlite3.connect(shadow_path)) as source:
+                        source.backup(self._connection())
+                else:
+                    os.replace(shadow_path, path)
+        finally:
+            shadow.close()
+            _unlink_database(shadow_path)
         return total
 
+    def sync(self, storage: Storage, sources: list[Source]) -> dict[str, int]:
+        """Load only the manifest lines and snapshot files changed since the last sync.
+
+        ``sync_state`` keeps a watermark per file: size and mtime to detect changes,
+        plus the byte offset already read from append-only manifests. A manifest that
+        shrank or was rewritten is reloaded in full; snapshots are reloaded per file.
+        """
+        counts = {"files_changed": 0, "upserted": 0, "deleted": 0}
+        with self._lock, self._connection() as conn:
+            marks = {row["path"]: row for row in conn.execute("SELECT * FROM sync_state")}
+            for source in sources:
+                if source.kind == "aggregation":
+                    self._sync_snapshots(conn, storage, source, marks, counts)
+                else:
+                    self._sync_manifest(conn, storage, source, marks, counts)
+        if counts["files_changed"]:
+            self.analyze()
+        return counts
+
+    def _sync_manifest(
+        self,
+        conn: sqlite3.Connection,
+        storage: Storage,
+        source: Source,
+        marks: dict[str, sqlite3.Row],
+        counts: dict[str, int],
+    ) -> None:
+        # Rows do not record which manifest file they came from, so a file that shrank,
+        # was rewritten or disappeared reloads the whole source.
+        paths = {self._relative(path): path for path in storage.manifest_paths(source.id)}
+        stale = [
+            key
+            for key, mark in marks.items()
+            if mark["source_id"] == source.id and mark["snapshot_date"] is None
+            and key not in paths
+        ]
+        offsets: dict[str, int] = {}
+        for key, path in paths.items():
+            stat = path.stat()
+            mark = marks.get(key)
+            if mark and (mark["size"], mark["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            offsets[key] = mark["offset"] if mark and is_appended(path, mark["offset"]) else 0
+            if mark and offsets[key] == 0:
+                stale.append(key)
+        if stale:
+            counts["deleted"] += _delete_records(conn, "source_id = ?", [source.id])
+            for key in stale:
+                conn.execute("DELETE FROM sync_state WHERE path = ?", (key,))
+            offsets = dict.fromkeys(paths, 0)
+        for key, offset in offsets.items():
+            stat = paths[key].stat()
+            rows, end = storage.read_manifest_from(source.id, offset, path=paths[key])
+            records = storage.manifest_records(source, rows)
+            counts["upserted"] += self.insert_records(conn, records, storage=storage)
+            _save_mark(conn, key, source.id, stat, end)
+        counts["files_changed"] += len(offsets) + len([key for key in stale if key not in paths])
+
+    def _sync_snapshots(
+        self,
+        conn: sqlite3.Connection,
+        storage: Storage,
+        source: Source,
+        marks: dict[str, sqlite3.Row],
+        counts: dict[str, int],
+    ) -> None:
+        snapshots_dir = storage.snapshots_dir(source.id)
+        paths = sorted(snapshots_dir.glob("*.json"), reverse=True) if snapshots_dir.exists() else []
+        seen: set[str] = set()
+        for path in paths:
+            key = self._relative(path)
+            seen.add(key)
+            stat = path.stat()
+            mark = marks.get(key)
+            if mark and (mark["size"], mark["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            if mark:
+                # A rewritten snapshot may have dropped items; replace its rows.
+                counts["deleted"] += _delete_snapshot(conn, source.id, mark["snapshot_date"])
+            records = storage.snapshot_records(source, path)
+            counts["upserted"] += self.insert_records(conn, records, storage=storage)
+            snapshot_date = records[0].snapshot_date if records else None
+            _save_mark(conn, key, source.id, stat, stat.st_size, snapshot_date)
+            counts["files_changed"] += 1
+        for key, mark in marks.items():
+            if mark["source_id"] != source.id or mark["snapshot_date"] is None or key in seen:
+                continue
+            counts["deleted"] += _delete_snapshot(conn, source.id, mark["snapshot_date"])
+            conn.execute("DELETE FROM sync_state WHERE path = ?", (key,))
+            counts["files_changed"] += 1
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.data_root).as_posix()
+
     def upsert_records(self, records: Iterable[Record]) -> int:
         records_list = list(records)
         if not records_list:
             return 0
-        with self.connect() as conn:
-            self.ensure_schema(conn)
-            return self._insert_records(conn, records_list)
+        with self._lock, self._connection() as conn:
+            return self.insert_records(conn, records_list)
+
+    def query_by_source(
+        self,
+        source_id: str,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[Record]:
+        sql = "SELECT * FROM records WHERE source_id = ?"
+        params: list[object] = [source_id]
+        sql += _keyset_sql("", after, limit, params)
+        return [_row_to_record(row) for row in self._fetch(sql, params)]
+
+    def query_source_records(
+        self,
+        source_id: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        newest_day_first: bool = False,
+        limit: int | None = None,
+    ) -> list[Record]:
+        """A source's records in the order they were stored, or newest day first.
 
-    def query_by_source(self, source_id: str, limit: int | None = None) -> list[Record]:
-        sql = "SELECT * FROM records WHERE source_id = ? ORDER BY archived_at DESC"
+        Records of one day keep their stored order (a snapshot's ranking) either way.
+        """
+        sql = "SELECT * FROM records WHERE source_id = ?"
         params: list[object] = [source_id]
+        sql += _date_bounds_sql("archived_date", start_date, end_date, params)
+        sql += " ORDER BY archived_date DESC, rowid" if newest_day_first else " ORDER BY rowid"
         if limit:
             sql += " LIMIT ?"
             params.append(limit)
-        with self.connect() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        return [_row_to_record(row) for row in rows]
+        return [_row_to_record(row) for row in self._fetch(sql, params)]
 
     def query_by_keyword(
         self,
         keyword: str,
         source_ids: list[str] | None = None,
         limit: int | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        after: Cursor | None = None,
     ) -> list[Record]:
         sql = "SELECT * FROM records WHERE lower(title) LIKE ?"
         params: list[object] = [f"%{keyword.lower()}%"]
@@ -103,13 +496,105 @@ class SQLiteIndex:
             placeholders = ", ".join("?" for _ in source_ids)
             sql += f" AND source_id IN ({placeholders})"
             params.extend(source_ids)
-        sql += " ORDER BY archived_at DESC"
+        sql += _date_bounds_sql("archived_date", start_date, end_date, params)
+        sql += _keyset_sql("", after, limit, params)
+        return [_row_to_record(row) for row in self._fetch(sql, params)]
+
+    def query_by_fulltext(
+        self,
+        keyword: str,
+        source_ids: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[Record]:
+        """Search titles, authors and stored content, best bm25 match first.
+
+        Each record carries its score in ``extra["bm25"]`` so pages can resume from it.
+        """
+        match = _fts_query(keyword)
+        if not match:
+            return []
+        sql = (
+            f"SELECT * FROM (SELECT records.*, bm25(records_fts, {_FTS_WEIGHTS}) AS fts_score"
+            " FROM records_fts"
+            " JOIN records ON records.rowid = records_fts.rowid"
+            " WHERE records_fts MATCH ?"
+        )
+        params: list[object] = [match]
+        if source_ids:
+            placeholders = ", ".join("?" for _ in source_ids)
+            sql += f" AND records.source_id IN ({placeholders})"
+            params.extend(source_ids)
+        sql += _date_bounds_sql("records.archived_date", start_date, end_date, params)
+        sql += ")"
+        if after:
+            if after.score is None:
+                raise ValueError("Cursor does not come from a full-text query")
+            sql += " WHERE fts_score > ? OR (fts_score = ? AND (archived_at, id) < (?, ?))"
+            params.extend([after.score, after.score, after.archived_at, after.record_id])
+        sql += " ORDER BY fts_score, archived_at DESC, id DESC"
         if limit:
             sql += " LIMIT ?"
             params.append(limit)
-        with self.connect() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        return [_row_to_record(row) for row in rows]
+        return [
+            _row_to_record(row, extra={SCORE_KEY: row["fts_score"]})
+            for row in self._fetch(sql, params)
+        ]
+
+    def query_by_substring(
+        self,
+        keyword: str,
+        source_ids: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[Record]:
+        """Case-insensitive substring search over titles, authors and stored content.
+
+        Every whitespace-separated term must appear somewhere in the record. Terms of
+        three or more characters are answered by the trigram index; shorter ones
+        (common for CJK words) fall back to ``LIKE`` on the candidate rows, as do all
+        terms when this SQLite build has no trigram tokenizer.
+        """
+        terms = keyword.split()
+        if not terms:
+            return []
+        long_terms = [term for term in terms if len(term) >= _TRIGRAM_MIN_CHARS]
+        if long_terms and not self._has_table("records_trigram"):
+            long_terms = []
+        short_terms = [term for term in terms if term not in long_terms]
+        params: list[object] = []
+        if long_terms:
+            sql = (
+                "SELECT records.* FROM records_trigram"
+                " JOIN records ON records.rowid = records_trigram.rowid"
+                " JOIN record_text ON record_text.record_rowid = records.rowid"
+                " WHERE records_trigram MATCH ?"
+            )
+            params.append(_fts_query(" ".join(long_terms)))
+        else:
+            sql = (
+                "SELECT records.* FROM records"
+                " JOIN record_text ON record_text.record_rowid = records.rowid"
+                " WHERE 1 = 1"
+            )
+        for term in short_terms:
+            sql += (
+                " AND (record_text.title LIKE ? ESCAPE '\\'"
+                " OR record_text.author LIKE ? ESCAPE '\\'"
+                " OR record_text.body LIKE ? ESCAPE '\\')"
+            )
+            params.extend([_like_pattern(term)] * 3)
+        if source_ids:
+            placeholders = ", ".join("?" for _ in source_ids)
+            sql += f" AND records.source_id IN ({placeholders})"
+            params.extend(source_ids)
+        sql += _date_bounds_sql("records.archived_date", start_date, end_date, params)
+        sql += _keyset_sql("records.", after, limit, params)
+        return [_row_to_record(row) for row in self._fetch(sql, params)]
 
     def query_by_archive_date(
         self,
@@ -117,51 +602,140 @@ class SQLiteIndex:
         end_date: str,
         source_ids: list[str] | None = None,
         limit: int | None = None,
+        after: Cursor | None = None,
     ) -> list[Record]:
-        sql = "SELECT * FROM records WHERE archived_date BETWEEN ? AND ?"
-        params: list[object] = [start_date, end_date]
+        # An equality lets idx_records_date_keyset return the day already ordered.
+        if start_date == end_date:
+            sql = "SELECT * FROM records WHERE archived_date = ?"
+            params: list[object] = [start_date]
+        else:
+            sql = "SELECT * FROM records WHERE archived_date BETWEEN ? AND ?"
+            params = [start_date, end_date]
+            if limit:
+                # archived_date is the ISO date prefix of archived_at, so the same range on
+                # archived_at lets idx_records_keyset walk newest first and stop early.
+                sql += " AND archived_at >= ? AND archived_at < ?"
+                params.extend([start_date, _next_day(end_date)])
         if source_ids:
             placeholders = ", ".join("?" for _ in source_ids)
             sql += f" AND source_id IN ({placeholders})"
             params.extend(source_ids)
-        sql += " ORDER BY archived_at DESC"
-        if limit:
-            sql += " LIMIT ?"
-            params.append(limit)
-        with self.connect() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        return [_row_to_record(row) for row in rows]
+        sql += _keyset_sql("", after, limit, params)
+        return [_row_to_record(row) for row in self._fetch(sql, params)]
 
-    def _insert_records(self, conn: sqlite3.Connection, records: list[Record]) -> int:
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """The shared connection, held under the lock and committed when the block exits."""
+        with self._lock, self._connection() as conn:
+            yield conn
+
+    def insert_records(
+        self,
+        conn: sqlite3.Connection,
+        records: list[Record],
+        bodies: list[str | None] | None = None,
+        storage: Storage | None = None,
+    ) -> int:
+        """Upsert ``records`` and their searchable text in the caller's transaction.
+
+        ``bodies`` is each record's content; without it, content is read through
+        ``storage``, or the index's own storage.
+        """
         rows = [_row_from_record(record) for record in records]
         if not rows:
             return 0
-        conn.executemany(
-            """
-            INSERT OR REPLACE INTO records (
-                id,
-                source_id,
-                source_name,
-                kind,
-                title,
-                url,
-                archived_at,
-                archived_date,
-                published_at,
-                author,
-                snapshot_date,
-                item_id,
-                content_path,
-                rank,
-                comments_count,
-                score,
-                extra_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
+        # Upsert instead of INSERT OR REPLACE so rowids (and FTS rows keyed by
+        # them) stay stable when a record is re-indexed.
+        conn.executemany(_RECORD_UPSERT_SQL, rows)
+        if bodies is None:
+            storage = storage or self._content_storage()
+            bodies = [storage.read_content(record.content_path) for record in records]
+        conn.executemany(_TEXT_UPSERT_SQL, [(body, row[0]) for body, row in zip(bodies, rows)])
         return len(rows)
 
+    def delete_snapshot_records(
+        self, conn: sqlite3.Connection, source_id: str, snapshot_date: str
+    ) -> int:
+        return _delete_snapshot(conn, source_id, snapshot_date)
+
+
+_RECORD_COLUMNS = (
+    "id",
+    "source_id",
+    "source_name",
+    "kind",
+    "title",
+    "url",
+    "archived_at",
+    "archived_date",
+    "published_at",
+    "author",
+    "snapshot_date",
+    "item_id",
+    "content_path",
+    "rank",
+    "comments_count",
+    "score",
+    "extra_json",
+)
+
+_RECORD_UPSERT_SQL = (
+    f"INSERT INTO records ({', '.join(_RECORD_COLUMNS)})"
+    f" VALUES ({', '.join('?' for _ in _RECORD_COLUMNS)})"
+    " ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _RECORD_COLUMNS[1:])
+)
+
+_TEXT_UPSERT_SQL = """
+    INSERT INTO record_text (record_rowid, title, author, body)
+    SELECT rowid, title, author, ? FROM records WHERE id = ?
+    ON CONFLICT(record_rowid) DO UPDATE SET
+        title = excluded.title,
+        author = excluded.author,
+        body = excluded.body
+"""
+
+# bm25 column weights for records_fts(title, author, body).
+_FTS_WEIGHTS = "10.0, 5.0, 1.0"
+
+# The trigram tokenizer cannot match queries shorter than one trigram.
+_TRIGRAM_MIN_CHARS = 3
+
+
+@contextmanager
+def trace_queries() -> Iterator[list[dict]]:
+    """Collect plan, row count and timing of the index queries this block runs.
+
+    Only queries run by the calling thread (or context) are collected.
+    """
+    traces: list[dict] = []
+    token = _TRACE.set(traces)
+    try:
+        yield traces
+    finally:
+        _TRACE.reset(token)
+
+
+def sync_sqlite_index(
+    storage: Storage | None = None,
+    sources: list[Source] | None = None,
+) -> dict:
+    storage = storage or Storage()
+    sources = sources or list_sources(include_disabled=False)
+    index = SQLiteIndex(storage.data_root, storage=storage)
+    started_at = iso_now()
+    try:
+        counts = index.sync(storage, sources)
+    finally:
+        index.close()
+    return {
+        "path": str(index.path()),
+        "sources": [source.id for source in sources],
+        **counts,
+        "started_at": started_at,
+        "finished_at": iso_now(),
+    }
+
 
 def rebuild_sqlite_index(
     storage: Storage | None = None,
@@ -169,9 +743,12 @@ def rebuild_sqlite_index(
 ) -> dict:
     storage = storage or Storage()
     sources = sources or list_sources(include_disabled=False)
-    index = SQLiteIndex(storage.data_root)
+    index = SQLiteIndex(storage.data_root, storage=storage)
     started_at = iso_now()
-    total = index.rebuild(storage, sources)
+    try:
+        total = index.rebuild(storage, sources)
+    finally:
+        index.close()
     return {
         "path": str(index.path()),
         "sources": [source.id for source in sources],
@@ -182,7 +759,7 @@ def rebuild_sqlite_index(
 
 
 def _row_from_record(record: Record) -> tuple:
-    record_id = _record_id(record)
+    record_id = record_key(record)
     archived_date = parse_date(record.archived_at).isoformat()
     extra_json = json.dumps(record.extra, ensure_ascii=False) if record.extra else None
     return (
@@ -206,9 +783,11 @@ def _row_from_record(record: Record) -> tuple:
     )
 
 
-def _row_to_record(row: sqlite3.Row) -> Record:
+def _row_to_record(row: sqlite3.Row, extra: dict | None = None) -> Record:
     extra_raw = row["extra_json"]
-    extra = json.loads(extra_raw) if extra_raw else {}
+    stored_extra = json.loads(extra_raw) if extra_raw else {}
+    if extra:
+        stored_extra = {**stored_extra, **extra}
     return Record(
         source_id=row["source_id"],
         source_name=row["source_name"],
@@ -224,13 +803,106 @@ def _row_to_record(row: sqlite3.Row) -> Record:
         rank=row["rank"],
         comments_count=row["comments_count"],
         score=row["score"],
-        extra=extra,
+        extra=stored_extra,
     )
 
 
-def _record_id(record: Record) -> str:
-    raw = f"{record.source_id}|{record.archived_at}|{record.url}"
-    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+def _unlink_database(path: Path) -> None:
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+
+def _save_mark(
+    conn: sqlite3.Connection,
+    key: str,
+    source_id: str,
+    stat: os.stat_result,
+    offset: int,
+    snapshot_date: str | None = None,
+) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO sync_state (path, source_id, size, mtime_ns, offset, snapshot_date)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        (key, source_id, stat.st_size, stat.st_mtime_ns, offset, snapshot_date),
+    )
+
+
+def _delete_snapshot(conn: sqlite3.Connection, source_id: str, snapshot_date: str | None) -> int:
+    if snapshot_date is None:
+        return 0
+    return _delete_records(conn, "source_id = ? AND snapshot_date = ?", [source_id, snapshot_date])
+
+
+def _delete_records(conn: sqlite3.Connection, where: str, params: list[object]) -> int:
+    # record_text rows go first so the FTS triggers see the old text.
+    conn.execute(
+        f"DELETE FROM record_text WHERE record_rowid IN (SELECT rowid FROM records WHERE {where})",
+        params,
+    )
+    return conn.execute(f"DELETE FROM records WHERE {where}", params).rowcount
+
+
+def _keyset_sql(
+    prefix: str, after: Cursor | None, limit: int | None, params: list[object]
+) -> str:
+    sql = ""
+    if after:
+        sql += f" AND ({prefix}archived_at, {prefix}id) < (?, ?)"
+        params.extend([after.archived_at, after.record_id])
+    sql += f" ORDER BY {prefix}archived_at DESC, {prefix}id DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql
+
+
+def _next_day(value: str) -> str:
+    return (parse_date(value) + timedelta(days=1)).isoformat()
+
+
+def _date_bounds_sql(
+    column: str,
+    start_date: str | None,
+    end_date: str | None,
+    params: list[object],
+) -> str:
+    sql = ""
+    if start_date:
+        sql += f" AND {column} >= ?"
+        params.append(start_date)
+    if end_date:
+        sql += f" AND {column} <= ?"
+        params.append(end_date)
+    return sql
+
+
+def _fts_query(keyword: str) -> str:
+    # Quote every term so user input is matched literally rather than parsed as
+    # FTS5 syntax; terms are ANDed together.
+    terms = keyword.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?",
+        (name,),
+    ).fetchone()
+    return row is not None
+
+
+def _trigram_supported(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(text, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.trigram_probe")
+    return True
 
 
 def _column_names(conn: sqlite3.Connection) -> set[str]:
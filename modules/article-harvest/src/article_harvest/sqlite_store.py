@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+
+from .blob_store import CONTENT_POINTER
+from .models import AggregationComment, AggregationItem, BlogItem, Record, Source
+from .pack_store import PACK_INDEX_NAME
+from .sqlite_index import SQLiteIndex
+from .storage import MANIFEST_DIR, MANIFEST_MIGRATING_NAME, MANIFEST_NAME, Storage
+from .storage_config import save_storage_config
+from .time_utils import iso_date_today, iso_now
+from .url_index import URL_INDEX_NAME
+
+STORE_NAME = "store.sqlite"
+FILES_BACKEND = "files"
+SQLITE_BACKEND = "sqlite"
+FILES_ONLY = "Not available with the sqlite backend, which keeps everything in store.sqlite"
+
+
+class StoreIndex(SQLiteIndex):
+    """The records and full-text tables of the SQLite index, plus the stored data itself."""
+
+    def ensure_schema(self, conn: sqlite3.Connection) -> None:
+        super().ensure_schema(conn)
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                source_id TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                meta_json TEXT NOT NULL,
+                content TEXT,
+                PRIMARY KEY (source_id, item_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_items_url ON items(source_id, url);
+            CREATE TABLE IF NOT EXISTS snapshots (
+                source_id TEXT NOT NULL,
+                snapshot_date TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                PRIMARY KEY (source_id, snapshot_date)
+            );
+            CREATE TABLE IF NOT EXISTS snapshot_comments (
+                source_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                snapshot_date TEXT NOT NULL,
+                comments_json TEXT NOT NULL,
+                PRIMARY KEY (source_id, url, snapshot_date)
+            );
+            """
+        )
+
+
+class SQLiteStorage(Storage):
+    """``Storage`` keeping records, content and snapshots in one SQLite database.
+
+    ``store.sqlite`` holds blog items (meta and content), snapshot payloads and comment
+    threads next to the ``records`` and full-text tables of the SQLite index, so queries
+    run on it directly (``index``) and every save is a single transaction. Content paths
+    keep their file layout form and serve as keys. Fingerprints, run reports and caches
+    stay files.
+    """
+
+    def __init__(self, data_root: Path | None = None) -> None:
+        super().__init__(data_root)
+        self.index = StoreIndex(self.data_root, db_path=self.data_root / STORE_NAME)
+
+    def close(self) -> None:
+        self.index.close()
+        super().close()
+
+    def existing_by_url(self, source_id: str) -> Mapping[str, dict[str, str | int | None]]:
+        return StoredItems(self.index, source_id)
+
+    def load_manifest(
+        self, source_id: str, start: date | None = None, end: date | None = None
+    ) -> list[dict[str, str | int | None]]:
+        sql = "SELECT meta_json FROM items WHERE source_id = ?"
+        params: list[object] = [source_id]
+        for bound, op in ((start, ">="), (end, "<=")):
+            if bound:
+                sql += f" AND date(json_extract(meta_json, '$.archived_at')) {op} ?"
+                params.append(bound.isoformat())
+        with self.index.transaction() as conn:
+            rows = conn.execute(f"{sql} ORDER BY rowid", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def read_content(self, content_path: str | None) -> str | None:
+        key = _item_key(content_path)
+        if key is None:
+            return None
+        with self.index.transaction() as conn:
+            row = conn.execute(
+                "SELECT content FROM items WHERE source_id = ? AND item_id = ?", key
+            ).fetchone()
+        return row[0] if row else None
+
+    def has_content(self, content_path: str | None) -> bool:
+        return self.read_content(content_path) is not None
+
+    def read_meta(self, source_id: str, item_id: str) -> dict | None:
+        with self.index.transaction() as conn:
+            row = conn.execute(
+                "SELECT meta_json FROM items WHERE source_id = ? AND item_id = ?",
+                (source_id, item_id),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_blog_items(self, source: Source, items: list[BlogItem]) -> list[Record]:
+        archived_at = iso_now()
+        existing = self.existing_by_url(source.id)
+        metas: list[dict] = []
+        contents: list[str] = []
+        refreshed: list[tuple[Mapping, str]] = []
+        for item in items:
+            content = item.content_markdown or item.summary or ""
+            known = existing.get(item.url)
+            if known:
+                current = self.read_content(known.get("content_path"))
+                if current is not None and content:
+                    if self._needs_content_refresh(current, content):
+                        refreshed.append((known, content))
+                continue
+            item_id = self._item_id(item.title, item.url)
+            metas.append(self._blog_meta(source, item, item_id, archived_at))
+            contents.append(content)
+        with self.index.transaction() as conn:
+            records = self._insert_items(conn, source, metas, contents)
+            for known, content in refreshed:
+                self._insert_items(conn, source, [dict(known)], [content])
+        return records
+
+    def save_snapshot(self, source: Source, items: list[AggregationItem]) -> Path:
+        """Store today's snapshot and return the path it would have in the file layout.
+
+        That path is only a key: ``load_snapshot`` and ``snapshot_records`` accept it.
+        """
+        payload, comments = self._snapshot_payload(source, items, iso_date_today())
+        with self.index.transaction() as conn:
+            self._insert_snapshot(conn, source, payload, comments)
+        return self.snapshots_dir(source.id) / f"{payload['archived_at']}.json"
+
+    def load_snapshot(self, source_id: str, path: Path) -> dict:
+        with self.index.transaction() as conn:
+            row = conn.execute(
+                "SELECT payload_json FROM snapshots WHERE source_id = ? AND snapshot_date = ?",
+                (source_id, path.stem),
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"No snapshot stored for {source_id} on {path.stem}")
+        return json.loads(row[0])
+
+    def snapshot_paths(self, source_id: str) -> list[Path]:
+        with self.index.transaction() as conn:
+            rows = conn.execute(
+                "SELECT snapshot_date FROM snapshots WHERE source_id = ?"
+                " ORDER BY snapshot_date DESC",
+                (source_id,),
+            ).fetchall()
+        return [self.snapshots_dir(source_id) / f"{row[0]}.json" for row in rows]
+
+    def snapshot_comments(self, source_id: str, snapshot_date: str) -> dict[str, list[dict]]:
+        with self.index.transaction() as conn:
+            rows = conn.execute(
+                "SELECT url, comments_json FROM snapshot_comments"
+                " WHERE source_id = ? AND snapshot_date = ?",
+                (source_id, snapshot_date),
+            ).fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+
+    def load_comments(
+        self, source_id: str, url: str, snapshot_date: str | None = None
+    ) -> list[AggregationComment]:
+        sql = "SELECT comments_json FROM snapshot_comments WHERE source_id = ? AND url = ?"
+        params: list[object] = [source_id, url]
+        if snapshot_date:
+            sql += " AND snapshot_date = ?"
+            params.append(snapshot_date)
+        sql += " ORDER BY snapshot_date DESC LIMIT 1"
+        with self.index.transaction() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return [AggregationComment(**comment) for comment in json.loads(row[0])] if row else []
+
+    def iter_records(
+        self,
+        source: Source,
+        start: date | None = None,
+        end: date | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Record]:
+        records = self.index.query_source_records(
+            source.id,
+            start_date=start.isoformat() if start else None,
+            end_date=end.isoformat() if end else None,
+            newest_day_first=source.kind == "aggregation",
+            limit=limit,
+        )
+        return iter(records)
+
+    def convert_snapshots(
+        self, snapshot_format: str | None = None, source_ids: Iterable[str] | None = None
+    ) -> dict[str, str | int]:
+        raise ValueError(FILES_ONLY)
+
+    def convert_content(
+        self, content_store: str, source_ids: Iterable[str] | None = None
+    ) -> dict[str, str | int]:
+        raise ValueError(FILES_ONLY)
+
+    def compact_packs(self, source_ids: Iterable[str] | None = None) -> dict[str, int]:
+        raise ValueError(FILES_ONLY)
+
+    def partition_manifests(self, source_ids: Iterable[str] | None = None) -> dict[str, int]:
+        raise ValueError(FILES_ONLY)
+
+    def compress_stored(
+        self, compression: str, source_ids: Iterable[str] | None = None
+    ) -> dict[str, str | int | float]:
+        raise ValueError(FILES_ONLY)
+
+    def stored_source_ids(self) -> list[str]:
+        with self.index.transaction() as conn:
+            rows = conn.execute(
+                "SELECT source_id FROM items UNION SELECT source_id FROM snapshots"
+            ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def _insert_items(
+        self,
+        conn: sqlite3.Connection,
+        source: Source,
+        metas: list[dict],
+        contents: list[str | None],
+    ) -> list[Record]:
+        conn.executemany(
+            # An upsert keeps the rowid, so manifest order survives a content refresh.
+            "INSERT INTO items (source_id, item_id, url, meta_json, content)"
+            " VALUES (?, ?, ?, ?, ?) ON CONFLICT(source_id, item_id) DO UPDATE SET"
+            " url = excluded.url, meta_json = excluded.meta_json, content = excluded.content",
+            [
+                (source.id, meta["id"], meta["url"], json.dumps(meta, ensure_ascii=False), content)
+                for meta, content in zip(metas, contents)
+            ],
+        )
+        records = self.manifest_records(source, metas)
+        self.index.insert_records(conn, records, list(contents))
+        return records
+
+    def _insert_snapshot(
+        self,
+        conn: sqlite3.Connection,
+        source: Source,
+        payload: dict,
+        comments: dict[str, list[dict]],
+    ) -> None:
+        snapshot_date = str(payload["archived_at"])
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots (source_id, snapshot_date, payload_json)"
+            " VALUES (?, ?, ?)",
+            (source.id, snapshot_date, json.dumps(payload, ensure_ascii=False)),
+        )
+        conn.execute(
+            "DELETE FROM snapshot_comments WHERE source_id = ? AND snapshot_date = ?",
+            (source.id, snapshot_date),
+        )
+        conn.executemany(
+            "INSERT INTO snapshot_comments (source_id, url, snapshot_date, comments_json)"
+            " VALUES (?, ?, ?, ?)",
+            [
+                (source.id, url, snapshot_date, json.dumps(thread, ensure_ascii=False))
+                for url, thread in comments.items()
+            ],
+        )
+        # A snapshot saved again the same day replaces that day's records.
+        self.index.delete_snapshot_records(conn, source.id, snapshot_date)
+        records = self.payload_records(source, payload)
+        self.index.insert_records(conn, records, [None] * len(records))
+
+
+class StoredItems(Mapping[str, dict]):
+    """Stored blog items of a source by URL, each looked up with one indexed query."""
+
+    def __init__(self, index: StoreIndex, source_id: str) -> None:
+        self._index = index
+        self._source_id = source_id
+
+    def __getitem__(self, url: str) -> dict:
+        with self._index.transaction() as conn:
+            row = conn.execute(
+                "SELECT meta_json FROM items WHERE source_id = ? AND url = ?"
+                " ORDER BY rowid DESC LIMIT 1",
+                (self._source_id, url),
+            ).fetchone()
+        if row is None:
+            raise KeyError(url)
+        return json.loads(row[0])
+
+    def __iter__(self) -> Iterator[str]:
+        with self._index.transaction() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT url FROM items WHERE source_id = ?", (self._source_id,)
+            ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        with self._index.transaction() as conn:
+            row = conn.execute(
+                "SELECT count(DISTINCT url) FROM items WHERE source_id = ?", (self._source_id,)
+            ).fetchone()
+        return row[0]
+
+
+def open_storage(data_root: Path | None = None) -> Storage:
+    """``Storage`` of the backend ``storage.json`` configures for ``data_root``."""
+    storage = Storage(data_root)
+    if storage.config.backend == SQLITE_BACKEND:
+        return SQLiteStorage(storage.data_root)
+    return storage
+
+
+def convert_backend(data_root: Path, backend: str, sources: list[Source]) -> dict:
+    """Move everything stored under ``data_root`` to ``backend`` and make it the default.
+
+    ``sqlite`` loads the file layout of each registered source into ``store.sqlite`` and
+    removes the files it loaded; ``files`` exports the store back and removes it.
+    Directories of sources that are not in ``sources`` are left alone and reported.
+    """
+    files = Storage(data_root)
+    config = replace(files.config, backend=backend)
+    store = SQLiteStorage(files.data_root)
+    if backend == SQLITE_BACKEND:
+        try:
+            report = import_files(store, files, sources)
+        except BaseException:
+            # The file layout is untouched until every source is in; drop the partial store.
+            _remove_store(store)
+            raise
+        save_storage_config(files.data_root, config)
+        for source_id in report["imported"]:
+            _remove_source_files(files, source_id)
+    else:
+        report = export_files(store, files)
+        save_storage_config(files.data_root, config)
+        _remove_store(store)
+    return {"backend": backend, **report}
+
+
+def import_files(store: SQLiteStorage, files: Storage, sources: list[Source]) -> dict:
+    """Load the sources ``files`` holds into ``store``, one transaction per source.
+
+    Leaves the files in place; ``imported`` lists the sources that were loaded. Manifest
+    rows without an ``id`` or ``url`` cannot be keyed and are counted as ``malformed``.
+    """
+    known = {source.id: source for source in sources}
+    report: dict = {
+        "sources": 0,
+        "items": 0,
+        "snapshots": 0,
+        "malformed": 0,
+        "imported": [],
+        "skipped": [],
+    }
+    for source_id in files.stored_source_ids():
+        source = known.get(source_id)
+        if source is None:
+            report["skipped"].append(source_id)
+            continue
+        with store.index.transaction() as conn:
+            for path in files.snapshot_paths(source_id):
+                payload = files.load_snapshot(source_id, path)
+                comments = files.snapshot_comments(source_id, path.stem)
+                for item in payload.get("items", []):
+                    item.pop("comments", None)
+                store._insert_snapshot(conn, source, payload, comments)
+                report["snapshots"] += 1
+            rows = files.load_manifest(source_id)
+            metas = [row for row in rows if row.get("id") and row.get("url")]
+            contents = [files.read_content(meta.get("content_path")) for meta in metas]
+            store._insert_items(conn, source, metas, contents)
+            report["items"] += len(metas)
+            report["malformed"] += len(rows) - len(metas)
+        report["imported"].append(source_id)
+        report["sources"] += 1
+    return report
+
+
+def export_files(store: SQLiteStorage, files: Storage) -> dict:
+    """Write everything in ``store`` to the file layout of ``files``.
+
+    Refuses to mix with data already there: a source that has a manifest or snapshots
+    under ``files`` stops the export before anything is written.
+    """
+    source_ids = store.stored_source_ids()
+    for source_id in source_ids:
+        if files.manifest_paths(source_id) or files.snapshot_paths(source_id):
+            raise ValueError(f"{files.source_root(source_id)} already holds stored data")
+    report = {"path": str(files.data_root), "sources": 0, "items": 0, "snapshots": 0}
+    for source_id in source_ids:
+        metas = store.load_manifest(source_id)
+        for meta in metas:
+            content = store.read_content(meta.get("content_path"))
+            if content is not None:
+                files.write_content(source_id, str(meta["id"]), content)
+            files.write_meta(source_id, str(meta["id"]), meta)
+        if metas:
+            files.append_manifest(source_id, metas)
+        for path in reversed(store.snapshot_paths(source_id)):
+            payload = store.load_snapshot(source_id, path)
+            comments = store.snapshot_comments(source_id, path.stem)
+            files.write_snapshot_payload(source_id, payload, comments)
+            report["snapshots"] += 1
+        report["items"] += len(metas)
+        report["sources"] += 1
+    return report
+
+
+def _remove_store(store: SQLiteStorage) -> None:
+    store.close()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{store.index.path()}{suffix}").unlink(missing_ok=True)
+
+
+def _remove_source_files(files: Storage, source_id: str) -> None:
+    # Loaded into the store; fingerprints (state.json) stay, the sqlite backend uses them.
+    root = files.source_root(source_id)
+    for pointer in files.items_dir(source_id).glob(f"*/{CONTENT_POINTER}"):
+        files.blobs.release(f"{source_id}/{pointer.parent.name}")
+    files.pack(source_id).remove()
+    files.codec(source_id).path.unlink(missing_ok=True)
+    for name in (MANIFEST_NAME, MANIFEST_MIGRATING_NAME, URL_INDEX_NAME, PACK_INDEX_NAME):
+        (root / name).unlink(missing_ok=True)
+    directories = (root / MANIFEST_DIR, files.items_dir(source_id), files.snapshots_dir(source_id))
+    for directory in directories:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _item_key(content_path: str | None) -> tuple[str, str] | None:
+    """``(source_id, item_id)`` of a ``sources/<id>/items/<item>/content.md`` path."""
+    if not content_path:
+        return None
+    parts = Path(content_path).parts
+    if len(parts) < 5 or parts[-5] != "sources" or parts[-3] != "items":
+        return None
+    return parts[-4], parts[-2]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from .compression import COMPRESSIONS, NO_COMPRESSION
+from .snapshot_format import JSON_FORMAT, SNAPSHOT_FORMATS
+
+CONFIG_NAME = "storage.json"
+CONTENT_STORES = ("files", "blobs", "pack")
+BACKENDS = ("files", "sqlite")
+
+
+@dataclass(frozen=True)
+class StorageConfig:
+    """Per data root storage choices, kept in ``storage.json`` next to the sources."""
+
+    snapshot_format: str = JSON_FORMAT
+    content_store: str = "files"
+    compression: str = NO_COMPRESSION
+    backend: str = "files"
+
+    def __post_init__(self) -> None:
+        if self.snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format: {self.snapshot_format}")
+        if self.content_store not in CONTENT_STORES:
+            raise ValueError(f"Unknown content store: {self.content_store}")
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {self.compression}")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown storage backend: {self.backend}")
+
+
+def load_storage_config(data_root: Path) -> StorageConfig:
+    path = data_root / CONFIG_NAME
+    if not path.exists():
+        return StorageConfig()
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    known = {field.name for field in fields(StorageConfig)}
+    return StorageConfig(**{key: value for key, value in payload.items() if key in known})
+
+
+def save_storage_config(data_root: Path, config: StorageConfig) -> Path:
+    data_root.mkdir(parents=True, exist_ok=True)
+    path = data_root / CONFIG_NAME
+    path.write_text(json.dumps(asdict(config), indent=2), encoding="utf-8")
+    return path
+
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from pathlib import Path
+
+ManifestRow = dict[str, str | int | None]
+
+URL_INDEX_NAME = "manifest.urls.sqlite"
+
+
+class ManifestUrlIndex(Mapping[str, ManifestRow]):
+    """URL -> manifest row lookups for one blog source, backed by a SQLite sidecar.
+
+    The sidecar maps each URL to the byte offset and length of its line in the manifest,
+    so a lookup reads and parses a single line. It remembers the size and mtime of every
+    manifest file it has read; when they change, only lines appended past the indexed
+    offset are parsed, and a file that shrank or was rewritten is indexed again.
+    ``manifest_paths`` lists the current files (monthly partitions come and go) in append
+    order, so duplicate URLs resolve to their last manifest line.
+    """
+
+    def __init__(self, index_path: Path, manifest_paths: Callable[[], Sequence[Path]]) -> None:
+        self.index_path = index_path
+        self.manifest_paths = manifest_paths
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._rows: dict[str, ManifestRow | None] = {}
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            paths = list(self.manifest_paths())
+            conn = self._connection() if paths else self._existing_connection()
+            if conn is None:
+                return
+            with conn:
+                names = {self._name(path) for path in paths}
+                for (name,) in conn.execute("SELECT name FROM files").fetchall():
+                    if name not in names:
+                        conn.execute("DELETE FROM urls WHERE file = ?", (name,))
+                        conn.execute("DELETE FROM files WHERE name = ?", (name,))
+                for path in paths:
+                    self._refresh_file(conn, path)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    def __getitem__(self, url: str) -> ManifestRow:
+        with self._lock:
+            if url not in self._rows:
+                self._rows[url] = self._read_row(url)
+            row = self._rows[url]
+        if row is None:
+            raise KeyError(url)
+        return row
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            conn = self._existing_connection()
+            urls = [row[0] for row in conn.execute("SELECT url FROM urls")] if conn else []
+        return iter(urls)
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._existing_connection()
+            return conn.execute("SELECT count(*) FROM urls").fetchone()[0] if conn else 0
+
+    def _existing_connection(self) -> sqlite3.Connection | None:
+        # Sources that never stored anything get no sidecar.
+        if self._conn is None and not self.index_path.exists():
+            return None
+        return self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    name TEXT PRIMARY KEY,
+                    offset INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    file TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def _refresh_file(self, conn: sqlite3.Connection, path: Path) -> None:
+        name = self._name(path)
+        mark = conn.execute(
+            "SELECT offset, size, mtime_ns FROM files WHERE name = ?", (name,)
+        ).fetchone()
+        stat = path.stat()
+        if mark and (mark[1], mark[2]) == (stat.st_size, stat.st_mtime_ns):
+            return
+        offset = mark[0] if mark and is_appended(path, mark[0]) else 0
+        if offset == 0:
+            conn.execute("DELETE FROM urls WHERE file = ?", (name,))
+        with path.open("rb") as handle:
+            handle.seek(offset)
+            payload = handle.read()
+        entries = []
+        position = offset
+        for line in payload.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                # An append in progress; index it once the line is complete.
+                break
+            url = _line_url(line)
+            if url:
+                entries.append((url, name, position, len(line)))
+            position += len(line)
+        conn.executemany(
+            "INSERT OR REPLACE INTO urls (url, file, offset, length) VALUES (?, ?, ?, ?)",
+            entries,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO files (name, offset, size, mtime_ns) VALUES (?, ?, ?, ?)",
+            (name, position, stat.st_size, stat.st_mtime_ns),
+        )
+
+    def _name(self, path: Path) -> str:
+        return path.relative_to(self.index_path.parent).as_posix()
+
+    def _read_row(self, url: str) -> ManifestRow | None:
+        conn = self._existing_connection()
+        if conn is None:
+            return None
+        entry = conn.execute(
+            "SELECT file, offset, length FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+        if entry is None:
+            return None
+        name, offset, length = entry
+        with (self.index_path.parent / name).open("rb") as handle:
+            handle.seek(offset)
+            return json.loads(handle.read(length))
+
+
+def _line_url(line: bytes) -> str | None:
+    if not line.strip():
+        return None
+    try:
+        url = json.loads(line).get("url")
+    except (ValueError, AttributeError):
+        return None
+    return str(url) if url else None
+
+
+def is_appended(path: Path, offset: int) -> bool:
+    """Whether ``path`` still holds the first ``offset`` bytes read earlier, so only the
+    rest needs reading. An append-only manifest still ends that prefix with a newline.
+    """
+    if offset == 0:
+        return True
+    with path.open("rb") as handle:
+        handle.seek(offset - 1)
+        return handle.read(1) == b"\n"
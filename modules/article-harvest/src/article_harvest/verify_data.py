@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from collections import Counter, defaultdict
 from dataclasses import asdict, dataclass
 from pathlib import Path
 
+from .blob_store import BLOBS_DIR, resolve_content
+from .compression import SourceCodec
+from .pack_store import PACK_INDEX_NAME, PackStore
+from .snapshot_format import STRINGS_NAME, StringDictionary, decode_snapshot
+from .storage import manifest_files
+
 
 @dataclass(frozen=True)
 class VerifyIssue:
@@ -44,13 +51,13 @@ def verify_data_root(
         if source_ids is not None and source_id not in source_ids:
             continue
 
-        manifest_path = source_dir / "manifest.jsonl"
+        manifest_paths = manifest_files(source_dir)
         snapshots_dir = source_dir / "snapshots"
-        if manifest_path.exists():
+        if manifest_paths:
             _verify_blog_source(
                 data_root,
                 source_id,
-                manifest_path,
+                manifest_paths,
                 source_dir / "items",
                 collector=collector,
                 min_content_chars=min_content_chars,
@@ -123,10 +130,44 @@ class _IssueCollector:
         }
 
 
+def _manifest_lines(
+    source_id: str, manifest_paths: list[Path], collector: _IssueCollector
+) -> list[tuple[Path, int, str]]:
+    """(manifest file, line number among its non-blank lines, line) across all partitions."""
+    lines: list[tuple[Path, int, str]] = []
+    unreadable = False
+    for manifest_path in manifest_paths:
+        try:
+            text = manifest_path.read_text(encoding="utf-8")
+        except UnicodeDecodeError:
+            collector.add(
+                VerifyIssue(
+                    source_id=source_id,
+                    kind="blog",
+                    issue_type="manifest_bad_utf8",
+                    path=str(manifest_path),
+                )
+            )
+            unreadable = True
+            continue
+        rows = [line for line in text.splitlines() if line.strip()]
+        lines.extend((manifest_path, idx, line) for idx, line in enumerate(rows, start=1))
+    if not lines and not unreadable:
+        collector.add(
+            VerifyIssue(
+                source_id=source_id,
+                kind="blog",
+                issue_type="manifest_empty",
+                path=str(manifest_paths[0]),
+            )
+        )
+    return lines
+
+
 def _verify_blog_source(
     data_root: Path,
     source_id: str,
-    manifest_path: Path,
+    manifest_paths: list[Path],
     items_dir: Path,
     *,
     collector: _IssueCollector,
@@ -134,35 +175,14 @@ def _verify_blog_source(
     include_snippets: bool,
 ) -> None:
     kind = "blog"
-    try:
-        lines = [
-            line
-            for line in manifest_path.read_text(encoding="utf-8").splitlines()
-            if line.strip()
-        ]
-    except UnicodeDecodeError:
-        collector.add(
-            VerifyIssue(
-                source_id=source_id,
-                kind=kind,
-                issue_type="manifest_bad_utf8",
-                path=str(manifest_path),
-            )
-        )
-        return
-
+    lines = _manifest_lines(source_id, manifest_paths, collector)
     if not lines:
-        collector.add(
-            VerifyIssue(
-                source_id=source_id,
-                kind=kind,
-                issue_type="manifest_empty",
-                path=str(manifest_path),
-            )
-        )
         return
 
-    for idx, line in enumerate(lines, start=1):
+    packed = items_dir.parent / PACK_INDEX_NAME
+    pack = PackStore(items_dir.parent) if packed.exists() else None
+    codec = SourceCodec(items_dir.parent)
+    for manifest_path, idx, line in lines:
         try:
             record = json.loads(line)
         except json.JSONDecodeError:
@@ -207,7 +227,8 @@ def _verify_blog_source(
         content_rel = record.get("content_path")
         expected_content_path = items_dir / item_id / "content.md"
         content_path = _content_path(data_root, content_rel, expected_content_path)
-        if not content_path.exists():
+        content_data = _item_file(content_path, pack, item_id, "content.md")
+        if content_data is None:
             collector.add(
                 VerifyIssue(
                     source_id=source_id,
@@ -220,7 +241,8 @@ def _verify_blog_source(
             continue
 
         meta_path = items_dir / item_id / "meta.json"
-        if not meta_path.exists():
+        meta_data = _item_file(meta_path, pack, item_id, "meta.json")
+        if meta_data is None:
             collector.add(
                 VerifyIssue(
                     source_id=source_id,
@@ -235,12 +257,42 @@ def _verify_blog_source(
                 source_id,
                 item_id,
                 meta_path,
+                codec,
+                meta_data,
                 record,
                 collector=collector,
             )
 
+        if content_path.parent.parent.name == BLOBS_DIR:
+            digest = hashlib.sha256(content_data).hexdigest()
+            if digest != content_path.name:
+                collector.add(
+                    VerifyIssue(
+                        source_id=source_id,
+                        kind=kind,
+                        issue_type="blob_digest_mismatch",
+                        item_id=item_id,
+                        path=str(content_path),
+                    )
+                )
+
         try:
-            content = content_path.read_text(encoding="utf-8")
+            content_data = codec.decompress(content_data)
+        except ValueError as exc:
+            collector.add(
+                VerifyIssue(
+                    source_id=source_id,
+                    kind=kind,
+                    issue_type="content_bad_compression",
+                    item_id=item_id,
+                    path=str(content_path),
+                    detail=str(exc),
+                )
+            )
+            continue
+
+        try:
+            content = content_data.decode("utf-8")
         except UnicodeDecodeError:
             collector.add(
                 VerifyIssue(
@@ -313,20 +365,24 @@ def _verify_blog_source(
                     path=str(content_path),
                 )
             )
+    if pack is not None:
+        pack.close()
 
 
 def _verify_meta_consistency(
     source_id: str,
     item_id: str,
     meta_path: Path,
+    codec: SourceCodec,
+    meta_data: bytes,
     manifest_record: dict,
     *,
     collector: _IssueCollector,
 ) -> None:
     kind = "blog"
     try:
-        meta = json.loads(meta_path.read_text(encoding="utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
+        meta = json.loads(codec.decompress(meta_data).decode("utf-8"))
+    except ValueError:  # also bad UTF-8, JSON or zstd frames
         collector.add(
             VerifyIssue(
                 source_id=source_id,
@@ -382,11 +438,13 @@ def _verify_aggregation_source(
     collector: _IssueCollector,
 ) -> None:
     kind = "aggregation"
+    dictionary = StringDictionary(snapshots_dir / STRINGS_NAME)
+    codec = SourceCodec(snapshots_dir.parent)
     for snapshot_path in sorted(snapshots_dir.glob("*.json")):
         collector.note_item(source_id, kind)
         try:
-            payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
-        except (UnicodeDecodeError, json.JSONDecodeError):
+            payload = json.loads(codec.decompress(snapshot_path.read_bytes()))
+        except ValueError:  # also bad UTF-8 or zstd frames
             collector.add(
                 VerifyIssue(
                     source_id=source_id,
@@ -396,6 +454,19 @@ def _verify_aggregation_source(
                 )
             )
             continue
+        try:
+            payload = decode_snapshot(payload, dictionary)
+        except ValueError as exc:
+            collector.add(
+                VerifyIssue(
+                    source_id=source_id,
+                    kind=kind,
+                    issue_type="snapshot_bad_columns",
+                    path=str(snapshot_path),
+                    detail=str(exc),
+                )
+            )
+            continue
 
         items = payload.get("items")
         if not isinstance(items, list):
@@ -469,7 +540,14 @@ def _maybe_snippet(content: str, include_snippets: bool) -> str | None:
     return snippet + ("…" if len(content) > 200 else "")
 
 
+def _item_file(path: Path, pack: PackStore | None, item_id: str, name: str) -> bytes | None:
+    """Bytes of an item file, read from the pack when the source keeps one."""
+    if path.exists():
+        return path.read_bytes()
+    return pack.get(item_id, name) if pack is not None else None
+
+
 def _content_path(data_root: Path, content_rel: object, fallback: Path) -> Path:
     if isinstance(content_rel, str) and content_rel:
-        return data_root / content_rel
-    return fallback
+        return resolve_content(data_root, content_rel)
+    return resolve_content(data_root, fallback)
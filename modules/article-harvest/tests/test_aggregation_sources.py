@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
+from contextlib import closing
 from datetime import datetime
 
 from article_harvest.models import FetchContext
 from article_harvest.sources.aggregations.github_trending import fetch_github_trending
 from article_harvest.sources.aggregations.hf_papers import fetch_hf_papers
-from article_harvest.sources.aggregations.hn import _iso_from_unix, _strip_html, fetch_hn
+from article_harvest.sources.aggregations.hn import (
+    HN_CACHE_DB_NAME,
+    HN_COMMENT_LIMIT,
+    _fetch_comments,
+    _iso_from_unix,
+    _strip_html,
+    fetch_hn,
+)
 from article_harvest.sources.aggregations.lobsters import fetch_lobsters
 from article_harvest.sources.aggregations.product_hunt import fetch_product_hunt
 from article_harvest.sources.aggregations.releasebot import (
@@ -217,6 +227,165 @@ def test_fetch_hn():
     assert items[1].rank == 2
 
 
+def test_fetch_hn_gives_each_worker_thread_its_own_session():
+    responses = {f"{_HN_BASE}/topstories.json": _DummyResponse(json_data=list(range(1, 13)))}
+    for story_id in range(1, 13):
+        responses[f"{_HN_BASE}/item/{story_id}.json"] = _DummyResponse(
+            json_data={"type": "story", "title": f"S{story_id}", "kids": [story_id * 100]}
+        )
+        responses[f"{_HN_BASE}/item/{story_id * 100}.json"] = _DummyResponse(
+            json_data={"type": "comment", "text": "hi", "by": "a"}
+        )
+
+    class _ThreadSession(_DummySession):
+        def __init__(self):
+            super().__init__(responses=responses)
+            self.threads = set()
+
+        def get(self, url, **kwargs):
+            self.threads.add(threading.get_ident())
+            return super().get(url, **kwargs)
+
+        def close(self):
+            pass
+
+    workers = []
+
+    def factory():
+        workers.append(_ThreadSession())
+        return workers[-1]
+
+    main = _ThreadSession()
+    ctx = FetchContext(session=main, run_id="test", now=datetime.utcnow(), session_factory=factory)
+    items = fetch_hn(ctx, max_in_flight=4)
+
+    assert [len(item.comments) for item in items] == [1] * 10
+    assert main.threads == {threading.get_ident()}
+    assert 1 <= len(workers) <= 4
+    assert all(len(session.threads) == 1 for session in workers)
+
+
+def _sequential_bfs(tree, root_ids):
+    # Reference: the original one-request-at-a-time walk.
+    order = []
+    queue = list(root_ids)
+    while queue and len(order) < HN_COMMENT_LIMIT:
+        node = tree.get(queue.pop(0))
+        if node is None or node.get("type") != "comment":
+            continue
+        order.append(node["by"])
+        for kid in node.get("kids") or []:
+            if len(order) + len(queue) >= HN_COMMENT_LIMIT:
+                break
+            queue.append(kid)
+    return order
+
+
+def test_fetch_comments_matches_sequential_bfs():
+    tree = {}
+    for comment_id in range(100, 160):
+        kids = [comment_id * 10 + offset for offset in range(3)] if comment_id % 4 else []
+        tree[comment_id] = {"type": "comment", "by": f"u{comment_id}", "text": "x", "kids": kids}
+        for kid in kids:
+            tree[kid] = {"type": "comment", "by": f"u{kid}", "text": "y", "kids": []}
+    tree[103] = {"type": "story", "by": "not-a-comment"}
+    root_ids = list(range(100, 112))
+    responses = {
+        f"{_HN_BASE}/item/{item_id}.json": _DummyResponse(json_data=payload)
+        for item_id, payload in tree.items()
+    }
+    session = _DummySession(responses=responses, default=_DummyResponse(json_data=None))
+
+    comments = _fetch_comments(_ctx(session), root_ids)
+
+    assert [comment.author for comment in comments] == _sequential_bfs(tree, root_ids)
+    assert len(comments) == HN_COMMENT_LIMIT
+
+    # Dead ids still occupy queue slots, so replies to the first roots are never queued.
+    root_ids = [101, 102, 105, *range(900, 917)]
+    comments = _fetch_comments(_ctx(session), root_ids)
+    assert [comment.author for comment in comments] == _sequential_bfs(tree, root_ids)
+    assert len(comments) == 3
+
+
+def _hn_comment(text, time, kids=()):
+    return _DummyResponse(
+        json_data={"type": "comment", "text": text, "by": "a", "time": time, "kids": list(kids)}
+    )
+
+
+def _run_hn(responses, now, cache_dir):
+    """Comment texts of the top story, and the item URLs requested for them."""
+
+    class _CountingSession(_DummySession):
+        def __init__(self):
+            super().__init__(responses=responses)
+            self.urls = []
+
+        def get(self, url, **kwargs):
+            self.urls.append(url)
+            return super().get(url, **kwargs)
+
+    session = _CountingSession()
+    ctx = FetchContext(session=session, run_id="test", now=now, cache_dir=cache_dir)
+    items = fetch_hn(ctx)
+    return [comment.text for comment in items[0].comments], session.urls
+
+
+def test_fetch_hn_serves_old_comments_from_item_cache(tmp_path):
+    fetched_at = datetime(2024, 1, 2)
+    now_unix = 1704153600  # 2024-01-02T00:00:00Z
+    roots = [10, 11, *range(20, 38)]
+    responses = {
+        f"{_HN_BASE}/topstories.json": _DummyResponse(json_data=[1]),
+        f"{_HN_BASE}/item/1.json": _DummyResponse(
+            json_data={"type": "story", "title": "Story", "descendants": 20, "kids": roots}
+        ),
+        f"{_HN_BASE}/item/10.json": _hn_comment("old", now_unix - 86400),
+        f"{_HN_BASE}/item/11.json": _hn_comment("new", now_unix - 60),
+    }
+    for item_id in range(20, 38):
+        responses[f"{_HN_BASE}/item/{item_id}.json"] = _hn_comment("more", now_unix - 60)
+    watched = (f"{_HN_BASE}/item/10.json", f"{_HN_BASE}/item/11.json")
+
+    texts, urls = _run_hn(responses, fetched_at, tmp_path)
+    assert texts[:2] == ["old", "new"]
+    assert [url for url in urls if url in watched] == list(watched)
+    # An hour later the day-old comment is still cached; the minute-old one is refetched.
+    # Twenty roots fill every comment slot, so no cached kids list is needed.
+    texts, urls = _run_hn(responses, fetched_at.replace(hour=1), tmp_path)
+    assert texts[:2] == ["old", "new"]
+    assert [url for url in urls if url in watched] == [f"{_HN_BASE}/item/11.json"]
+
+    # Opening the cache a week later drops expired payloads, even of comments gone
+    # from the story.
+    responses[f"{_HN_BASE}/item/1.json"] = _DummyResponse(
+        json_data={"type": "story", "title": "Story", "descendants": 19, "kids": roots[1:]}
+    )
+    _run_hn(responses, fetched_at.replace(day=10), tmp_path)
+    with closing(sqlite3.connect(tmp_path / HN_CACHE_DB_NAME)) as conn:
+        cached_ids = {row[0] for row in conn.execute("SELECT id FROM items")}
+    assert cached_ids == set(roots[1:])
+
+
+def test_fetch_hn_refetches_cached_comments_whose_replies_are_needed(tmp_path):
+    fetched_at = datetime(2024, 1, 2)
+    now_unix = 1704153600
+    responses = {
+        f"{_HN_BASE}/topstories.json": _DummyResponse(json_data=[1]),
+        f"{_HN_BASE}/item/1.json": _DummyResponse(
+            json_data={"type": "story", "title": "Story", "descendants": 1, "kids": [10]}
+        ),
+        f"{_HN_BASE}/item/10.json": _hn_comment("old", now_unix - 86400),
+    }
+    assert _run_hn(responses, fetched_at, tmp_path)[0] == ["old"]
+
+    responses[f"{_HN_BASE}/item/10.json"] = _hn_comment("old", now_unix - 86400, kids=[12])
+    responses[f"{_HN_BASE}/item/12.json"] = _hn_comment("reply", now_unix + 600)
+    texts, _ = _run_hn(responses, fetched_at.replace(hour=1), tmp_path)
+    assert texts == ["old", "reply"]
+
+
 def test_strip_html():
     assert _strip_html("<p>Hello <b>world</b></p>") == "Hello world"
     assert _strip_html("plain text") == "plain text"
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+
+from article_harvest.models import FetchContext
+from article_harvest.sources.articles import fetch_articles
+
+
+@dataclass(frozen=True)
+class _Entry:
+    url: str
+
+
+class _SlowSession:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        host = url.split("/")[2]
+        with self._lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(0.02)
+        with self._lock:
+            self.active[host] -= 1
+        if url in self.fail:
+            raise RuntimeError(f"boom {url}")
+        return _Response(url)
+
+
+class _Response:
+    def __init__(self, url):
+        self.text = f"<html>{url}</html>"
+
+    def raise_for_status(self):
+        pass
+
+
+def _ctx(session):
+    return FetchContext(session=session, run_id="test", now=datetime.utcnow())
+
+
+def test_fetch_articles_keeps_order_and_caps_per_host():
+    entries = [_Entry(f"https://a.example/{i}") for i in range(6)]
+    entries += [_Entry(f"https://b.example/{i}") for i in range(3)]
+    session = _SlowSession()
+
+    results = fetch_articles(
+        _ctx(session),
+        entries,
+        lambda entry, html: (entry.url, html),
+        max_workers=8,
+        per_host=2,
+    )
+
+    assert [url for url, _ in results] == [entry.url for entry in entries]
+    assert results[0][1] == "<html>https://a.example/0</html>"
+    assert session.peak == {"a.example": 2, "b.example": 2}
+
+
+def test_fetch_articles_skip_errors():
+    entries = [_Entry("https://a.example/ok"), _Entry("https://a.example/bad")]
+    session = _SlowSession(fail={"https://a.example/bad"})
+
+    results = fetch_articles(
+        _ctx(session),
+        entries,
+        lambda entry, html: html,
+        skip_errors=True,
+    )
+    assert results == ["<html>https://a.example/ok</html>", None]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        fetch_articles(_ctx(session), entries, lambda entry, html: html)
+
+
+def test_fetch_articles_downloads_through_one_session_per_worker():
+    class _ThreadSession(_SlowSession):
+        def __init__(self):
+            super().__init__()
+            self.threads = set()
+            self.closed = False
+
+        def get(self, url, **kwargs):
+            self.threads.add(threading.get_ident())
+            return super().get(url, **kwargs)
+
+        def close(self):
+            self.closed = True
+
+    workers = []
+
+    def factory():
+        workers.append(_ThreadSession())
+        return workers[-1]
+
+    main = _ThreadSession()
+    ctx = FetchContext(session=main, run_id="test", now=datetime.utcnow(), session_factory=factory)
+    entries = [_Entry(f"https://host{i}.example/") for i in range(8)]
+    results = fetch_articles(ctx, entries, lambda entry, html: html, max_workers=4)
+
+    assert len([result for result in results if result]) == 8
+    assert not main.threads
+    assert 1 <= len(workers) <= 4
+    assert all(len(session.threads) == 1 and session.closed for session in workers)
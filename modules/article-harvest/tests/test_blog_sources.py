@@ -35,8 +35,10 @@ class _DummySession:
         self._responses = responses or {}
         self._default = default
         self.headers = {}
+        self.urls = []
 
     def get(self, url, **kwargs):
+        self.urls.append(url)
         if url in self._responses:
             return self._responses[url]
         if self._default is not None:
@@ -44,8 +46,8 @@ class _DummySession:
         raise ValueError(f"Unmocked URL: {url}")
 
 
-def _ctx(session):
-    return FetchContext(session=session, run_id="test", now=datetime.utcnow())
+def _ctx(session, known=None):
+    return FetchContext(session=session, run_id="test", now=datetime.utcnow(), known=known)
 
 
 # -- Claude Blog --
@@ -79,11 +81,30 @@ def test_fetch_claude_blog():
     assert "Interesting article content" in items[0].content_markdown
 
 
+def test_fetch_claude_blog_only_downloads_new_or_incomplete_articles():
+    session = _DummySession(
+        responses={"https://claude.com/blog": _DummyResponse(text=_CLAUDE_LISTING)},
+        default=_DummyResponse(text=_CLAUDE_ARTICLE),
+    )
+    known = {
+        "https://claude.com/blog/post-one": True,
+        "https://claude.com/blog/post-two": False,
+    }
+    items = fetch_claude_blog(_ctx(session, known=known))
+
+    assert session.urls == ["https://claude.com/blog", "https://claude.com/blog/post-two"]
+    assert [item.url for item in items] == list(known)
+    assert items[0].title == "Post One"
+    assert items[0].content_markdown is None
+    assert items[1].title == "The Real Title"
+
+
 # -- OpenAI Developers Blog --
 
 
 _OPENAI_LISTING = """\
 <html><body><main>
+  <a href="/blog/new-feature"><img src="/cover.png" alt=""></a>
   <a href="/blog/new-feature">New Feature</a>
   <a href="/blog/update">Update</a>
   <a href="/blog/topic/ai">Topic link</a>
@@ -110,6 +131,24 @@ def test_fetch_openai_dev_blog():
     assert "new feature" in items[0].content_markdown.lower()
 
 
+def test_fetch_openai_dev_blog_skips_known_articles():
+    session = _DummySession(
+        responses={
+            "https://developers.openai.com/blog": _DummyResponse(text=_OPENAI_LISTING),
+        },
+        default=_DummyResponse(text=_OPENAI_ARTICLE),
+    )
+    known = {
+        "https://developers.openai.com/blog/new-feature": True,
+        "https://developers.openai.com/blog/update": True,
+    }
+    items = fetch_openai_dev_blog(_ctx(session, known=known))
+
+    assert session.urls == ["https://developers.openai.com/blog"]
+    assert [item.url for item in items] == list(known)
+    assert [item.title for item in items] == ["New Feature", "Update"]
+
+
 # -- AlphaSignal helpers --
 
 
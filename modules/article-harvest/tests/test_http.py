@@ -1,6 +1,21 @@
 from __future__ import annotations
 
-from article_harvest.http import create_session, get_bytes, get_json, get_text
+import os
+import threading
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from article_harvest.http import (
+    WorkerSessions,
+    cache_stats,
+    create_session,
+    get_bytes,
+    get_json,
+    get_text,
+)
+from article_harvest.http_cache import HTTPCache
 
 
 class _DummyResponse:
@@ -61,3 +76,100 @@ def test_get_text_custom_timeout():
     session = _DummySession(resp)
     get_text(session, "https://example.com", timeout=5)
     assert session.last_kwargs.get("timeout") == 5
+
+
+class _FakeOrigin:
+    """Stands in for the network behind CachingAdapter."""
+
+    def __init__(self, body=b"<rss/>", headers=None):
+        self.body = body
+        self.headers = headers if headers is not None else {"ETag": '"v1"'}
+        self.requests = []
+
+    def send(self, adapter, request, **kwargs):
+        self.requests.append(dict(request.headers))
+        response = Response()
+        response.url = request.url
+        response.request = request
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content_consumed = True
+        etag = self.headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = self.body
+        return response
+
+
+def _cached_session(monkeypatch, tmp_path, origin, **cache_kwargs):
+    monkeypatch.setattr(
+        HTTPAdapter,
+        "send",
+        lambda adapter, request, **kwargs: origin.send(adapter, request, **kwargs),
+    )
+    return create_session(cache=HTTPCache(tmp_path, **cache_kwargs))
+
+
+def test_cached_session_revalidates_with_etag(monkeypatch, tmp_path):
+    origin = _FakeOrigin()
+    session = _cached_session(monkeypatch, tmp_path, origin)
+
+    assert get_bytes(session, "https://example.com/feed") == b"<rss/>"
+    assert get_bytes(session, "https://example.com/feed") == b"<rss/>"
+
+    assert "If-None-Match" not in origin.requests[0]
+    assert origin.requests[1]["If-None-Match"] == '"v1"'
+    assert cache_stats(session) == {"hits": 0, "revalidated": 1, "misses": 1}
+
+
+def test_cached_session_serves_fresh_entries_without_request(monkeypatch, tmp_path):
+    origin = _FakeOrigin(headers={"Cache-Control": "max-age=600", "Content-Type": "text/html"})
+    session = _cached_session(monkeypatch, tmp_path, origin)
+
+    get_text(session, "https://example.com/page")
+    assert get_text(session, "https://example.com/page") == "<rss/>"
+
+    assert len(origin.requests) == 1
+    assert cache_stats(session)["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used_entries(monkeypatch, tmp_path):
+    origin = _FakeOrigin(body=b"x" * 100)
+    session = _cached_session(monkeypatch, tmp_path, origin, max_bytes=250)
+    for index in range(3):
+        get_bytes(session, f"https://example.com/{index}")
+        for meta in tmp_path.glob("*.json"):
+            stat = meta.stat()
+            os.utime(meta, (stat.st_atime, stat.st_mtime - 10))
+
+    assert len(list(tmp_path.glob("*.body"))) == 2
+    get_bytes(session, "https://example.com/0")
+    assert "If-None-Match" not in origin.requests[-1]
+
+
+def test_worker_sessions_are_per_thread_and_report_their_cache_stats(monkeypatch, tmp_path):
+    origin = _FakeOrigin()
+    fallback = create_session()
+    sessions = WorkerSessions(
+        lambda: _cached_session(monkeypatch, tmp_path, origin), fallback
+    )
+    used = []
+
+    def work():
+        used.append(sessions.get())
+        assert sessions.get() is used[-1]
+        get_bytes(used[-1], "https://example.com/feed")
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    assert used[0] is not used[1] and fallback not in used
+    assert sessions.close() == [
+        {"hits": 0, "revalidated": 0, "misses": 1},
+        {"hits": 0, "revalidated": 1, "misses": 0},
+    ]
+    assert WorkerSessions(None, fallback).get() is fallback
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from article_harvest.errors import FetchError
+from article_harvest.errors import FetchError, SourceUnchanged
 from article_harvest.ingest import _as_blog_items, ingest_all, ingest_source
 from article_harvest.models import AggregationItem, BlogItem, Source
+from article_harvest.queries import query_by_keyword
+from article_harvest.sources.rss import make_rss_source
+from article_harvest.sqlite_index import SQLiteIndex, rebuild_sqlite_index
 from article_harvest.storage import Storage
 
 
@@ -113,3 +120,163 @@ def test_ingest_all_empty_items_records_failure(mock_list_sources, mock_create_s
 
     assert len(report["failures"]) == 1
     assert "no items" in report["failures"][0]["error"]
+
+
+@patch("article_harvest.ingest.create_session")
+@patch("article_harvest.ingest.list_sources")
+def test_ingest_all_concurrent_keeps_source_order(
+    mock_list_sources, mock_create_session, tmp_path
+):
+    mock_create_session.side_effect = lambda **kwargs: MagicMock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _slow_source(source_id, delay):
+        def _fetch(ctx):
+            barrier.wait()
+            time.sleep(delay)
+            return _agg_items(1)
+
+        return Source(id=source_id, name=source_id, kind="aggregation", method="api", fetch=_fetch)
+
+    mock_list_sources.return_value = [
+        _slow_source("slow", 0.05),
+        _make_source(source_id="broken", raises=FetchError("boom")),
+        _slow_source("fast-1", 0),
+        _slow_source("fast-2", 0),
+    ]
+
+    storage = Storage(data_root=tmp_path)
+    report = ingest_all(storage=storage, concurrency=4)
+
+    assert report["concurrency"] == 4
+    assert [entry["source_id"] for entry in report["successes"]] == ["slow", "fast-1", "fast-2"]
+    assert [entry["source_id"] for entry in report["failures"]] == ["broken"]
+    assert all("duration_s" in entry for entry in report["successes"] + report["failures"])
+    assert mock_create_session.call_count == 4
+
+
+@patch("article_harvest.ingest.create_session")
+@patch("article_harvest.ingest.list_sources")
+def test_ingest_all_reports_unchanged_feed_without_parsing(
+    mock_list_sources, mock_create_session, tmp_path
+):
+    feed = (Path(__file__).parent / "fixtures" / "rss_sample.xml").read_bytes()
+    session = MagicMock()
+    session.get.return_value.content = feed
+    mock_create_session.return_value = session
+    mock_list_sources.return_value = [make_rss_source("feed", "Feed", "https://example.com/rss")]
+    storage = Storage(data_root=tmp_path)
+
+    first = ingest_all(storage=storage)
+    assert [entry["source_id"] for entry in first["successes"]] == ["feed"]
+    assert storage.load_fingerprints("feed")
+
+    with patch("article_harvest.sources.rss.feedparser.parse") as mock_parse:
+        second = ingest_all(storage=storage)
+    mock_parse.assert_not_called()
+    assert second["successes"] == []
+    assert [entry["source_id"] for entry in second["unchanged"]] == ["feed"]
+
+    session.get.return_value.content = feed.replace(b"Sample Post", b"Edited Post")
+    third = ingest_all(storage=storage)
+    assert [entry["source_id"] for entry in third["successes"]] == ["feed"]
+
+
+@patch("article_harvest.ingest.create_session")
+@patch("article_harvest.ingest.list_sources")
+def test_ingest_all_keeps_fetching_unchanged_feed_until_articles_are_complete(
+    mock_list_sources, mock_create_session, tmp_path
+):
+    articles = [""]
+
+    def _fetch(ctx):
+        if ctx.state.is_unchanged("https://example.com/rss", b"same feed"):
+            raise SourceUnchanged("feed unchanged")
+        return [
+            BlogItem(title="Post", url="https://example.com/post", content_markdown=articles[0])
+        ]
+
+    mock_list_sources.return_value = [
+        Source(id="feed", name="Feed", kind="blog", method="rss", fetch=_fetch)
+    ]
+    storage = Storage(data_root=tmp_path)
+
+    first = ingest_all(storage=storage)
+    assert first["successes"][0]["incomplete"] == 1
+    assert not storage.load_fingerprints("feed")
+
+    articles[0] = "Full article"
+    second = ingest_all(storage=storage)
+    assert [entry["source_id"] for entry in second["successes"]] == ["feed"]
+    assert storage.known_urls("feed")["https://example.com/post"] is True
+    assert storage.load_fingerprints("feed")
+
+    third = ingest_all(storage=storage)
+    assert [entry["source_id"] for entry in third["unchanged"]] == ["feed"]
+
+
+@patch("article_harvest.ingest.create_session")
+@patch("article_harvest.ingest.list_sources")
+def test_ingest_all_gives_up_on_articles_that_never_get_content(
+    mock_list_sources, mock_create_session, tmp_path
+):
+    def _fetch(ctx):
+        if ctx.state.is_unchanged("https://example.com/rss", b"same feed"):
+            raise SourceUnchanged("feed unchanged")
+        return [BlogItem(title="Paywalled", url="https://example.com/paywalled")]
+
+    mock_list_sources.return_value = [
+        Source(id="feed", name="Feed", kind="blog", method="rss", fetch=_fetch)
+    ]
+    storage = Storage(data_root=tmp_path)
+
+    assert ingest_all(storage=storage)["successes"][0]["incomplete"] == 1
+    # One more parse to retry the article, then the shortcut applies despite it.
+    second = ingest_all(storage=storage)
+    assert "incomplete" not in second["successes"][0]
+    assert storage.known_urls("feed")["https://example.com/paywalled"] is False
+    third = ingest_all(storage=storage)
+    assert [entry["source_id"] for entry in third["unchanged"]] == ["feed"]
+
+
+@patch("article_harvest.ingest.create_session")
+@patch("article_harvest.ingest.list_sources")
+def test_ingest_all_reindexes_repaired_content(mock_list_sources, mock_create_session, tmp_path):
+    mock_create_session.return_value = MagicMock()
+    storage = Storage(data_root=tmp_path)
+    empty = BlogItem(title="Post", url="https://example.com/post", content_markdown="")
+    source = _make_source(kind="blog", items=[empty])
+    mock_list_sources.return_value = [source]
+    rebuild_sqlite_index(storage, [source])
+    ingest_all(storage=storage)
+    assert query_by_keyword(storage, [source], "speculative", fts=True) == []
+
+    repaired = BlogItem(title="Post", url=empty.url, content_markdown="Speculative decoding")
+    mock_list_sources.return_value = [_make_source(kind="blog", items=[repaired])]
+    ingest_all(storage=storage)
+    hits = query_by_keyword(storage, [source], "speculative", fts=True)
+    assert [record.url for record in hits] == [empty.url]
+
+
+@patch("article_harvest.ingest.create_session")
+@patch("article_harvest.ingest.list_sources")
+def test_ingest_all_upserts_only_new_snapshot(mock_list_sources, mock_create_session, tmp_path):
+    mock_create_session.return_value = MagicMock()
+    source = _make_source(items=_agg_items(3))
+    mock_list_sources.return_value = [source]
+    storage = Storage(data_root=tmp_path)
+    old_snapshot = storage.snapshots_dir(source.id) / "2020-01-01.json"
+    old_snapshot.parent.mkdir(parents=True)
+    old_snapshot.write_text(
+        json.dumps({"archived_at": "2020-01-01", "items": [{"title": "Old", "url": "u"}]}),
+        encoding="utf-8",
+    )
+    rebuild_sqlite_index(storage, [source])
+
+    with patch.object(
+        SQLiteIndex, "upsert_records", autospec=True, side_effect=lambda self, rows: len(rows)
+    ) as mock_upsert:
+        ingest_all(storage=storage)
+
+    (records,) = [call.args[1] for call in mock_upsert.call_args_list]
+    assert [record.title for record in records] == ["Item 1", "Item 2", "Item 3"]
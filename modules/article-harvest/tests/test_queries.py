@@ -2,8 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import pytest
+
 from article_harvest.models import AggregationItem, BlogItem, Source
+from article_harvest.pagination import next_cursor
 from article_harvest.queries import query_by_archive_date, query_by_keyword, query_by_source
+from article_harvest.sqlite_index import rebuild_sqlite_index
 from article_harvest.storage import Storage
 
 
@@ -36,3 +40,91 @@ def test_query_by_source_keyword_and_date(tmp_path):
     today = datetime.utcnow().date().isoformat()
     date_records = query_by_archive_date(storage, [blog_source, agg_source], on=today)
     assert len(date_records) == 2
+
+
+def _walk_pages(query, page_size):
+    records, after = [], None
+    while True:
+        page = query(limit=page_size, after=after)
+        records.extend(page)
+        after = next_cursor(page, page_size)
+        if after is None:
+            return records
+
+
+def test_cursor_pages_match_unpaged_results_in_both_backends(tmp_path):
+    storage = Storage(tmp_path)
+    blog = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    agg = Source(id="agg", name="Agg", kind="aggregation", method="api", fetch=lambda ctx: [])
+    # One save shares a single archived_at, so pages must break ties by record id.
+    storage.save_blog_items(
+        blog, [BlogItem(title=f"Post {i}", url=f"https://x.com/{i}") for i in range(7)]
+    )
+    storage.save_snapshot(
+        agg, [AggregationItem(title=f"Post {i}", url=f"https://y.com/{i}") for i in range(4)]
+    )
+    sources = [blog, agg]
+    today = datetime.utcnow().date().isoformat()
+    queries = {
+        "source": lambda **page: query_by_source(storage, blog, **page),
+        "keyword": lambda **page: query_by_keyword(storage, sources, "post", **page),
+        "archive": lambda **page: query_by_archive_date(storage, sources, on=today, **page),
+    }
+
+    file_pages = {name: _walk_pages(query, 3) for name, query in queries.items()}
+    for name, query in queries.items():
+        assert file_pages[name] == query()
+    rebuild_sqlite_index(storage, sources)
+    for name, query in queries.items():
+        unpaged = query()
+        assert _walk_pages(query, 3) == unpaged
+        assert file_pages[name] == unpaged
+
+    ranked = _walk_pages(
+        lambda **page: query_by_keyword(storage, sources, "post", fts=True, **page), 2
+    )
+    assert len({record.url for record in ranked}) == 11
+
+
+def test_invalid_cursor_is_rejected(tmp_path):
+    storage = Storage(tmp_path)
+    blog = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    with pytest.raises(ValueError):
+        query_by_source(storage, blog, limit=1, after="not-a-cursor")
+
+
+def test_substring_search_without_index_is_rejected(tmp_path):
+    storage = Storage(tmp_path)
+    blog = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    with pytest.raises(ValueError, match="Substring search requires"):
+        query_by_keyword(storage, [blog], "post", substring=True)
+
+
+def test_file_queries_read_only_the_snapshots_a_page_needs(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    agg = Source(id="agg", name="Agg", kind="aggregation", method="api", fetch=lambda ctx: [])
+    days = [f"2026-01-{day:02d}" for day in range(1, 11)]
+    for day in days:
+        monkeypatch.setattr("article_harvest.storage.iso_date_today", lambda day=day: day)
+        storage.save_snapshot(
+            agg, [AggregationItem(title=f"Post {i}", url=f"https://y.com/{i}") for i in range(4)]
+        )
+    opened = []
+    snapshot_records = storage.snapshot_records
+    monkeypatch.setattr(
+        storage,
+        "snapshot_records",
+        lambda source, path: opened.append(path.stem) or snapshot_records(source, path),
+    )
+
+    # A page stops one snapshot past the day that fills it, whatever the history length.
+    first = query_by_source(storage, agg, limit=6)
+    assert opened == ["2026-01-10", "2026-01-09", "2026-01-08"]
+    opened.clear()
+    second = query_by_source(storage, agg, limit=6, after=next_cursor(first, 6))
+    assert opened == ["2026-01-09", "2026-01-08", "2026-01-07"]
+    assert first + second == query_by_source(storage, agg)[:12]
+
+    opened.clear()
+    assert len(query_by_archive_date(storage, [agg], on="2026-01-05")) == 4
+    assert opened == ["2026-01-05"]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from article_harvest.models import FetchContext
 from article_harvest.sources.rss import fetch_rss
@@ -31,3 +32,20 @@ def test_fetch_rss_parses_items():
     items = fetch_rss(ctx, "https://example.com/feed")
     assert len(items) == 1
     assert items[0].title == "Sample Post"
+
+
+def test_fetch_rss_skips_conversion_for_known_complete_entries():
+    fixture = Path(__file__).parent / "fixtures" / "rss_sample.xml"
+    session = DummySession(fixture.read_bytes())
+    url = fetch_rss(
+        FetchContext(session=session, run_id="run", now=datetime.utcnow()),
+        "https://example.com/feed",
+    )[0].url
+
+    for known, converted in (({url: True}, False), ({url: False}, True)):
+        ctx = FetchContext(session=session, run_id="run", now=datetime.utcnow(), known=known)
+        with patch("article_harvest.sources.rss.md", return_value="converted") as mock_md:
+            items = fetch_rss(ctx, "https://example.com/feed")
+        assert mock_md.called is converted
+        assert items[0].url == url
+        assert (items[0].content_markdown == "converted") is converted
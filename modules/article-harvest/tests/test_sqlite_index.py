@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import json
+import threading
+from dataclasses import replace
+
+import pytest
+
 from article_harvest.models import AggregationItem, BlogItem, Source
+from article_harvest.pagination import next_cursor
 from article_harvest.queries import (
+    explain_queries,
     query_by_archive_date,
     query_by_keyword,
     query_by_source,
 )
-from article_harvest.sqlite_index import rebuild_sqlite_index
+from article_harvest.sqlite_index import SQLiteIndex, rebuild_sqlite_index, sync_sqlite_index
 from article_harvest.storage import Storage
 from article_harvest.time_utils import parse_date
 
@@ -60,3 +68,365 @@ def test_sqlite_rebuild_parity(tmp_path):
     assert sqlite_source == file_source
     assert sqlite_keyword == file_keyword
     assert sqlite_archive == file_archive
+
+
+def _fts_fixture(tmp_path):
+    storage = Storage(tmp_path)
+    blog_source = Source(
+        id="test-blog",
+        name="Test Blog",
+        kind="blog",
+        method="rss",
+        fetch=lambda ctx: [],
+    )
+    other_source = Source(
+        id="other-blog",
+        name="Other Blog",
+        kind="blog",
+        method="rss",
+        fetch=lambda ctx: [],
+    )
+    storage.save_blog_items(
+        blog_source,
+        [
+            BlogItem(
+                title="Weekly notes",
+                url="https://example.com/notes",
+                content_markdown="A long digression about quantization of weights.",
+            ),
+            BlogItem(
+                title="Quantization explained",
+                url="https://example.com/quant",
+                content_markdown="Short post.",
+            ),
+        ],
+    )
+    storage.save_blog_items(
+        other_source,
+        [
+            BlogItem(
+                title="Quantization elsewhere",
+                url="https://example.org/quant",
+                content_markdown="Another post.",
+            )
+        ],
+    )
+    sources = [blog_source, other_source]
+    rebuild_sqlite_index(storage, sources)
+    return storage, sources
+
+
+def test_fts_keyword_searches_content_and_ranks_titles_first(tmp_path):
+    storage, sources = _fts_fixture(tmp_path)
+
+    assert query_by_keyword(storage, sources, "digression") == []
+    body_only = query_by_keyword(storage, sources, "digression", fts=True)
+    assert [record.url for record in body_only] == ["https://example.com/notes"]
+
+    ranked = query_by_keyword(storage, sources, "quantization", source_id="test-blog", fts=True)
+    assert [record.url for record in ranked] == [
+        "https://example.com/quant",
+        "https://example.com/notes",
+    ]
+
+    today = parse_date(ranked[0].archived_at).isoformat()
+    assert len(query_by_keyword(storage, sources, "quantization", start=today, fts=True)) == 3
+    assert query_by_keyword(storage, sources, "quantization", end="2000-01-01", fts=True) == []
+
+
+def test_fts_keyword_follows_upserts_and_backfills_old_indexes(tmp_path):
+    storage, sources = _fts_fixture(tmp_path)
+    index = SQLiteIndex(storage.data_root)
+    with index.connect() as conn:
+        conn.execute("DROP TABLE records_fts")
+        conn.execute("DROP TABLE record_text")
+
+    assert len(query_by_keyword(storage, sources, "digression", fts=True)) == 1
+
+    (record,) = query_by_source(storage, sources[1])
+    index.upsert_records([replace(record, title="Renamed")])
+    urls = [r.url for r in query_by_keyword(storage, sources, "quantization", fts=True)]
+    assert "https://example.org/quant" not in urls
+
+
+def test_sqlite_index_reads_content_through_one_storage_and_closes_its_own(
+    tmp_path, monkeypatch
+):
+    storage, sources = _fts_fixture(tmp_path)
+    (record,) = query_by_source(storage, sources[1])
+    built = []
+
+    class _CountingStorage(Storage):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            built.append(self)
+
+    monkeypatch.setattr("article_harvest.sqlite_index.Storage", _CountingStorage)
+    shared = SQLiteIndex(storage.data_root, storage=storage)
+    shared.upsert_records([record])
+    shared.sync(storage, sources)
+    shared.close()
+    assert built == []
+
+    owned = SQLiteIndex(storage.data_root)
+    owned.upsert_records([record])
+    owned.upsert_records([record])
+    assert len(built) == 1
+    closed = []
+    monkeypatch.setattr(built[0], "close", lambda: closed.append(True))
+    owned.close()
+    assert closed == [True]
+
+
+def test_fts_reads_content_stored_as_blobs(tmp_path):
+    storage, sources = _fts_fixture(tmp_path)
+    storage.convert_content("blobs")
+    assert not list(tmp_path.glob("sources/*/items/*/content.md"))
+
+    rebuild_sqlite_index(storage, sources)
+    body_only = query_by_keyword(storage, sources, "digression", fts=True)
+    assert [record.url for record in body_only] == ["https://example.com/notes"]
+
+
+@pytest.mark.parametrize("trigram", [True, False])
+def test_substring_keyword_matches_cjk_fragments(tmp_path, monkeypatch, trigram):
+    if not trigram:
+        # SQLite before 3.34 has no trigram tokenizer.
+        monkeypatch.setattr("article_harvest.sqlite_index._trigram_supported", lambda conn: False)
+    storage = Storage(tmp_path)
+    source = Source(id="zh-blog", name="ZH", kind="blog", method="rss", fetch=lambda ctx: [])
+    storage.save_blog_items(
+        source,
+        [
+            BlogItem(
+                title="大语言模型的推理优化",
+                url="https://example.cn/llm",
+                content_markdown="介绍 Speculative Decoding 与量化技术。",
+            ),
+            BlogItem(
+                title="周报 100%",
+                url="https://example.cn/weekly",
+                content_markdown="本周没有模型更新。",
+            ),
+        ],
+    )
+    sources = [source]
+    rebuild_sqlite_index(storage, sources)
+
+    def urls(keyword):
+        return [r.url for r in query_by_keyword(storage, sources, keyword, substring=True)]
+
+    title_only = query_by_keyword(storage, sources, "模型")
+    assert [record.url for record in title_only] == ["https://example.cn/llm"]
+    assert urls("语言模型") == ["https://example.cn/llm"]
+    assert urls("decoding 量化") == ["https://example.cn/llm"]
+    assert sorted(urls("模型")) == ["https://example.cn/llm", "https://example.cn/weekly"]
+    assert urls("0%") == ["https://example.cn/weekly"]
+    assert urls("_") == []
+    conn = SQLiteIndex(tmp_path).connect()
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    assert ("records_trigram" in tables) is trigram
+
+
+def test_sqlite_sync_loads_only_changes(tmp_path):
+    storage = Storage(tmp_path)
+    blog_source = Source(
+        id="test-blog", name="Test Blog", kind="blog", method="rss", fetch=lambda ctx: []
+    )
+    agg_source = Source(
+        id="test-agg", name="Test Agg", kind="aggregation", method="api", fetch=lambda ctx: []
+    )
+    sources = [blog_source, agg_source]
+    storage.save_blog_items(blog_source, [BlogItem(title="First", url="https://example.com/1")])
+    snapshot = storage.save_snapshot(
+        agg_source,
+        [
+            AggregationItem(title="Kept", url="https://example.com/kept"),
+            AggregationItem(title="Dropped", url="https://example.com/dropped"),
+        ],
+    )
+    assert sync_sqlite_index(storage, sources)["upserted"] == 3
+    assert sync_sqlite_index(storage, sources)["files_changed"] == 0
+
+    storage.save_blog_items(blog_source, [BlogItem(title="Second", url="https://example.com/2")])
+    report = sync_sqlite_index(storage, sources)
+    assert (report["files_changed"], report["upserted"], report["deleted"]) == (1, 1, 0)
+
+    storage.save_snapshot(agg_source, [AggregationItem(title="Kept", url="https://example.com/kept")])
+    report = sync_sqlite_index(storage, sources)
+    assert (report["files_changed"], report["upserted"], report["deleted"]) == (1, 1, 2)
+    assert [record.title for record in query_by_source(storage, agg_source)] == ["Kept"]
+
+    snapshot.unlink()
+    assert sync_sqlite_index(storage, sources)["deleted"] == 1
+    assert query_by_source(storage, agg_source) == []
+
+    (manifest,) = storage.manifest_paths(blog_source.id)
+    first_line = manifest.read_text(encoding="utf-8").splitlines()[0]
+    manifest.write_text(first_line + "\n", encoding="utf-8")
+    report = sync_sqlite_index(storage, sources)
+    assert (report["upserted"], report["deleted"]) == (1, 2)
+    assert [record.title for record in query_by_source(storage, blog_source)] == ["First"]
+    assert query_by_keyword(storage, sources, "second", fts=True) == []
+
+
+def test_sqlite_sync_follows_manifest_partitions(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test", kind="blog", method="rss", fetch=lambda ctx: [])
+    for at in ("2026-01-15T10:00:00Z", "2026-02-20T10:00:00Z"):
+        monkeypatch.setattr("article_harvest.storage.iso_now", lambda at=at: at)
+        storage.save_blog_items(source, [BlogItem(title=at, url=f"https://example.com/{at}")])
+    assert sync_sqlite_index(storage, [source])["files_changed"] == 2
+
+    # Back to a legacy single manifest, then split again: each move reloads the source.
+    january, february = storage.manifest_paths(source.id)
+    legacy = storage.manifest_path(source.id)
+    legacy.write_text(january.read_text() + february.read_text(), encoding="utf-8")
+    january.unlink()
+    february.unlink()
+    report = sync_sqlite_index(storage, [source])
+    assert (report["upserted"], report["deleted"]) == (2, 2)
+    storage.partition_manifests()
+    report = sync_sqlite_index(storage, [source])
+    assert (report["files_changed"], report["upserted"], report["deleted"]) == (3, 2, 2)
+    assert len(query_by_source(storage, source)) == 2
+
+
+def test_read_manifest_from_leaves_partial_lines(tmp_path):
+    storage = Storage(tmp_path)
+    manifest = storage.manifest_path("test-blog")
+    manifest.parent.mkdir(parents=True)
+    manifest.write_text('{"url": "a"}\n{"url": "b"}\n{"url": ', encoding="utf-8")
+
+    rows, offset = storage.read_manifest_from("test-blog")
+    assert [row["url"] for row in rows] == ["a", "b"]
+    rows, end = storage.read_manifest_from("test-blog", offset)
+    assert (rows, end) == ([], offset)
+
+
+def test_sqlite_rebuild_swaps_in_a_shadow_index(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test", kind="blog", method="rss", fetch=lambda ctx: [])
+    storage.save_blog_items(source, [BlogItem(title="Old", url="https://example.com/old")])
+    rebuild_sqlite_index(storage, [source])
+    storage.save_blog_items(source, [BlogItem(title="New", url="https://example.com/new")])
+
+    live_counts = []
+    original_sync = SQLiteIndex.sync
+
+    def _observing_sync(self, storage, sources):
+        counts = original_sync(self, storage, sources)
+        # The shadow is complete but not yet installed: readers still see the old index.
+        assert self.path() != SQLiteIndex(tmp_path).path()
+        live_counts.append(len(query_by_source(storage, source)))
+        return counts
+
+    monkeypatch.setattr(SQLiteIndex, "sync", _observing_sync)
+    reader = SQLiteIndex(tmp_path).connect()
+    rebuild_sqlite_index(storage, [source])
+
+    assert live_counts == [1]
+    # The new pages are copied into the live file, so open connections see them too.
+    assert reader.execute("SELECT count(*) FROM records").fetchone()[0] == 2
+    assert sorted(record.title for record in query_by_source(storage, source)) == ["New", "Old"]
+    assert not [path for path in tmp_path.iterdir() if ".rebuild-" in path.name]
+    reader.close()
+
+
+def test_sqlite_index_reuses_one_connection_and_checks_schema_once(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test", kind="blog", method="rss", fetch=lambda ctx: [])
+    records = storage.save_blog_items(
+        source, [BlogItem(title="One", url="https://example.com/1")]
+    )
+    checks = []
+    original_ensure_schema = SQLiteIndex.ensure_schema
+    monkeypatch.setattr(
+        SQLiteIndex,
+        "ensure_schema",
+        lambda self, conn: checks.append(self.path()) or original_ensure_schema(self, conn),
+    )
+    connections = []
+    original_connect = SQLiteIndex.connect
+    monkeypatch.setattr(
+        SQLiteIndex,
+        "connect",
+        lambda self: connections.append(self.path()) or original_connect(self),
+    )
+
+    index = SQLiteIndex(tmp_path, mmap_size=1 << 20, cache_size_kb=1024)
+    index.upsert_records(records)
+    for _ in range(3):
+        assert len(index.query_by_source(source.id)) == 1
+    assert len(SQLiteIndex(tmp_path).query_by_keyword("one")) == 1
+    assert connections == [index.path(), index.path()]
+    assert checks == [index.path()]
+
+    conn = index.connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -1024
+    conn.close()
+
+    # A database replaced underneath the index is reopened and checked again.
+    index.path().unlink()
+    assert index.query_by_source(source.id) == []
+    assert checks == [index.path(), index.path()]
+    index.close()
+
+
+def test_sorted_limited_queries_use_composite_indexes(tmp_path):
+    storage = Storage(tmp_path)
+    source = Source(id="test-agg", name="Agg", kind="aggregation", method="api", fetch=lambda c: [])
+    snapshots = storage.snapshots_dir(source.id)
+    snapshots.mkdir(parents=True)
+    for day in range(1, 29):
+        payload = {
+            "archived_at": f"2026-01-{day:02d}",
+            "items": [
+                {"title": f"Item {i}", "url": f"https://example.com/{day}/{i}"} for i in range(5)
+            ],
+        }
+        (snapshots / f"2026-01-{day:02d}.json").write_text(json.dumps(payload), encoding="utf-8")
+    rebuild_sqlite_index(storage, [source])
+
+    with explain_queries(storage) as traces:
+        first = query_by_source(storage, source, limit=3)
+        query_by_source(storage, source, limit=3, after=next_cursor(first, 3))
+        day = query_by_archive_date(storage, [source], on="2026-01-10", limit=3)
+        week = query_by_archive_date(
+            storage, [source], start="2026-01-10", end="2026-01-16", limit=3
+        )
+
+    assert {record.archived_at for record in day} == {"2026-01-10"}
+    assert {record.archived_at for record in week} == {"2026-01-16"}
+    assert len(traces) == 4
+    for trace in traces:
+        plan = " ".join(trace["plan"])
+        assert "USING INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+        assert trace["rows"] == 3
+
+
+def test_explain_queries_only_collects_its_own_queries(tmp_path):
+    storage, sources = _fts_fixture(tmp_path)
+    other = []
+
+    def query_elsewhere():
+        other.append(query_by_source(storage, sources[1]))
+
+    with explain_queries(storage) as outer:
+        query_by_source(storage, sources[0])
+        with explain_queries(storage) as inner:
+            query_by_source(storage, sources[1])
+        thread = threading.Thread(target=query_elsewhere)
+        thread.start()
+        thread.join()
+        query_by_source(storage, sources[0])
+
+    assert len(other) == 1
+    assert [trace["params"][0] for trace in inner] == ["other-blog"]
+    assert [trace["params"][0] for trace in outer] == ["test-blog", "test-blog"]
+    query_by_source(storage, sources[0])
+    assert len(outer) == 2
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import pytest
+
+from article_harvest.models import AggregationComment, AggregationItem, BlogItem, Source
+from article_harvest.queries import query_by_archive_date, query_by_keyword, query_by_source
+from article_harvest.sqlite_store import (
+    STORE_NAME,
+    SQLiteStorage,
+    convert_backend,
+    export_files,
+    open_storage,
+)
+from article_harvest.storage import Storage
+from article_harvest.storage_config import load_storage_config
+
+BLOG = Source(id="test-blog", name="Test Blog", kind="blog", method="rss", fetch=lambda c: [])
+AGG = Source(id="test-agg", name="Test Agg", kind="aggregation", method="api", fetch=lambda c: [])
+
+
+def _store(storage, monkeypatch):
+    storage.save_blog_items(
+        BLOG,
+        [
+            BlogItem(title="Hello", url="https://example.com/hello", content_markdown="quantized"),
+            BlogItem(title="Empty", url="https://example.com/empty", content_markdown=""),
+        ],
+    )
+    for day in ("2026-01-01", "2026-01-02"):
+        for module in ("storage", "sqlite_store"):
+            monkeypatch.setattr(f"article_harvest.{module}.iso_date_today", lambda day=day: day)
+        storage.save_snapshot(
+            AGG,
+            [
+                AggregationItem(
+                    title=f"Top {day}",
+                    url="https://example.com/top",
+                    rank=1,
+                    comments=[
+                        AggregationComment(text=f"said on {day}", author="pg", published_at=None)
+                    ],
+                ),
+                AggregationItem(title="Second", url=f"https://example.com/{day}", rank=2),
+            ],
+        )
+
+
+def _queries(storage):
+    sources = [BLOG, AGG]
+    return (
+        query_by_source(storage, BLOG),
+        query_by_source(storage, AGG),
+        query_by_keyword(storage, sources, "top"),
+        query_by_archive_date(storage, sources, on="2026-01-01"),
+    )
+
+
+def test_sqlite_backend_matches_the_file_layout(tmp_path, monkeypatch):
+    files = Storage(tmp_path / "files")
+    store = SQLiteStorage(tmp_path / "store")
+    _store(files, monkeypatch)
+    _store(store, monkeypatch)
+
+    assert not (tmp_path / "store" / "sources").exists()
+    assert {path.name[: len(STORE_NAME)] for path in (tmp_path / "store").iterdir()} == {
+        STORE_NAME
+    }
+    assert _queries(store) == _queries(files)
+    # Indexed as it was stored: full-text search needs no rebuild.
+    hits = query_by_keyword(store, [BLOG], "quantized", fts=True)
+    assert [record.url for record in hits] == ["https://example.com/hello"]
+
+    hello = BlogItem(title="Hello", url="https://example.com/hello")
+    assert store.save_blog_items(BLOG, [hello]) == []
+    assert store.save_blog_items(
+        BLOG, [BlogItem(title="Empty", url="https://example.com/empty", content_markdown="now")]
+    ) == []
+    empty = store.existing_by_url(BLOG.id)["https://example.com/empty"]
+    assert store.read_content(empty["content_path"]) == "now"
+    assert [row["title"] for row in store.load_manifest(BLOG.id)] == ["Hello", "Empty"]
+    assert store.known_urls(BLOG.id)["https://example.com/empty"] is True
+
+    comments = store.load_comments(AGG.id, "https://example.com/top")
+    assert [comment.text for comment in comments] == ["said on 2026-01-02"]
+    assert store.load_comments(AGG.id, "https://example.com/top", "2026-01-01")[0].author == "pg"
+    # Saving a day again replaces its records instead of adding to them.
+    _store(store, monkeypatch)
+    assert len(query_by_source(store, AGG)) == 4
+    with pytest.raises(ValueError):
+        store.convert_content("pack")
+
+
+def test_convert_backend_moves_data_both_ways(tmp_path, monkeypatch):
+    files = Storage(tmp_path)
+    _store(files, monkeypatch)
+    (tmp_path / "sources" / "retired").mkdir()
+    expected = _queries(files)
+    content_path = files.load_manifest(BLOG.id)[0]["content_path"]
+
+    report = convert_backend(tmp_path, "sqlite", [BLOG, AGG])
+    assert (report["sources"], report["items"], report["snapshots"]) == (2, 2, 2)
+    assert report["skipped"] == ["retired"]
+    store = open_storage(tmp_path)
+    assert isinstance(store, SQLiteStorage)
+    assert not files.manifest_path(BLOG.id).exists()
+    assert not files.snapshot_paths(AGG.id)
+    assert _queries(store) == expected
+    assert store.read_content(content_path) == "quantized"
+
+    exported = Storage(tmp_path / "export")
+    export_files(store, exported)
+    assert _queries(exported) == expected
+    with pytest.raises(ValueError):
+        export_files(store, exported)
+    store.close()
+
+    convert_backend(tmp_path, "files", [BLOG, AGG])
+    files = open_storage(tmp_path)
+    assert type(files) is Storage
+    assert not (tmp_path / STORE_NAME).exists()
+    assert _queries(files) == expected
+    assert files.load_comments(AGG.id, "https://example.com/top")[0].text == "said on 2026-01-02"
+
+
+def test_convert_backend_keeps_the_files_until_every_source_is_in(tmp_path, monkeypatch):
+    files = Storage(tmp_path)
+    _store(files, monkeypatch)
+    (partition,) = files.manifest_paths(BLOG.id)
+    with partition.open("a", encoding="utf-8") as handle:
+        handle.write('{"url": "https://example.com/no-id", "archived_at": "2026-01-01"}\n')
+    expected = _queries(files)
+
+    def fail(*args):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(SQLiteStorage, "_insert_items", fail)
+    with pytest.raises(RuntimeError):
+        convert_backend(tmp_path, "sqlite", [AGG, BLOG])
+    assert load_storage_config(tmp_path).backend == "files"
+    assert not (tmp_path / STORE_NAME).exists()
+    assert _queries(Storage(tmp_path)) == expected
+
+    monkeypatch.undo()
+    report = convert_backend(tmp_path, "sqlite", [AGG, BLOG])
+    assert (report["items"], report["malformed"]) == (2, 1)
+    assert len(query_by_source(open_storage(tmp_path), BLOG)) == 2
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
+from dataclasses import asdict
+from datetime import date
 
-from article_harvest.models import AggregationItem, BlogItem, Source
+import pytest
+
+from article_harvest.models import AggregationComment, AggregationItem, BlogItem, Source
+from article_harvest.snapshot_format import StringDictionary
 from article_harvest.storage import Storage
 
 
@@ -18,8 +24,8 @@ def test_save_blog_items_and_manifest(tmp_path):
     items = [BlogItem(title="Hello", url="https://example.com/hello")]
     stored = storage.save_blog_items(source, items)
     assert len(stored) == 1
-    manifest_path = storage.manifest_path(source.id)
-    assert manifest_path.exists()
+    (manifest_path,) = storage.manifest_paths(source.id)
+    assert manifest_path.parent.name == "manifest"
     records = [json.loads(line) for line in manifest_path.read_text().splitlines()]
     assert records[0]["title"] == "Hello"
 
@@ -64,3 +70,450 @@ def test_save_snapshot_and_iterate(tmp_path):
     records = storage.iter_snapshot_records(source)
     assert len(records) == 1
     assert records[0].title == "Entry"
+
+
+def test_iter_records_opens_only_snapshots_inside_the_bounds(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(
+        id="test-agg", name="Test Agg", kind="aggregation", method="api", fetch=lambda ctx: []
+    )
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"):
+        monkeypatch.setattr("article_harvest.storage.iso_date_today", lambda day=day: day)
+        items = [AggregationItem(title=f"{day} {i}", url=f"https://x.com/{i}") for i in range(3)]
+        storage.save_snapshot(source, items)
+    opened = []
+    snapshot_records = storage.snapshot_records
+    monkeypatch.setattr(
+        storage,
+        "snapshot_records",
+        lambda source, path: opened.append(path.stem) or snapshot_records(source, path),
+    )
+
+    records = storage.iter_records(source, start=date(2026, 1, 2), end=date(2026, 1, 3))
+    assert opened == []
+    assert [record.archived_at for record in records] == ["2026-01-03"] * 3 + ["2026-01-02"] * 3
+    assert opened == ["2026-01-03", "2026-01-02"]
+
+    opened.clear()
+    assert len(list(storage.iter_records(source, limit=2))) == 2
+    assert opened == ["2026-01-04"]
+
+
+def test_manifests_are_partitioned_by_month_and_legacy_files_migrate(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test Blog", kind="blog", method="rss", fetch=lambda c: [])
+    legacy = storage.manifest_path(source.id)
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(
+        "".join(
+            json.dumps({"id": url, "url": url, "title": url, "archived_at": at}) + "\n"
+            for url, at in (("old", "2025-12-30T10:00:00Z"), ("feb-1", "2026-02-01T10:00:00Z"))
+        ),
+        encoding="utf-8",
+    )
+    for at in ("2026-01-15T10:00:00Z", "2026-02-20T10:00:00Z"):
+        monkeypatch.setattr("article_harvest.storage.iso_now", lambda at=at: at)
+        storage.save_blog_items(source, [BlogItem(title=at, url=f"https://example.com/{at}")])
+
+    partitions = [path.name for path in storage.manifest_paths(source.id)]
+    assert partitions == ["manifest.jsonl", "2026-01.jsonl", "2026-02.jsonl"]
+    assert storage.existing_by_url(source.id)["old"]["title"] == "old"
+    february = (date(2026, 2, 1), date(2026, 2, 28))
+    assert [path.name for path in storage.manifest_paths(source.id, *february)] == [
+        "manifest.jsonl",
+        "2026-02.jsonl",
+    ]
+    everything = [row["url"] for row in storage.load_manifest(source.id)]
+    in_february = [record.url for record in storage.records_for_source(source, *february)]
+    assert in_february == ["feb-1", "https://example.com/2026-02-20T10:00:00Z"]
+
+    report = storage.partition_manifests()
+    assert report == {"manifests_split": 1, "rows": 2, "partitions": 2}
+    assert not legacy.exists()
+    assert [path.name for path in storage.manifest_paths(source.id, *february)] == [
+        "2026-02.jsonl"
+    ]
+    assert [row["url"] for row in storage.load_manifest(source.id)] == [
+        "old",
+        "https://example.com/2026-01-15T10:00:00Z",
+        "feb-1",
+        "https://example.com/2026-02-20T10:00:00Z",
+    ]
+    assert sorted(everything) == sorted(storage.existing_by_url(source.id))
+    assert storage.existing_by_url(source.id)["feb-1"]["title"] == "feb-1"
+    assert storage.partition_manifests()["manifests_split"] == 0
+
+
+def test_date_bounded_manifest_reads_skip_undated_rows(tmp_path):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test Blog", kind="blog", method="rss", fetch=lambda c: [])
+    legacy = storage.manifest_path(source.id)
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(
+        "".join(
+            json.dumps({"id": url, "url": url, "title": url, "archived_at": at}) + "\n"
+            for url, at in (("dated", "2026-02-01T10:00:00Z"), ("undated", "unknown"))
+        ),
+        encoding="utf-8",
+    )
+    storage.partition_manifests()
+    assert [path.name for path in storage.manifest_paths(source.id)] == [
+        "2026-02.jsonl",
+        "undated.jsonl",
+    ]
+
+    february = (date(2026, 2, 1), date(2026, 2, 28))
+    assert [row["url"] for row in storage.load_manifest(source.id, *february)] == ["dated"]
+    assert [record.url for record in storage.records_for_source(source, *february)] == ["dated"]
+    assert [row["url"] for row in storage.load_manifest(source.id)] == ["dated", "undated"]
+
+
+def test_partition_manifests_resumes_after_a_crash(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test Blog", kind="blog", method="rss", fetch=lambda c: [])
+    legacy = storage.manifest_path(source.id)
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(
+        "".join(
+            json.dumps({"id": url, "url": url, "title": url, "archived_at": at}) + "\n"
+            for url, at in (("jan-1", "2026-01-01T10:00:00Z"), ("feb-1", "2026-02-01T10:00:00Z"))
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr("article_harvest.storage.iso_now", lambda: "2026-02-20T10:00:00Z")
+    storage.save_blog_items(source, [BlogItem(title="New", url="https://example.com/new")])
+    expected = [row["url"] for row in storage.load_manifest(source.id)]
+    replace_file = os.replace
+    swaps = []
+
+    def crash_after_first_partition(src, dst):
+        swaps.append(dst)
+        if len(swaps) == 3:
+            raise OSError("power cut")
+        replace_file(src, dst)
+
+    monkeypatch.setattr("article_harvest.storage.os.replace", crash_after_first_partition)
+    with pytest.raises(OSError):
+        storage.partition_manifests()
+    monkeypatch.setattr("article_harvest.storage.os.replace", replace_file)
+    assert not legacy.exists()
+    assert sorted(storage.existing_by_url(source.id)) == sorted(expected)
+
+    assert storage.partition_manifests()["manifests_split"] == 1
+    assert [row["url"] for row in storage.load_manifest(source.id)] == expected
+    assert [path.name for path in storage.manifest_paths(source.id)] == [
+        "2026-01.jsonl",
+        "2026-02.jsonl",
+    ]
+
+
+def test_columnar_snapshots_share_strings_across_days(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(
+        id="test-agg", name="Test Agg", kind="aggregation", method="api", fetch=lambda ctx: []
+    )
+    items = [
+        AggregationItem(
+            title=f"Entry {i}",
+            url=f"https://example.com/{i}",
+            author="alice",
+            rank=i,
+            comments=[AggregationComment(author="bob", published_at=None, text="Nice")],
+            extra={"site": "example.com"},
+        )
+        for i in range(3)
+    ]
+    monkeypatch.setattr("article_harvest.storage.iso_date_today", lambda: "2026-01-01")
+    storage.save_snapshot(source, items)
+    expected = storage.iter_snapshot_records(source)
+
+    report = storage.convert_snapshots("columnar")
+    assert report["files_converted"] == 1
+    assert report["bytes_after"] < report["bytes_before"]
+    assert Storage(tmp_path).config.snapshot_format == "columnar"
+    assert Storage(tmp_path).iter_snapshot_records(source) == expected
+
+    dictionary = storage.snapshots_dir(source.id) / "strings.jsonl"
+    size = dictionary.stat().st_size
+    monkeypatch.setattr("article_harvest.storage.iso_date_today", lambda: "2026-01-02")
+    storage.save_snapshot(source, items)
+    # The same items on the next day add no strings.
+    assert dictionary.stat().st_size == size
+    records = storage.iter_snapshot_records(source)
+    assert [record.title for record in records[:3]] == ["Entry 0", "Entry 1", "Entry 2"]
+    assert records[3:] == expected
+
+    path = storage.snapshots_dir(source.id) / "2026-01-01.json"
+    original = storage.load_snapshot(source.id, path)
+    storage.convert_snapshots("json")
+    assert not dictionary.exists()
+    assert json.loads(path.read_text(encoding="utf-8")) == original
+
+
+def test_string_dictionary_starts_over_when_the_file_is_replaced(tmp_path):
+    path = tmp_path / "strings.jsonl"
+    dictionary = StringDictionary(path)
+    with dictionary.appending():
+        assert [dictionary.encode(value) for value in ("a", "b")] == [0, 1]
+
+    # A reconversion writes a new, longer table in place of the old one.
+    replacement = tmp_path / "strings.jsonl.new"
+    replacement.write_text("".join(json.dumps(v) + "\n" for v in ("x", "y", "z")), "utf-8")
+    os.replace(replacement, path)
+    dictionary.ensure(3)
+    assert [dictionary.lookup(string_id) for string_id in range(3)] == ["x", "y", "z"]
+    with dictionary.appending():
+        assert dictionary.encode("a") == 3
+
+
+def test_comments_live_in_a_sidecar_read_on_demand(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(
+        id="test-agg", name="Test Agg", kind="aggregation", method="api", fetch=lambda ctx: []
+    )
+    comment = AggregationComment(author="bob", published_at=None, text="Long thread text")
+    monkeypatch.setattr("article_harvest.storage.iso_date_today", lambda: "2026-01-01")
+    path = storage.save_snapshot(
+        source,
+        [
+            AggregationItem(title="One", url="https://example.com/1", comments=[comment]),
+            AggregationItem(title="Two", url="https://example.com/2"),
+        ],
+    )
+
+    assert "Long thread text" not in path.read_text(encoding="utf-8")
+    assert [record.title for record in storage.iter_snapshot_records(source)] == ["One", "Two"]
+    assert storage.load_comments(source.id, "https://example.com/1") == [comment]
+    assert storage.load_comments(source.id, "https://example.com/1", "2026-01-01") == [comment]
+    assert storage.load_comments(source.id, "https://example.com/2") == []
+
+    # Snapshots written before sidecars inline their comments until they are converted.
+    legacy = storage.snapshots_dir(source.id) / "2025-12-31.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "archived_at": "2025-12-31",
+                "items": [
+                    {"title": "Old", "url": "https://example.com/0", "comments": [asdict(comment)]}
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    assert storage.load_comments(source.id, "https://example.com/0") == [comment]
+    report = storage.convert_snapshots()
+    assert report["files_converted"] == 1
+    assert "comments" not in json.loads(legacy.read_text(encoding="utf-8"))["items"][0]
+    assert storage.load_comments(source.id, "https://example.com/0") == [comment]
+
+    storage.convert_snapshots("columnar")
+    assert Storage(tmp_path).load_comments(source.id, "https://example.com/1") == [comment]
+    storage.convert_snapshots("json")
+    assert storage.load_comments(source.id, "https://example.com/1") == [comment]
+
+
+def test_blob_store_keeps_identical_content_once(tmp_path):
+    storage = Storage(tmp_path)
+    storage.convert_content("blobs")
+    sources = [
+        Source(id=name, name=name, kind="blog", method="rss", fetch=lambda ctx: [])
+        for name in ("one", "two")
+    ]
+    footer = "Thanks for reading! Subscribe for more."
+    for source in sources:
+        storage.save_blog_items(
+            source,
+            [
+                BlogItem(title="Post", url=f"https://{source.id}.com/a", content_markdown=footer),
+                BlogItem(title="Empty", url=f"https://{source.id}.com/b", content_markdown=""),
+            ],
+        )
+
+    assert storage.blobs.stats() == {"refs": 4, "blobs": 2, "blob_bytes": len(footer)}
+    (record, _) = storage.records_for_source(sources[0])
+    assert not (tmp_path / record.content_path).exists()
+    assert storage.read_content(record.content_path) == footer
+
+    # Filling in empty content moves the reference; the old blob goes once unused.
+    empty_blob = storage.resolve_content(
+        storage.records_for_source(sources[0])[1].content_path
+    )
+    storage.save_blog_items(
+        sources[0], [BlogItem(title="Empty", url="https://one.com/b", content_markdown="Now")]
+    )
+    assert empty_blob.exists()
+    storage.save_blog_items(
+        sources[1], [BlogItem(title="Empty", url="https://two.com/b", content_markdown="Now")]
+    )
+    assert not empty_blob.exists()
+    assert storage.blobs.stats()["blobs"] == 2
+
+    report = storage.convert_content("files")
+    assert report["items_converted"] == 4
+    assert storage.blobs.stats() == {"refs": 0, "blobs": 0, "blob_bytes": 0}
+    assert (tmp_path / record.content_path).read_text(encoding="utf-8") == footer
+
+
+def test_pack_store_keeps_a_source_in_one_file(tmp_path):
+    storage = Storage(tmp_path)
+    source = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    storage.save_blog_items(
+        source, [BlogItem(title="Old", url="https://example.com/old", content_markdown="Old")]
+    )
+    report = storage.convert_content("pack")
+    assert report["items_converted"] == 1
+    storage.save_blog_items(
+        source,
+        [
+            BlogItem(title="Post", url="https://example.com/a", content_markdown="Body"),
+            BlogItem(title="Table", url="https://example.com/b", content_markdown="|  |"),
+        ],
+    )
+
+    assert not list(storage.items_dir(source.id).iterdir())
+    old, post, table = storage.records_for_source(source)
+    assert storage.read_content(old.content_path) == "Old"
+    assert storage.read_content(post.content_path) == "Body"
+    assert storage.has_content(table.content_path)
+    assert not storage.has_complete_content({"content_path": table.content_path})
+    assert storage.read_meta(source.id, post.item_id)["url"] == "https://example.com/a"
+
+    # Filling in content appends; compaction drops the replaced bytes.
+    storage.save_blog_items(
+        source, [BlogItem(title="Table", url="https://example.com/b", content_markdown="Now")]
+    )
+    assert Storage(tmp_path).read_content(table.content_path) == "Now"
+    stats = storage.pack(source.id).stats()
+    assert stats["pack_bytes"] > stats["live_bytes"]
+    compacted = storage.compact_packs()
+    assert compacted["bytes_after"] == stats["live_bytes"] < compacted["bytes_before"]
+    assert storage.read_content(table.content_path) == "Now"
+
+    storage.convert_content("files")
+    assert (tmp_path / post.content_path).read_text(encoding="utf-8") == "Body"
+    assert (storage.items_dir(source.id) / post.item_id / "meta.json").exists()
+    assert not storage.pack(source.id).exists()
+    assert not list(storage.source_root(source.id).glob("items.*.pack"))
+
+
+def test_compress_stored_round_trips_items_and_snapshots(tmp_path, monkeypatch):
+    pytest.importorskip("zstandard")
+    storage = Storage(tmp_path)
+    blog = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    agg = Source(id="agg", name="Agg", kind="aggregation", method="api", fetch=lambda ctx: [])
+    footer = "\n\n---\nThanks for reading! Subscribe to get every new post by email.\n"
+    posts = [
+        BlogItem(
+            title=f"Post {i}",
+            url=f"https://example.com/{i}",
+            content_markdown=f"# Post {i}\n\nSome words about topic {i}.{footer}",
+        )
+        for i in range(50)
+    ]
+    storage.save_blog_items(blog, posts)
+    monkeypatch.setattr("article_harvest.storage.iso_date_today", lambda: "2026-01-01")
+    storage.save_snapshot(
+        agg,
+        [
+            AggregationItem(
+                title="Entry",
+                url="https://example.com/entry",
+                comments=[AggregationComment(author="bob", published_at=None, text="Nice")],
+            )
+        ],
+    )
+    records = storage.records_for_source(blog)
+    snapshot = storage.records_for_source(agg)
+    content_file = tmp_path / records[0].content_path
+    plain = content_file.read_bytes()
+
+    report = storage.compress_stored("zstd")
+    assert report["files_rewritten"] == report["files"] == 102
+    assert report["bytes_after"] < report["bytes_before"]
+    assert (storage.source_root(blog.id) / "zstd.dict").exists()
+    assert content_file.read_bytes() != plain
+
+    reopened = Storage(tmp_path)
+    assert reopened.config.compression == "zstd"
+    assert reopened.read_content(records[0].content_path) == plain.decode("utf-8")
+    assert reopened.records_for_source(agg) == snapshot
+    assert reopened.load_comments(agg.id, "https://example.com/entry")[0].text == "Nice"
+    # New items are compressed as they are written.
+    reopened.save_blog_items(
+        blog, [BlogItem(title="New", url="https://example.com/new", content_markdown="Hi")]
+    )
+    new_record = reopened.records_for_source(blog)[-1]
+    assert (tmp_path / new_record.content_path).read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+    assert reopened.read_content(new_record.content_path) == "Hi"
+
+    report = reopened.compress_stored("none")
+    assert report["files_rewritten"] == 104
+    assert content_file.read_bytes() == plain
+    assert not (storage.source_root(blog.id) / "zstd.dict").exists()
+
+
+def test_known_urls_flags_incomplete_content(tmp_path):
+    storage = Storage(tmp_path)
+    source = Source(
+        id="test-blog",
+        name="Test Blog",
+        kind="blog",
+        method="rss",
+        fetch=lambda ctx: [],
+    )
+    storage.save_blog_items(
+        source,
+        [
+            BlogItem(title="Good", url="https://example.com/good", content_markdown="Body"),
+            BlogItem(title="Empty", url="https://example.com/empty", content_markdown=""),
+            BlogItem(title="Table", url="https://example.com/table", content_markdown="|  |  |"),
+        ],
+    )
+
+    known = storage.known_urls(source.id)
+
+    assert set(known) == {
+        "https://example.com/good",
+        "https://example.com/empty",
+        "https://example.com/table",
+    }
+    assert known["https://example.com/good"] is True
+    assert known["https://example.com/empty"] is False
+    assert known["https://example.com/table"] is False
+    assert "https://example.com/new" not in known
+
+
+def test_url_index_serves_lookups_without_parsing_the_manifest(tmp_path, monkeypatch):
+    storage = Storage(tmp_path)
+    source = Source(id="test-blog", name="Test Blog", kind="blog", method="rss", fetch=lambda c: [])
+    assert len(storage.existing_by_url(source.id)) == 0
+    assert not storage.source_root(source.id).exists()
+
+    storage.save_blog_items(source, [BlogItem(title="One", url="https://example.com/1")])
+    monkeypatch.setattr(Storage, "load_manifest", lambda self, source_id: 1 / 0)
+    storage.save_blog_items(source, [BlogItem(title="Two", url="https://example.com/2")])
+
+    parsed = []
+    original_loads = json.loads
+    monkeypatch.setattr(
+        "article_harvest.url_index.json.loads",
+        lambda raw: parsed.append(raw) or original_loads(raw),
+    )
+    existing = storage.existing_by_url(source.id)
+    assert existing["https://example.com/2"]["title"] == "Two"
+    assert "https://example.com/3" not in existing
+    assert sorted(existing) == ["https://example.com/1", "https://example.com/2"]
+    assert len(parsed) == 1
+
+    # Lines appended by another writer are indexed from the previous offset, and a
+    # duplicate URL resolves to its latest line.
+    (manifest,) = storage.manifest_paths(source.id)
+    with manifest.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"url": "https://example.com/1", "title": "One again"}) + "\n")
+    parsed.clear()
+    fresh = Storage(tmp_path).existing_by_url(source.id)
+    assert fresh["https://example.com/1"]["title"] == "One again"
+    assert len(parsed) == 2
+
+    manifest.write_text(json.dumps({"url": "https://example.com/9"}) + "\n", encoding="utf-8")
+    assert sorted(Storage(tmp_path).existing_by_url(source.id)) == ["https://example.com/9"]
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import json
 
+import pytest
+
+from article_harvest.models import AggregationItem, BlogItem, Source
+from article_harvest.storage import Storage
 from article_harvest.verify_data import verify_data_root
 
 
@@ -209,6 +213,77 @@ def test_verify_data_aggregation_valid_snapshot(tmp_path):
     assert report["totals"]["items_checked"] == 1
 
 
+def test_verify_data_reads_columnar_snapshots(tmp_path):
+    """Columnar snapshots are decoded; a missing string dictionary is reported."""
+    storage = Storage(tmp_path)
+    storage.convert_snapshots("columnar")
+    source = Source(id="agg", name="Agg", kind="aggregation", method="api", fetch=lambda ctx: [])
+    storage.save_snapshot(source, [AggregationItem(title="Item", url="https://example.com/1")])
+
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_total"] == 0
+    assert report["totals"]["items_checked"] == 1
+
+    (storage.snapshots_dir("agg") / "strings.jsonl").unlink()
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_by_type"] == {"snapshot_bad_columns": 1}
+
+
+def test_verify_data_resolves_blob_content(tmp_path):
+    """Blob-stored content is verified through its pointer; corrupted blobs are reported."""
+    storage = Storage(tmp_path)
+    storage.convert_content("blobs")
+    source = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    storage.save_blog_items(
+        source, [BlogItem(title="Post", url="https://example.com/1", content_markdown="x" * 500)]
+    )
+
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_total"] == 0
+
+    (record,) = storage.records_for_source(source)
+    storage.resolve_content(record.content_path).write_text("y" * 500, encoding="utf-8")
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_by_type"] == {"blob_digest_mismatch": 1}
+
+
+def test_verify_data_reads_packed_items(tmp_path):
+    storage = Storage(tmp_path)
+    storage.convert_content("pack")
+    source = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    storage.save_blog_items(
+        source,
+        [
+            BlogItem(title="Post", url="https://example.com/1", content_markdown="x" * 500),
+            BlogItem(title="Short", url="https://example.com/2", content_markdown="tiny"),
+        ],
+    )
+
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_by_type"] == {"content_too_short": 1}
+
+
+def test_verify_data_decompresses_items_and_snapshots(tmp_path):
+    pytest.importorskip("zstandard")
+    storage = Storage(tmp_path)
+    blog = Source(id="blog", name="Blog", kind="blog", method="rss", fetch=lambda ctx: [])
+    agg = Source(id="agg", name="Agg", kind="aggregation", method="api", fetch=lambda ctx: [])
+    storage.save_blog_items(
+        blog, [BlogItem(title="Post", url="https://example.com/1", content_markdown="x" * 500)]
+    )
+    storage.save_snapshot(agg, [AggregationItem(title="Entry", url="https://example.com/e")])
+    storage.compress_stored("zstd")
+
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_total"] == 0
+
+    (record,) = storage.records_for_source(blog)
+    content_file = tmp_path / record.content_path
+    content_file.write_bytes(content_file.read_bytes()[:12])
+    report = verify_data_root(tmp_path)
+    assert report["totals"]["issues_by_type"] == {"content_bad_compression": 1}
+
+
 def test_verify_data_unrecognized_layout(tmp_path):
     """Source directory with no manifest or snapshots."""
     data_root = tmp_path